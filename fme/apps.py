@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FmeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'fme'
+
+    def ready(self):
+        from fme import signals
@@ -0,0 +1,104 @@
+import copy
+import hashlib
+from django.conf import settings
+from django.core.cache import caches
+from fme.models.user import User
+from fme.helpers.lru import LRUCache
+from fme.helpers.password_hashing import hashing_pool
+from django.contrib.auth.backends import ModelBackend
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenUserCache:
+    """
+        token key -> user, held in a per-process LRU (TOKEN_AUTH_LOCAL_TTL) and optionally in the
+        shared cache named by TOKEN_AUTH_CACHE_ALIAS (TOKEN_AUTH_CACHE_TTL). Invalidation clears this
+        process and the shared cache; other processes drop their copy within TOKEN_AUTH_LOCAL_TTL.
+    """
+
+    def __init__(self):
+        self.local = LRUCache(settings.TOKEN_AUTH_LRU_SIZE, settings.TOKEN_AUTH_LOCAL_TTL)
+
+    @property
+    def shared(self):
+        return caches[settings.TOKEN_AUTH_CACHE_ALIAS] if settings.TOKEN_AUTH_CACHE_ALIAS else None
+
+    @staticmethod
+    def shared_key(key):
+        # never put raw tokens into the shared cache keyspace
+        return f"token_auth:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    def get(self, key):
+        user = self.local.get(key)
+        if user is None and self.shared is not None:
+            user = self.shared.get(self.shared_key(key))
+            if user is not None:
+                self.local.set(key, user)
+        return user
+
+    def set(self, key, user):
+        self.local.set(key, user)
+        if self.shared is not None:
+            self.shared.set(self.shared_key(key), user, settings.TOKEN_AUTH_CACHE_TTL)
+
+    def invalidate_key(self, key):
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(self.shared_key(key))
+
+    def invalidate_users(self, user_ids):
+        """ drop cached tokens of the given users (after status changes or logout) """
+        user_ids = {str(user_id) for user_id in user_ids}
+        self.local.delete_where(lambda user: str(user.pk) in user_ids)
+        if self.shared is not None:
+            keys = Token.objects.filter(user_id__in=user_ids).values_list('key', flat=True)
+            self.shared.delete_many([self.shared_key(key) for key in keys])
+
+
+token_user_cache = TokenUserCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """ TokenAuthentication without the per-request Token + User query for recently seen tokens """
+
+    def authenticate_credentials(self, key):
+        user = token_user_cache.get(key)
+        if user is None:
+            user, _ = super().authenticate_credentials(key)
+            if user.status == User.Status.DISABLED:
+                raise exceptions.AuthenticationFailed('This account has been disabled.')
+            token_user_cache.set(key, user)
+        # each request gets its own instance; request.auth keeps its Token type without a query
+        user = copy.copy(user)
+        return (user, Token(key=key, user=user))
+
+
+class PooledHashingBackend(ModelBackend):
+    """
+        ModelBackend with the password check run in the hashing pool. Hashes stored with an
+        older hasher or cost are replaced by the preferred one after a successful login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # hash anyway so unknown emails take as long as wrong passwords
+            hashing_pool.make(password)
+            return None
+        is_correct, new_encoded = hashing_pool.verify(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if new_encoded:
+            # only replace the hash we verified, a concurrent password change wins
+            User.objects.filter(pk=user.pk, password=user.password).update(password=new_encoded)
+            user.password = new_encoded
+            # update() sends no post_save
+            token_user_cache.invalidate_users([user.pk])
+        return user
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import ScryptPasswordHasher
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+        scrypt with the cost taken from PASSWORD_SCRYPT_* so it can be tuned per deployment
+        (check with `manage.py benchmark_logins`). The algorithm name stays "scrypt": hashes made
+        with other parameters still verify and are re-hashed on the next successful login.
+    """
+    work_factor = settings.PASSWORD_SCRYPT_WORK_FACTOR
+    block_size = settings.PASSWORD_SCRYPT_BLOCK_SIZE
+    parallelism = settings.PASSWORD_SCRYPT_PARALLELISM
+    # scrypt needs ~128 * n * r * p bytes, OpenSSL's 32MB default rejects larger costs
+    maxmem = 2 * 128 * work_factor * block_size * parallelism
@@ -0,0 +1,133 @@
+""" buffered last_active tracking (one bulk UPDATE per flush instead of one per request) """
+import os
+import atexit
+import threading
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Q
+from fme.models.user import User
+
+
+class BackgroundFlusher:
+    """
+        Base for per-process write buffers: a daemon thread calls flush() every `interval()`
+        seconds or as soon as wake() is called. Subclasses implement flush().
+    """
+    thread_name = 'buffer-flusher'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher_pid = None
+
+    def interval(self):
+        return settings.LAST_ACTIVE_FLUSH_INTERVAL
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _ensure_flusher(self):
+        # threads do not survive fork, so each worker process starts its own
+        if self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+            threading.Thread(target=self._run, name=self.thread_name, daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval())
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f'An error occurred in {self.thread_name}:', e)
+            finally:
+                # the flusher thread owns its connection, do not keep it open between flushes
+                connections.close_all()
+
+    def flush(self):
+        raise NotImplementedError
+
+
+class ActivityBuffer(BackgroundFlusher):
+    """
+        Per-process map of user id -> last seen time, flushed by a daemon thread every
+        LAST_ACTIVE_FLUSH_INTERVAL seconds (or once LAST_ACTIVE_BUFFER_MAX users are pending).
+        Each gunicorn worker flushes its own buffer; the UPDATE only ever moves last_active
+        forward, so overlapping flushes from different workers are safe in any order.
+    """
+    thread_name = 'last-active-flusher'
+
+    def __init__(self):
+        super().__init__()
+        self._pending = {}
+
+    def record(self, user_id, seen_at):
+        self._remember(user_id, seen_at)
+        self._ensure_flusher()
+        if len(self._pending) >= settings.LAST_ACTIVE_BUFFER_MAX:
+            self.wake()
+
+    def _remember(self, user_id, seen_at):
+        with self._lock:
+            current = self._pending.get(user_id)
+            if current is None or current < seen_at:
+                self._pending[user_id] = seen_at
+
+    def flush(self):
+        """ write pending timestamps, returns the number of users flushed """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        # a stable row order keeps concurrent flushes from deadlocking
+        rows = sorted(pending.items(), key=lambda item: str(item[0]))
+        try:
+            if connection.vendor == 'postgresql':
+                self._bulk_update(rows)
+            else:
+                self._update_each(rows)
+        except Exception:
+            # keep the timestamps for the next attempt unless newer ones arrived meanwhile
+            for user_id, seen_at in rows:
+                self._remember(user_id, seen_at)
+            raise
+        return len(rows)
+
+    @staticmethod
+    def _bulk_update(rows, batch_size=5000):
+        table = connection.ops.quote_name(User._meta.db_table)
+        column = connection.ops.quote_name(User._meta.get_field('last_active').column)
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                values = ', '.join(['(%s::uuid, %s::timestamptz)'] * len(batch))
+                cursor.execute(
+                    f'UPDATE {table} AS u SET {column} = GREATEST(u.{column}, v.seen_at) '
+                    f'FROM (VALUES {values}) AS v(id, seen_at) '
+                    f'WHERE u.id = v.id AND (u.{column} IS NULL OR u.{column} < v.seen_at)',
+                    [value for row in batch for value in row]
+                )
+
+    @staticmethod
+    def _update_each(rows):
+        """ fallback for databases without UPDATE ... FROM (VALUES ...) (sqlite in development) """
+        with transaction.atomic():
+            for user_id, seen_at in rows:
+                User.objects.filter(
+                    Q(last_active__isnull=True) | Q(last_active__lt=seen_at), id=user_id
+                ).update(last_active=seen_at)
+
+
+activity_buffer = ActivityBuffer()
+
+
+@atexit.register
+def flush_on_exit():
+    try:
+        activity_buffer.flush()
+    except Exception as e:
+        print('An error occurred while flushing last_active:', e)
@@ -0,0 +1,88 @@
+""" asynchronous, batched activity log writes (the request only appends to a list) """
+import atexit
+from django.conf import settings
+from django.utils import timezone
+from fme.helpers.activity import BackgroundFlusher
+from fme.models.activity_log import ActivityLog, month_start
+
+
+def client_ip(request):
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    return forwarded.split(',')[0].strip() if forwarded else request.META.get('REMOTE_ADDR')
+
+
+class ActivityLogBuffer(BackgroundFlusher):
+    """
+        Pending ActivityLog rows for this process, written with one bulk_create every
+        ACTIVITY_LOG_FLUSH_INTERVAL seconds (sooner once ACTIVITY_LOG_BUFFER_MAX rows wait).
+        The flusher creates the upcoming monthly partitions once per month per process.
+    """
+    thread_name = 'activity-log-flusher'
+
+    def __init__(self):
+        super().__init__()
+        self._pending = []
+        self._partitioned_month = None
+
+    def interval(self):
+        return settings.ACTIVITY_LOG_FLUSH_INTERVAL
+
+    def add(self, entry):
+        with self._lock:
+            self._pending.append(entry)
+            pending = len(self._pending)
+        self._ensure_flusher()
+        if pending >= settings.ACTIVITY_LOG_BUFFER_MAX:
+            self.wake()
+
+    def ensure_partitions(self):
+        month = month_start(timezone.localdate())
+        if self._partitioned_month != month:
+            ActivityLog.ensure_partitions()
+            self._partitioned_month = month
+
+    def flush(self):
+        """ write pending rows, returns the number written """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            self.ensure_partitions()
+            ActivityLog.objects.bulk_create(pending, batch_size=1000)
+        except Exception:
+            with self._lock:
+                # keep a bounded backlog for the next attempt, oldest rows are dropped first
+                self._pending = (pending + self._pending)[-settings.ACTIVITY_LOG_BUFFER_MAX * 10:]
+            raise
+        return len(pending)
+
+
+activity_log_buffer = ActivityLogBuffer()
+
+
+def log_activity(action_type, request=None, user=None, target='', target_id='', details='', **metadata):
+    """
+        queue an ActivityLog row; `user` defaults to the request user and the timestamp is taken
+        now, not at flush time
+    """
+    if user is None and request is not None and request.user.is_authenticated:
+        user = request.user
+    activity_log_buffer.add(ActivityLog(
+        timestamp=timezone.now(),
+        user_id=user.pk if user is not None else None,
+        action_type=action_type,
+        target=str(target)[:255],
+        target_id=str(target_id or '')[:64],
+        details=details,
+        metadata=metadata,
+        ip_address=client_ip(request) if request is not None else None,
+    ))
+
+
+@atexit.register
+def flush_on_exit():
+    try:
+        activity_log_buffer.flush()
+    except Exception as e:
+        print('An error occurred while flushing the activity log:', e)
@@ -0,0 +1,63 @@
+""" keeps the cached admin dashboard responses warm (see the warm_dashboard_cache command) """
+import time
+from django.db import close_old_connections
+from fme.models.user import User
+from fme.models.analytics import LearnerDailyStat
+from fme.helpers.metrics import PERIOD_DAYS
+from fme.views.dashboard import administrator
+from fme.views.dashboard.learner import LearnerAnalyticsView
+
+
+def platform_overview_params():
+    """ no period (the view default) and every period, unfiltered and for each state that has learners """
+    states = [None] + [row['state'] for row in LearnerDailyStat.distribution('state')]
+    return [
+        {key: value for key, value in (('period', period), ('state', state)) if value}
+        for period in [None, *PERIOD_DAYS] for state in states
+    ]
+
+
+WARM_TARGETS = [
+    (administrator.PlatformOverviewView, platform_overview_params),
+    (administrator.ScholarshipDistributionView, lambda: [{}]),
+    (administrator.UserManagementView, lambda: [{}]),
+    (administrator.AdvancedAnalyticsView, lambda: [{}]),
+    (LearnerAnalyticsView, lambda: [{}]),
+]
+
+
+def warm_dashboard_cache(refresh_within=0, stdout=None):
+    """
+        recompute every target whose cached response is missing, invalidated or expires within
+        `refresh_within` seconds. Returns [(view name, params, seconds)] for the computed entries.
+    """
+    user = User.objects.filter(role=User.Role.ADMIN, status=User.Status.ACTIVE).order_by('created_at').first()
+    if user is None:
+        raise RuntimeError('An active admin user is required to warm the dashboard cache')
+    timings = []
+    for view_class, params_for in WARM_TARGETS:
+        cached = view_class.get.cache
+        for params in params_for():
+            try:
+                duration = cached.warm(view_class, params, user, refresh_within)
+            except Exception as e:
+                print(f'An error occurred while warming {view_class.__name__} {params}:', e)
+                continue
+            if duration is None:
+                continue
+            timings.append((view_class.__name__, params, duration))
+            if stdout:
+                stdout.write(f'{view_class.__name__} {params or "(default)"}: {duration * 1000:.0f} ms')
+    return timings
+
+
+def run_warmer(interval, stdout=None):
+    """ warm every `interval` seconds, refreshing entries that would expire before the next pass """
+    while True:
+        close_old_connections()
+        started = time.monotonic()
+        timings = warm_dashboard_cache(refresh_within=interval, stdout=stdout)
+        if stdout:
+            total = sum(duration for _, _, duration in timings)
+            stdout.write(f'Warmed {len(timings)} response(s) in {total:.2f}s')
+        time.sleep(max(0, interval - (time.monotonic() - started)))
@@ -0,0 +1,84 @@
+""" pluggable total-count strategies for paginated endpoints """
+import json
+import hashlib
+from django.conf import settings
+from django.db import connections
+from django.core.cache import cache
+
+
+class ExactCount:
+    """ plain COUNT(*) """
+    name = 'exact'
+
+    def count(self, queryset):
+        """ return (total, is_approximate) """
+        return queryset.count(), False
+
+
+class EstimatedCount(ExactCount):
+    """
+        Postgres planner estimates: pg_class.reltuples for unfiltered querysets and the
+        EXPLAIN row estimate for filtered ones. Small estimates fall back to an exact count.
+    """
+    name = 'estimated'
+
+    def count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return super().count(queryset)
+        estimate = None
+        try:
+            with connection.cursor() as cursor:
+                if not queryset.query.where:
+                    estimate = self.table_estimate(cursor, queryset.model._meta.db_table)
+                else:
+                    estimate = self.plan_estimate(cursor, queryset)
+        except Exception as e:
+            print('An error occurred while estimating count:', e)
+        if estimate is None or estimate < settings.PAGINATION_ESTIMATE_THRESHOLD:
+            return super().count(queryset)
+        return estimate, True
+
+    @staticmethod
+    def table_estimate(cursor, db_table):
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [db_table])
+        row = cursor.fetchone()
+        # reltuples is -1 (or 0) until the table has been analyzed
+        return row[0] if row and row[0] > 0 else None
+
+    @staticmethod
+    def plan_estimate(cursor, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedCount(ExactCount):
+    """ exact count memoised for a short TTL per normalized filter set (the WHERE clause) """
+    name = 'cached'
+
+    @staticmethod
+    def cache_key(queryset):
+        query = str(queryset.order_by().query)
+        digest = hashlib.sha1(query.encode()).hexdigest()
+        return f'pagination_count:{queryset.model._meta.label_lower}:{digest}'
+
+    def count(self, queryset):
+        key = self.cache_key(queryset)
+        total = cache.get(key)
+        if total is not None:
+            return total, True
+        total, _ = super().count(queryset)
+        cache.set(key, total, settings.PAGINATION_COUNT_CACHE_TTL)
+        return total, False
+
+
+COUNT_STRATEGIES = {strategy.name: strategy for strategy in (ExactCount, EstimatedCount, CachedCount)}
+
+
+def get_count_strategy(name=None):
+    """ count strategy instance by name (defaults to settings.PAGINATION_COUNT_STRATEGY) """
+    name = name or settings.PAGINATION_COUNT_STRATEGY
+    return COUNT_STRATEGIES.get(name, ExactCount)()
@@ -0,0 +1,399 @@
+""" streaming export engine (values_list projections over server-side cursors) """
+import os
+import re
+import csv
+import json
+import zlib
+import zipfile
+from decimal import Decimal
+from django.conf import settings
+from django.http import StreamingHttpResponse, HttpResponse
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # parquet exports are optional
+    pyarrow = None
+
+# format: (content type, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'csv.gz': ('application/gzip', '.csv.gz'),
+    'jsonl.gz': ('application/gzip', '.jsonl.gz'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+}
+
+ARROW_TYPES = {
+    'IntegerField': pyarrow.int64(),
+    'SmallIntegerField': pyarrow.int64(),
+    'BigIntegerField': pyarrow.int64(),
+    'PositiveIntegerField': pyarrow.int64(),
+    'PositiveSmallIntegerField': pyarrow.int64(),
+    'PositiveBigIntegerField': pyarrow.int64(),
+    'FloatField': pyarrow.float64(),
+    'DecimalField': pyarrow.float64(),
+    'BooleanField': pyarrow.bool_(),
+    'DateField': pyarrow.date32(),
+    'DateTimeField': pyarrow.timestamp('us', tz='UTC'),
+} if pyarrow else {}
+
+
+class Echo:
+    """ file-like object whose write returns the value instead of storing it """
+    def write(self, value):
+        return value
+
+
+class Column:
+    """
+        export column built from one or more values_list fields and an optional formatter;
+        typed formats (jsonl, parquet) skip formatters flagged `raw` and keep the field value
+    """
+
+    def __init__(self, header, *fields, format=None, key=None):
+        self.header = header
+        self.fields = fields
+        self.format = format
+        self.key = key or re.sub(r'[^a-z0-9]+', '_', header.lower()).strip('_')
+
+    def is_raw(self, typed):
+        return not self.format or (typed and getattr(self.format, 'raw', False))
+
+    def render(self, values, typed=False):
+        return values[0] if self.is_raw(typed) else self.format(*values)
+
+    def arrow_type(self, model):
+        """ parquet column type from the model field (raw values) or the formatter output """
+        if not self.is_raw(typed=True):
+            return {float: pyarrow.float64(), int: pyarrow.int64()}.get(self.format, pyarrow.string())
+        field = None
+        for name in self.fields[0].split('__'):
+            field = model._meta.get_field(name)
+            model = field.related_model or model
+        return ARROW_TYPES.get(field.get_internal_type(), pyarrow.string())
+
+
+class Section:
+    """ a queryset exported with a set of columns, optionally preceded by a title row """
+
+    def __init__(self, queryset, columns, title=None, name=None, shardable=False):
+        self.queryset = queryset
+        self.columns = columns
+        self.title = title
+        # table name used when every section is written to its own file
+        self.name = name or queryset.model._meta.model_name
+        # large sections that sharded export jobs may split across processes
+        self.shardable = shardable
+
+    @property
+    def headers(self):
+        return [column.header for column in self.columns]
+
+    @property
+    def fields(self):
+        return [field for column in self.columns for field in column.fields]
+
+    @property
+    def keys(self):
+        return [column.key for column in self.columns]
+
+    def rows(self, chunk_size=None, typed=False):
+        """ yield rendered rows without instantiating model objects """
+        queryset = self.queryset
+        if not queryset.query.order_by:
+            # skip the default Meta ordering so the cursor can stream without a sort
+            queryset = queryset.order_by()
+        slices, start = [], 0
+        for column in self.columns:
+            slices.append((column, start, start + len(column.fields)))
+            start += len(column.fields)
+        for values in queryset.values_list(*self.fields).iterator(
+            chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE
+        ):
+            yield [column.render(values[begin:end], typed) for column, begin, end in slices]
+
+
+def choice_label(choices, default=''):
+    """ formatter for get_FOO_display() """
+    labels = dict(choices)
+    return lambda value: labels.get(value, value) if value is not None else default
+
+
+def date_label(date_format, default=''):
+    """ formatter for an optional date/datetime """
+    formatter = lambda value: value.strftime(date_format) if value else default
+    formatter.raw = True
+    return formatter
+
+
+def percent_label():
+    """ formatter for a 0-100 integer """
+    formatter = lambda value: f"{value}%"
+    formatter.raw = True
+    return formatter
+
+
+def full_name(default=''):
+    """ formatter for (first_name, last_name) """
+    return lambda first, last: f"{first or ''} {last or ''}".strip() or default
+
+
+def csv_preamble(section, index=0, titles=True):
+    """ blank separator (after the first section), title row and header row """
+    writer = csv.writer(Echo())
+    lines = [writer.writerow([])] if index else []
+    if section.title and titles:
+        lines.append(writer.writerow([section.title]))
+    lines.append(writer.writerow(section.headers))
+    return ''.join(lines)
+
+
+def csv_chunks(sections, chunk_size=None, progress=None, tracker=None, titles=True, headers=True):
+    """
+        encode sections as CSV, buffered into settings.EXPORT_BUFFER_SIZE sized chunks;
+        progress(rows_written) is reported through a ProgressTracker
+    """
+    owns_tracker = tracker is None
+    tracker = tracker or ProgressTracker(progress)
+    writer = csv.writer(Echo())
+    buffer, size = [], 0
+    for index, section in enumerate(sections):
+        if headers:
+            buffer.append(csv_preamble(section, index, titles))
+        for row in tracker.track(section.rows(chunk_size)):
+            line = writer.writerow(row)
+            buffer.append(line)
+            size += len(line)
+            if size >= settings.EXPORT_BUFFER_SIZE:
+                yield ''.join(buffer)
+                buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+    if owns_tracker:
+        tracker.done()
+
+
+class _Sink:
+    """ write-only file object whose output is drained after every batch """
+    closed = False
+
+    def __init__(self):
+        self.parts, self.position = [], 0
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def drain(self):
+        data, self.parts = b''.join(self.parts), []
+        return data
+
+
+class ProgressTracker:
+    """ counts exported rows and reports the running total every EXPORT_CHUNK_SIZE rows """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.rows_written = 0
+
+    def track(self, rows):
+        for row in rows:
+            yield row
+            self.rows_written += 1
+            if self.callback and self.rows_written % settings.EXPORT_CHUNK_SIZE == 0:
+                self.callback(self.rows_written)
+
+    def done(self):
+        if self.callback:
+            self.callback(self.rows_written)
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def gzip_chunks(chunks):
+    """ gzip a stream of str/bytes chunks without holding it in memory """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def jsonl_chunks(section, tracker, chunk_size=None):
+    """ one JSON object per row, keyed by Column.key, with typed values """
+    keys = section.keys
+    for batch in _batches(tracker.track(section.rows(chunk_size, typed=True)), settings.EXPORT_CHUNK_SIZE):
+        yield ''.join(json.dumps(dict(zip(keys, row)), default=_json_default) + '\n' for row in batch)
+
+
+def parquet_chunks(section, tracker, chunk_size=None):
+    """ one row group per EXPORT_CHUNK_SIZE rows, drained as it is written """
+    model = section.queryset.model
+    schema = pyarrow.schema([(column.key, column.arrow_type(model)) for column in section.columns])
+    converters = [
+        str if field.type == pyarrow.string() else float if field.type == pyarrow.float64() else None
+        for field in schema
+    ]
+    sink = _Sink()
+    writer = pyarrow.parquet.ParquetWriter(pyarrow.PythonFile(sink, mode='w'), schema, compression='snappy')
+    for batch in _batches(tracker.track(section.rows(chunk_size, typed=True)), settings.EXPORT_CHUNK_SIZE):
+        arrays = [
+            pyarrow.array(
+                [value if value is None or convert is None else convert(value) for value in values],
+                type=field.type
+            ) for values, field, convert in zip(zip(*batch), schema, converters)
+        ]
+        writer.write_batch(pyarrow.record_batch(arrays, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def section_chunks(section, export_format, tracker, chunk_size=None, headers=True):
+    """ a single section in one of the non-csv formats (or a header-less csv body) """
+    if export_format == 'parquet':
+        return parquet_chunks(section, tracker, chunk_size)
+    if export_format == 'jsonl.gz':
+        return gzip_chunks(jsonl_chunks(section, tracker, chunk_size))
+    body = csv_chunks([section], chunk_size, tracker=tracker, titles=False, headers=headers)
+    return body if export_format == 'csv' else gzip_chunks(body)
+
+
+def zip_chunks(members):
+    """ stream a zip archive of (name, chunks) members; members are already compressed """
+    sink = _Sink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for name, chunks in members:
+            with archive.open(name, mode='w', force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk.encode() if isinstance(chunk, str) else chunk)
+                    yield sink.drain()
+    yield sink.drain()
+
+
+def export_format_error(export_format):
+    """ validation message for an unsupported format, or None """
+    if export_format not in EXPORT_FORMATS:
+        return f"Unsupported format, use one of: {', '.join(EXPORT_FORMATS)}"
+    if export_format == 'parquet' and pyarrow is None:
+        return 'Parquet export requires pyarrow to be installed'
+    return None
+
+
+def export_file_name(file_stem, sections, export_format):
+    """ csv keeps the sectioned single file; other formats write one table per section (zipped) """
+    if export_format != 'csv' and len(sections) > 1:
+        return f"{file_stem}.zip", 'application/zip'
+    content_type, extension = EXPORT_FORMATS[export_format]
+    return f"{file_stem}{extension}", content_type
+
+
+def export_chunks(sections, export_format='csv', chunk_size=None, progress=None):
+    """ encoded export in any EXPORT_FORMATS format; progress(rows_written) as for csv_chunks """
+    if export_format == 'csv':
+        yield from csv_chunks(sections, chunk_size, progress)
+        return
+    tracker = ProgressTracker(progress)
+    if len(sections) == 1:
+        yield from section_chunks(sections[0], export_format, tracker, chunk_size)
+    else:
+        extension = EXPORT_FORMATS[export_format][1]
+        yield from zip_chunks(
+            (f"{section.name}{extension}", section_chunks(section, export_format, tracker, chunk_size))
+            for section in sections
+        )
+    tracker.done()
+
+
+def stream_csv(filename, sections, chunk_size=None):
+    """ StreamingHttpResponse for one or more export sections """
+    response_obj = StreamingHttpResponse(csv_chunks(sections, chunk_size), content_type='text/csv')
+    response_obj['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response_obj
+
+
+def stream_export(file_stem, sections, export_format='csv', chunk_size=None):
+    """ StreamingHttpResponse for export sections in the requested format """
+    filename, content_type = export_file_name(file_stem, sections, export_format)
+    response_obj = StreamingHttpResponse(
+        export_chunks(sections, export_format, chunk_size), content_type=content_type
+    )
+    response_obj['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response_obj
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _file_iterator(path, start, length, block_size=64 * 1024):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            data = file.read(min(block_size, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def ranged_file_response(path, filename, content_type, range_header=None, if_range=None, etag=None):
+    """
+        serve a local file honouring a single `Range: bytes=...` request so downloads can resume;
+        a stale If-Range validator falls back to the full file
+    """
+    size = os.path.getsize(path)
+    start, end = 0, size - 1
+    match = RANGE_RE.match(range_header.strip()) if range_header else None
+    if range_header and (not if_range or if_range == etag):
+        if not match or not any(match.groups()):
+            match = None
+        elif match.group(1):
+            start = int(match.group(1))
+            end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+        else:
+            start = max(0, size - int(match.group(2)))
+        if match and (start >= size or start > end):
+            response_obj = HttpResponse(status=416)
+            response_obj['Content-Range'] = f'bytes */{size}'
+            return response_obj
+    else:
+        match = None
+
+    length = end - start + 1 if size else 0
+    response_obj = StreamingHttpResponse(
+        _file_iterator(path, start, length), content_type=content_type, status=206 if match else 200
+    )
+    response_obj['Content-Length'] = str(length)
+    response_obj['Accept-Ranges'] = 'bytes'
+    response_obj['Content-Disposition'] = f'attachment; filename="{filename}"'
+    if match:
+        response_obj['Content-Range'] = f'bytes {start}-{end}/{size}'
+    if etag:
+        response_obj['ETag'] = etag
+    return response_obj
@@ -0,0 +1,302 @@
+""" export job definitions and the background runner used by run_export_worker """
+import os
+import uuid
+import time
+import shutil
+import select
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.db import connection, connections, close_old_connections
+from django.db.models import Q
+from fme.helpers import options
+from fme.helpers.export import (
+    Column, Section, EXPORT_FORMATS, ProgressTracker, export_chunks, export_file_name, section_chunks,
+    csv_preamble, gzip_chunks, zip_chunks, choice_label, date_label, percent_label, full_name
+)
+from fme.helpers.upload import store_export_file, delete_export_file
+from fme.helpers.delta import resolve_watermark, changed_since, tombstone_section, next_change_token
+from fme.models.user import User
+from fme.models.learner import LearnerProfile
+from fme.models.mentor import MentorProfile
+from fme.models.export_job import ExportJob
+from fme.models.tombstone import Tombstone
+
+
+def learners_report(params):
+    """
+        GenerateReportView learners report; definitions return (file stem, sections).
+        A since/change_token in params limits rows to changes and appends tombstones.
+    """
+    watermark = resolve_watermark(params)
+    queryset = changed_since(LearnerProfile.objects.all(), watermark)
+    if params.get('date_from'):
+        queryset = queryset.filter(created_at__gte=params['date_from'])
+    if params.get('date_to'):
+        queryset = queryset.filter(created_at__lte=params['date_to'])
+    # delta rows need a key to upsert on
+    key_columns = [Column('ID', 'user__id', format=str)] if watermark else []
+    sections = [Section(queryset, key_columns + [
+        Column('Name', 'user__first_name', 'user__last_name', format=full_name()),
+        Column('Email', 'user__email'),
+        Column('State', 'state', format=choice_label(options.STATE)),
+        Column('Learning Track', 'learning_track'),
+        Column('Progress', 'progress', format=percent_label()),
+        Column('Registration Date', 'created_at', format=date_label('%Y-%m-%d')),
+        Column('Last Active', 'user__last_active', format=date_label('%Y-%m-%d', 'Never')),
+        Column('Status', 'user__status', format=choice_label(User.Status.choices)),
+    ], name='learners', shardable=True)]
+    if watermark:
+        sections.append(tombstone_section('learners', watermark))
+    return 'learners_report', sections
+
+
+def full_platform_data(params):
+    """ DataExportView full export """
+    watermark = resolve_watermark(params)
+    learners = Section(changed_since(LearnerProfile.objects.all(), watermark), [
+        Column('ID', 'user__id', format=str),
+        Column('Name', 'user__first_name', 'user__last_name', format=full_name()),
+        Column('Email', 'user__email'),
+        Column('Phone', 'user__phone_number'),
+        Column('State', 'state', format=choice_label(options.STATE)),
+        Column('Gender', 'gender', format=choice_label(LearnerProfile.Gender.choices)),
+        Column('Learning Track', 'learning_track'),
+        Column('Progress', 'progress'),
+        Column('Registration Date', 'created_at', format=date_label('%Y-%m-%d')),
+        Column('Last Active', 'user__last_active', format=date_label('%Y-%m-%d %H:%M', 'Never')),
+    ], title='=== LEARNERS DATA ===', name='learners', shardable=True)
+
+    mentors = Section(changed_since(MentorProfile.objects.all(), watermark), [
+        Column('ID', 'user__id', format=str),
+        Column('Name', 'user__first_name', 'user__last_name', format=full_name()),
+        Column('Email', 'user__email'),
+        Column('Specialization', 'specialization'),
+        Column('Current Mentees', 'current_mentees_count'),
+        Column('Total Mentees', 'overall_mentees_count'),
+        Column('Rating', 'rating', format=float),
+        Column('Join Date', 'created_at', format=date_label('%Y-%m-%d')),
+    ], title='=== MENTORS DATA ===', name='mentors')
+    if watermark:
+        return 'full_platform_data', [
+            learners, mentors, tombstone_section('learners', watermark), tombstone_section('mentors', watermark)
+        ]
+    return 'full_platform_data', [learners, mentors]
+
+
+EXPORT_KINDS = {
+    'learners_report': learners_report,
+    'full_data': full_platform_data,
+}
+
+
+def run_export_job(job):
+    """ write the job's sections to a temporary file and hand it to storage """
+    export_format = job.params.get('format', 'csv')
+    workers = int(job.params.get('workers') or settings.EXPORT_SHARD_WORKERS)
+    change_token = next_change_token()
+    file_stem, sections = EXPORT_KINDS[job.kind](job.params)
+    sharded = workers > 1 and any(section.shardable for section in sections)
+    job.file_name, job.content_type = export_file_name(file_stem, sections, export_format)
+    if sharded and export_format == 'parquet':
+        # parquet shards cannot be concatenated, they are zipped as part files
+        job.file_name, job.content_type = f"{file_stem}.zip", 'application/zip'
+    job.change_token = change_token
+    job.total_rows = sum(section.queryset.count() for section in sections)
+    job.rows_written = 0
+    job.save(update_fields=['file_name', 'content_type', 'total_rows', 'rows_written', 'change_token', 'updated_at'])
+
+    os.makedirs(settings.EXPORT_ROOT, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=settings.EXPORT_ROOT, suffix='.part')
+    shard_dir = tempfile.mkdtemp(dir=settings.EXPORT_ROOT, suffix='.shards') if sharded else None
+    try:
+        if sharded:
+            chunks = sharded_export_chunks(job, sections, export_format, workers, shard_dir)
+        else:
+            chunks = export_chunks(sections, export_format, progress=job.heartbeat)
+        with os.fdopen(handle, 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+        file_size = os.path.getsize(temp_path)
+        stored_path, storage = store_export_file(temp_path, f"{job.id}/{job.file_name}", job.content_type)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        if shard_dir:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+    if sharded:
+        job.refresh_from_db(fields=['rows_written'])
+    job.mark_completed(stored_path, file_size, storage)
+    return job
+
+
+def shard_filters(shard_by, shards):
+    """
+        Q objects that partition a section: one per state, or `shards` equal ranges of the
+        uuid4 primary key space (uuid4 keys are uniformly distributed, so no sampling is needed)
+    """
+    if shard_by == 'state':
+        states = [value for value, _ in options.STATE]
+        return [Q(state=state) for state in states] + [~Q(state__in=states)]
+    step = (1 << 128) // shards
+    filters = []
+    for index in range(shards):
+        query = Q(pk__gte=uuid.UUID(int=index * step))
+        if index < shards - 1:
+            query &= Q(pk__lt=uuid.UUID(int=(index + 1) * step))
+        filters.append(query)
+    return filters
+
+
+class ShardHeartbeat:
+    """ turns a shard's running row total into ExportJob.add_rows increments """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.reported = 0
+
+    def __call__(self, rows_written):
+        if rows_written > self.reported:
+            ExportJob.add_rows(self.job_id, rows_written - self.reported)
+            self.reported = rows_written
+
+
+def write_shard(job_id, kind, params, section_index, shard_filter, export_format, path):
+    """ process pool task: rebuild the section, restrict it to one shard and write it to path """
+    _, sections = EXPORT_KINDS[kind](params)
+    section = sections[section_index]
+    section.queryset = section.queryset.filter(shard_filter)
+    tracker = ProgressTracker(ShardHeartbeat(job_id))
+    with open(path, 'wb') as file:
+        for chunk in section_chunks(section, export_format, tracker, headers=False):
+            file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+    tracker.done()
+    return tracker.rows_written
+
+
+def _read_file(path, block_size=1024 * 1024):
+    with open(path, 'rb') as file:
+        while True:
+            data = file.read(block_size)
+            if not data:
+                break
+            yield data
+
+
+def _concatenated(paths, preamble=None):
+    """ shard bodies behind the section preamble; gzip members concatenate into a valid gzip file """
+    if preamble:
+        yield preamble
+    for path in paths:
+        yield from _read_file(path)
+
+
+def sharded_export_chunks(job, sections, export_format, workers, shard_dir):
+    """
+        write every shardable section in `workers` processes (one shard per pk range or state),
+        then concatenate the shards (csv, csv.gz, jsonl.gz) or zip them as part files (parquet)
+    """
+    shard_by = job.params.get('shard_by', 'pk')
+    shard_paths = {}
+    # forked children must open their own database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+        futures = []
+        for index, section in enumerate(sections):
+            if not section.shardable:
+                continue
+            for shard, shard_filter in enumerate(shard_filters(shard_by, workers)):
+                path = os.path.join(shard_dir, f"{section.name}-{shard:05d}")
+                shard_paths.setdefault(index, []).append(path)
+                futures.append(pool.submit(
+                    write_shard, job.id, job.kind, job.params, index, shard_filter, export_format, path
+                ))
+        for future in futures:
+            future.result()
+
+    tracker = ProgressTracker(ShardHeartbeat(job.id))
+    if export_format == 'csv':
+        for index, section in enumerate(sections):
+            if index in shard_paths:
+                yield from _concatenated(shard_paths[index], csv_preamble(section, index))
+            else:
+                yield csv_preamble(section, index)
+                yield from section_chunks(section, 'csv', tracker, headers=False)
+        tracker.done()
+        return
+
+    extension = EXPORT_FORMATS[export_format][1]
+    members = []
+    for index, section in enumerate(sections):
+        if index not in shard_paths:
+            members.append((f"{section.name}{extension}", section_chunks(section, export_format, tracker)))
+        elif export_format == 'parquet':
+            members.extend(
+                (f"{section.name}/part-{shard:05d}{extension}", _read_file(path))
+                for shard, path in enumerate(shard_paths[index])
+            )
+        else:
+            preamble = b''.join(gzip_chunks([csv_preamble(section, titles=False)])) if export_format == 'csv.gz' else None
+            members.append((f"{section.name}{extension}", _concatenated(shard_paths[index], preamble)))
+    if len(members) == 1 and export_format != 'parquet':
+        yield from members[0][1]
+    else:
+        yield from zip_chunks(members)
+    tracker.done()
+
+
+def purge_expired_exports():
+    """ delete artifacts past EXPORT_JOB_TTL """
+    purged = 0
+    for job in ExportJob.expired():
+        try:
+            delete_export_file(job.file_path, job.storage)
+        except Exception as e:
+            print('An error occurred while deleting export file:', e)
+            continue
+        job.status = ExportJob.Status.EXPIRED
+        job.file_path = ''
+        job.save(update_fields=['status', 'file_path', 'updated_at'])
+        purged += 1
+    return purged
+
+
+def wait_for_jobs(timeout):
+    """ block until a NOTIFY arrives (Postgres) or the poll interval elapses """
+    if connection.vendor != 'postgresql':
+        time.sleep(timeout)
+        return
+    connection.ensure_connection()
+    pg_connection = connection.connection
+    with connection.cursor() as cursor:
+        cursor.execute(f'LISTEN {ExportJob.NOTIFY_CHANNEL}')
+    if select.select([pg_connection], [], [], timeout)[0]:
+        pg_connection.poll()
+        pg_connection.notifies.clear()
+
+
+def run_worker(once=False, poll_interval=None, stdout=None):
+    """ claim and run jobs until interrupted (or until the queue is empty with once=True) """
+    poll_interval = poll_interval or settings.EXPORT_JOB_POLL_INTERVAL
+    while True:
+        close_old_connections()
+        ExportJob.requeue_stale()
+        job = ExportJob.claim_next()
+        if job is None:
+            purge_expired_exports()
+            Tombstone.purge()
+            if once:
+                return
+            wait_for_jobs(poll_interval)
+            continue
+        try:
+            run_export_job(job)
+            if stdout:
+                stdout.write(f'Export {job.id} ({job.kind}) completed: {job.rows_written} rows')
+        except Exception as e:
+            job.mark_failed(e)
+            if stdout:
+                stdout.write(f'Export {job.id} ({job.kind}) failed: {e}')
@@ -0,0 +1,53 @@
+""" HyperLogLog distinct counter (mergeable fixed size sketch) """
+import math
+import hashlib
+
+DEFAULT_PRECISION = 12  # 4096 one byte registers, ~1.6% standard error
+_INVERSE_POWERS = [2.0 ** -rank for rank in range(66)]
+
+
+class HyperLogLog:
+    def __init__(self, registers=None, precision=DEFAULT_PRECISION):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError(f'Expected {self.size} registers, got {len(self.registers)}')
+
+    @staticmethod
+    def hash(value):
+        return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+
+    def add(self, value):
+        self.add_hash(self.hash(value))
+
+    def add_hash(self, value_hash):
+        bits = 64 - self.precision
+        index = value_hash >> bits
+        rank = bits - (value_hash & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        """ in place union """
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    @classmethod
+    def union(cls, sketches, precision=DEFAULT_PRECISION):
+        result = cls(precision=precision)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(_INVERSE_POWERS[rank] for rank in self.registers)
+        zeros = self.registers.count(0)
+        # linear counting is far more accurate for small cardinalities
+        if estimate <= 2.5 * self.size and zeros:
+            return round(self.size * math.log(self.size / zeros))
+        return round(estimate)
+
+    def to_bytes(self):
+        return bytes(self.registers)
@@ -0,0 +1,299 @@
+""" bulk learner import: CSV/XLSX -> column validation -> pooled password hashing -> chunked inserts """
+import io
+import re
+import csv
+import uuid
+from collections import Counter
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.core.validators import validate_email
+from django.core.exceptions import ValidationError
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction, IntegrityError
+from django.utils import timezone
+from fme.helpers import options
+from fme.helpers.skill_area_analytics import invalidate_skill_areas
+from fme.models.user import User
+from fme.models.learner import LearnerProfile
+from fme.models.skill_area import SkillArea
+
+try:
+    import openpyxl
+except ImportError:  # xlsx imports are optional
+    openpyxl = None
+
+IMPORT_FORMATS = ('.csv', '.xlsx')
+REQUIRED_COLUMNS = (
+    'first_name', 'last_name', 'email', 'phone_number', 'account_type', 'learning_track',
+    'skill_cluster', 'work_type', 'industrial_prefrence', 'state', 'gender',
+)
+OPTIONAL_COLUMNS = ('portfolio_link', 'password')
+COLUMN_ALIASES = {'industrial_preference': 'industrial_prefrence', 'phone': 'phone_number'}
+MAX_LENGTHS = {
+    'first_name': 150, 'last_name': 150, 'phone_number': 20, 'learning_track': 100,
+    'skill_cluster': 100, 'industrial_prefrence': 100, 'portfolio_link': 200,
+}
+CHOICE_COLUMNS = {
+    'account_type': LearnerProfile.AccountType.choices,
+    'work_type': LearnerProfile.WorkType.choices,
+    'state': options.STATE,
+    'gender': LearnerProfile.Gender.choices,
+}
+PHONE_RULE = re.compile(r'(^[+0-9]{1,3})*([0-9]{10,11}$)')
+USER_FIELDS = ('first_name', 'last_name', 'email', 'phone_number')
+PROFILE_FIELDS = (
+    'account_type', 'learning_track', 'skill_cluster', 'work_type', 'industrial_prefrence',
+    'portfolio_link', 'state', 'gender',
+)
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+def import_format_error(file_name):
+    if not file_name.lower().endswith(IMPORT_FORMATS):
+        return f"Unsupported file type, use one of {', '.join(IMPORT_FORMATS)}"
+    if file_name.lower().endswith('.xlsx') and openpyxl is None:
+        return 'XLSX imports require openpyxl'
+    return None
+
+
+def normalize_header(header):
+    header = re.sub(r'[^a-z0-9]+', '_', str(header or '').strip().lower()).strip('_')
+    return COLUMN_ALIASES.get(header, header)
+
+
+def read_rows(file, file_name):
+    """ (headers, rows as lists of stripped strings) from an uploaded or opened binary file """
+    if file_name.lower().endswith('.xlsx'):
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        sheet_rows = workbook.active.iter_rows(values_only=True)
+        rows = [['' if value is None else str(value).strip() for value in row] for row in sheet_rows]
+        workbook.close()
+    else:
+        text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        rows = [[value.strip() for value in row] for row in csv.reader(text)]
+    rows = [row for row in rows if any(row)]
+    if not rows:
+        raise ImportFileError('The file is empty')
+    headers = [normalize_header(header) for header in rows[0]]
+    missing = [column for column in REQUIRED_COLUMNS if column not in headers]
+    if missing:
+        raise ImportFileError(f"Missing column(s): {', '.join(missing)}")
+    return headers, rows[1:]
+
+
+def columns_of(headers, rows):
+    """ column name -> list of values (rows are padded to the header width) """
+    width = len(headers)
+    columns = {header: [] for header in headers}
+    for row in rows:
+        row = row + [''] * (width - len(row))
+        for header, value in zip(headers, row):
+            columns[header].append(value)
+    return columns
+
+
+def choice_lookup(choices):
+    """ accept the stored value or the label in any case """
+    lookup = {}
+    for value, label in choices:
+        lookup[value.lower()] = value
+        lookup[label.lower()] = value
+    return lookup
+
+
+def validate_columns(columns, row_count):
+    """
+        one pass per column (instead of a serializer and queries per row), plus a single
+        query for emails that already exist. Returns (cleaned columns, {row index: {column: error}})
+    """
+    errors = {}
+
+    def fail(index, column, message):
+        errors.setdefault(index, {})[column] = message
+
+    cleaned = {}
+    for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS:
+        values = columns.get(column, [''] * row_count)
+        if column in REQUIRED_COLUMNS:
+            for index, value in enumerate(values):
+                if not value:
+                    fail(index, column, 'This field is required')
+        if column in MAX_LENGTHS:
+            for index, value in enumerate(values):
+                if len(value) > MAX_LENGTHS[column]:
+                    fail(index, column, f'Ensure this field has no more than {MAX_LENGTHS[column]} characters')
+        if column in CHOICE_COLUMNS:
+            lookup = choice_lookup(CHOICE_COLUMNS[column])
+            values = [lookup.get(value.lower(), value) for value in values]
+            for index, value in enumerate(values):
+                if value and value not in lookup.values():
+                    fail(index, column, f'"{value}" is not a valid choice')
+        cleaned[column] = values
+
+    emails = cleaned['email'] = [value.lower() for value in cleaned['email']]
+    first_row = {}
+    for index, email in enumerate(emails):
+        if not email:
+            continue
+        try:
+            validate_email(email)
+        except ValidationError:
+            fail(index, 'email', 'Enter a valid email address')
+            continue
+        if email in first_row:
+            fail(index, 'email', f'Duplicate of row {first_row[email] + 2}')
+        else:
+            first_row[email] = index
+    for index, phone in enumerate(cleaned['phone_number']):
+        if phone and not PHONE_RULE.search(phone):
+            fail(index, 'phone_number', 'Invalid phone number supplied')
+
+    existing = set()
+    candidates = list(first_row)
+    for start in range(0, len(candidates), 5000):
+        existing.update(User.objects.filter(email__in=candidates[start:start + 5000]).values_list('email', flat=True))
+    for email in existing:
+        fail(first_row[email], 'email', 'User with this email already exists')
+    return cleaned, errors
+
+
+def hash_passwords(passwords, make_many=None):
+    """
+        make_password is deliberately slow, so rows with a password are hashed in
+        IMPORT_HASH_WORKERS forked processes, or by `make_many` when given (web requests pass
+        the spawned login hashing pool). Rows without one get an unusable password.
+    """
+    hashed = [make_password(None)] * len(passwords)
+    todo = [index for index, password in enumerate(passwords) if password]
+    if make_many:
+        for index, value in zip(todo, make_many([passwords[index] for index in todo])):
+            hashed[index] = value
+        return hashed
+    workers = settings.IMPORT_HASH_WORKERS
+    if len(todo) < 2 or workers < 2:
+        for index in todo:
+            hashed[index] = make_password(passwords[index])
+        return hashed
+    # forked children only hash, they must not share the parent's database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+        results = pool.map(make_password, [passwords[index] for index in todo], chunksize=64)
+        for index, value in zip(todo, results):
+            hashed[index] = value
+    return hashed
+
+
+def build_instances(cleaned, indexes, passwords, status, skill_areas):
+    now = timezone.now()
+    users, profiles = [], []
+    for index in indexes:
+        user = User(
+            id=uuid.uuid4(), username=cleaned['email'][index], password=passwords[index],
+            role=User.Role.LEARNER, status=status, is_active=status != User.Status.DISABLED,
+            created_at=now, updated_at=now,
+            **{field: cleaned[field][index] for field in USER_FIELDS}
+        )
+        users.append(user)
+        profile = {field: cleaned[field][index] for field in PROFILE_FIELDS}
+        profile['portfolio_link'] = profile['portfolio_link'] or None
+        profile['skill_area_id'] = skill_areas.get(profile['learning_track'])
+        profiles.append(LearnerProfile(id=uuid.uuid4(), user_id=user.id, created_at=now, updated_at=now, **profile))
+    return users, profiles
+
+
+def _copy_value(value):
+    return r'\N' if value is None else value
+
+
+def copy_insert(model, instances):
+    """ Postgres COPY of fully built instances (every concrete column, primary keys included) """
+    fields = model._meta.concrete_fields
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for instance in instances:
+        writer.writerow([
+            _copy_value(field.get_db_prep_save(getattr(instance, field.attname), connection)) for field in fields
+        ])
+    buffer.seek(0)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer
+        )
+
+
+def insert_chunk(users, profiles):
+    """ one transaction per chunk; COPY on Postgres, bulk_create elsewhere """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            copy_insert(User, users)
+            copy_insert(LearnerProfile, profiles)
+        else:
+            User.objects.bulk_create(users)
+            LearnerProfile.objects.bulk_create(profiles)
+
+
+def insert_rows_individually(users, profiles, indexes, errors):
+    """ fallback for a chunk that hit a constraint (e.g. an email created meanwhile) """
+    created = 0
+    for user, profile, index in zip(users, profiles, indexes):
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+                profile.save(force_insert=True)
+            created += 1
+        except IntegrityError as e:
+            errors.setdefault(index, {})['row'] = f'Could not be saved: {e}'
+    return created
+
+
+def import_learners(file, file_name, dry_run=False, status=User.Status.ACTIVE, stdout=None, make_many=None):
+    """
+        import learners from a CSV/XLSX file. Valid rows are imported even when others fail;
+        the report lists every failed row with its spreadsheet row number (header = row 1).
+        `make_many` replaces the forked hashing processes (see hash_passwords).
+    """
+    headers, rows = read_rows(file, file_name)
+    cleaned, errors = validate_columns(columns_of(headers, rows), len(rows))
+    valid = [index for index in range(len(rows)) if index not in errors]
+
+    created = 0
+    if not dry_run and valid:
+        # row index -> hash, invalid rows are never hashed
+        passwords = dict(zip(valid, hash_passwords([cleaned['password'][index] for index in valid], make_many)))
+        chunk_size = settings.IMPORT_CHUNK_SIZE
+        # learning_track -> skill area id, resolved once for the whole file
+        skill_areas = dict(SkillArea.objects.filter(
+            name__in={cleaned['learning_track'][index] for index in valid}
+        ).values_list('name', 'id'))
+        for start in range(0, len(valid), chunk_size):
+            indexes = valid[start:start + chunk_size]
+            users, profiles = build_instances(cleaned, indexes, passwords, status, skill_areas)
+            try:
+                insert_chunk(users, profiles)
+                created += len(indexes)
+                # bulk inserts send no post_save, count them into their skill areas here
+                for skill_area_id, count in Counter(profile.skill_area_id for profile in profiles).items():
+                    SkillArea.apply_learner_delta(skill_area_id, count)
+            except IntegrityError:
+                created += insert_rows_individually(users, profiles, indexes, errors)
+            if stdout:
+                stdout.write(f'Imported {created} of {len(valid)} valid rows')
+        invalidate_skill_areas(skill_areas.values())
+
+    return {
+        'total_rows': len(rows),
+        'valid_rows': len(valid),
+        'created': created,
+        'failed': len(errors),
+        'dry_run': dry_run,
+        'errors': [
+            {'row': index + 2, 'email': cleaned['email'][index], 'errors': errors[index]}
+            for index in sorted(errors)
+        ],
+    }
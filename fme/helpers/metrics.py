@@ -0,0 +1,89 @@
+""" single pass dashboard metrics helper """
+from datetime import timedelta
+from fme.models.user import User
+from django.utils import timezone
+from django.db.models import Count, Q, Avg
+from fme.models.learner import LearnerProfile
+from fme.helpers.presence import presence_index
+
+PERIOD_DAYS = {'week': 7, 'month': 30, 'quarter': 90, 'year': 365}
+
+
+def period_start(period, now=None):
+    """ return the start date of a dashboard period (defaults to a year) """
+    now = now or timezone.now()
+    return now - timedelta(days=PERIOD_DAYS.get(period, PERIOD_DAYS['year']))
+
+
+class DashboardMetrics:
+    """
+        Compute dashboard counters with one conditional aggregate query per model.
+        Results are memoised on the instance so several views/sections can share them.
+    """
+
+    def __init__(self, period='month', state=None, now=None):
+        self.now = now or timezone.now()
+        self.period = period
+        self.state = state
+        self.start_date = period_start(period, self.now)
+        self._user_counts = None
+        self._learner_counts = None
+
+    def user_counts(self):
+        """ all user counters in a single query plus the presence index windows """
+        if self._user_counts is None:
+            now, today = self.now, self.now.date()
+            self._user_counts = User.objects.aggregate(
+                total=Count('id'),
+                new_today=Count('id', filter=Q(created_at__date=today)),
+                new_learners=Count('id', filter=Q(
+                    created_at__gte=self.start_date, role=User.Role.LEARNER
+                )),
+                pending_approval=Count('id', filter=Q(
+                    created_at__gte=self.start_date, status=User.Status.DISABLED
+                )),
+                learners=Count('id', filter=Q(role=User.Role.LEARNER)),
+                mentors=Count('id', filter=Q(role=User.Role.MENTOR)),
+                facilitators=Count('id', filter=Q(role=User.Role.FACILITATOR)),
+                admins=Count('id', filter=Q(role=User.Role.ADMIN)),
+                active=Count('id', filter=Q(status=User.Status.ACTIVE)),
+                inactive=Count('id', filter=Q(status=User.Status.INACTIVE)),
+                disabled=Count('id', filter=Q(status=User.Status.DISABLED)),
+            )
+            # activity windows come from the presence index, not from last_active range scans
+            self._user_counts.update(
+                active_30d=presence_index.active_count(timedelta(days=30), now),
+                online_15m=presence_index.active_count(timedelta(minutes=15), now),
+                active_today=presence_index.active_today(now),
+            )
+        return self._user_counts
+
+    def learner_counts(self):
+        """ all learner profile counters (optionally scoped to a state) in a single query """
+        if self._learner_counts is None:
+            now = self.now
+            learners_qs = LearnerProfile.objects.all()
+            if self.state:
+                learners_qs = learners_qs.filter(state=self.state)
+            self._learner_counts = learners_qs.aggregate(
+                total=Count('id'),
+                new_in_period=Count('id', filter=Q(created_at__gte=self.start_date)),
+                active_30d=Count('id', filter=Q(user__last_active__gte=now - timedelta(days=30))),
+                dropout=Count('id', filter=Q(
+                    user__last_active__lt=now - timedelta(days=60), progress__lt=20
+                )),
+                not_started=Count('id', filter=Q(progress=0)),
+                in_progress=Count('id', filter=Q(progress__gt=0, progress__lt=100)),
+                beginner=Count('id', filter=Q(progress__lt=25)),
+                intermediate=Count('id', filter=Q(progress__gte=25, progress__lt=75)),
+                advanced=Count('id', filter=Q(progress__gte=75)),
+                completed=Count('id', filter=Q(progress__gte=80)),
+                certified=Count('id', filter=Q(progress=100)),
+                avg_progress=Avg('progress'),
+            )
+        return self._learner_counts
+
+    @staticmethod
+    def percentage(part, total):
+        """ safe percentage used across dashboard sections """
+        return (part / max(total, 1)) * 100
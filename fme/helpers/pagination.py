@@ -1,4 +1,58 @@
+import json
+import base64
+from functools import reduce
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from django.core.paginator import Paginator, Page, EmptyPage, PageNotAnInteger
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+from fme.helpers.count_strategy import get_count_strategy
+
+
+class CountStrategyPage(Page):
+    def has_next(self):
+        if self.paginator.count_is_approximate:
+            return len(self.object_list) == self.paginator.per_page
+        return super().has_next()
+
+
+class CountStrategyPaginator(Paginator):
+    """ django paginator whose total comes from a pluggable count strategy """
+
+    def __init__(self, object_list, per_page, count_strategy=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy or get_count_strategy()
+        self.count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        total, self.count_is_approximate = self.count_strategy.count(self.object_list)
+        return total
+
+    def validate_number(self, number):
+        if not (self.count and self.count_is_approximate):
+            return super().validate_number(number)
+        # with an estimated total only the lower bound can be checked
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_approximate:
+            return super().page(number)
+        # an estimated total must not truncate or reject real pages
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+    def _get_page(self, *args, **kwargs):
+        return CountStrategyPage(*args, **kwargs)
+
 
 class PaginationHandlerMixin(PageNumberPagination):
     page_size = 10
@@ -6,15 +60,156 @@ class PaginationHandlerMixin(PageNumberPagination):
     page_query_param = 'page'
     # max_page_size = 50
 
-    
+    # keyset (cursor) mode, opt in with ?pagination=cursor or by sending a cursor
+    cursor_query_param = 'cursor'
+    pagination_mode_query_param = 'pagination'
+    with_total_query_param = 'with_total'
+    cursor_ordering = ('-created_at', '-id')
+    cursor_mode = False
+
+    # total count strategy: 'exact', 'estimated' or 'cached' (None uses settings)
+    count_strategy = None
+
+    def django_paginator_class(self, object_list, per_page, **kwargs):
+        return CountStrategyPaginator(
+            object_list, per_page, count_strategy=get_count_strategy(self.count_strategy), **kwargs
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.cursor_mode = self.cursor_mode or bool(
+            request.query_params.get(self.pagination_mode_query_param) == 'cursor' or
+            self.cursor_query_param in request.query_params
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_queryset_by_cursor(queryset, request)
+
     def get_paginated_response(self, data):
+        if self.cursor_mode:
+            return self.get_cursor_paginated_response(data)
         return {
             'links': {
                 'next': self.get_next_link(),
                 'previous': self.get_previous_link()
             },
             'total': self.page.paginator.count,
+            'total_is_approximate': self.page.paginator.count_is_approximate,
             'page_size': self.page.paginator.per_page,
             'current': self.page.number,
             'entity': data
         }
+
+    def get_cursor_ordering(self, queryset):
+        """ explicit queryset ordering (the requested sort key) with a pk tie-breaker """
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not ordering:
+            return list(self.cursor_ordering)
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering.append('-id' if ordering[-1].startswith('-') else 'id')
+        return ordering
+
+    @staticmethod
+    def encode_cursor(values, reverse=False):
+        payload = json.dumps({'v': values, 'r': reverse}, default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            return payload['v'], bool(payload.get('r'))
+        except (ValueError, KeyError, TypeError):
+            raise NotFound('Invalid cursor')
+
+    @staticmethod
+    def _field_value(obj, field):
+        for attr in field.lstrip('-').split('__'):
+            obj = getattr(obj, attr, None)
+        return obj
+
+    @staticmethod
+    def _cursor_order_by(ordering, reverse):
+        """ order_by() expressions for a cursor page; NULLs sort last going forward, first in reverse """
+        expressions = []
+        for field in ordering:
+            descending = field.startswith('-') != reverse
+            nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+            expression = F(field.lstrip('-'))
+            expressions.append(expression.desc(**nulls) if descending else expression.asc(**nulls))
+        return expressions
+
+    @staticmethod
+    def _keyset_filter(ordering, values, reverse):
+        """ rows strictly after `values` in `ordering` (or before, when reverse), NULLs placed as in _cursor_order_by """
+        clauses = []
+        equals = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            if value is not None:
+                after = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+                if not reverse:
+                    after |= Q(**{f'{name}__isnull': True})
+                clauses.append(equals & after)
+                equals &= Q(**{name: value})
+            else:
+                if reverse:
+                    clauses.append(equals & Q(**{f'{name}__isnull': False}))
+                equals &= Q(**{f'{name}__isnull': True})
+        return reduce(lambda left, right: left | right, clauses)
+
+    def paginate_queryset_by_cursor(self, queryset, request):
+        page_size = self.get_page_size(request)
+        ordering = self.get_cursor_ordering(queryset)
+        cursor = request.query_params.get(self.cursor_query_param)
+        values, reverse = self.decode_cursor(cursor) if cursor else (None, False)
+        if values is not None and len(values) != len(ordering):
+            raise NotFound('Invalid cursor')
+
+        self.cursor_total, self.cursor_total_is_approximate = get_count_strategy(
+            self.count_strategy
+        ).count(queryset) if request.query_params.get(
+            self.with_total_query_param, ''
+        ).lower() in ('1', 'true', 'yes') else (None, False)
+
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(ordering, values, reverse))
+        rows = list(queryset.order_by(*self._cursor_order_by(ordering, reverse))[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else values is not None
+        self.cursor_page_size = page_size
+        self.cursor_current = cursor
+        self.cursor_next = self.encode_cursor(
+            [self._field_value(rows[-1], field) for field in ordering]
+        ) if rows and has_next else None
+        self.cursor_previous = self.encode_cursor(
+            [self._field_value(rows[0], field) for field in ordering], reverse=True
+        ) if rows and has_previous else None
+        return rows
+
+    def _cursor_link(self, cursor):
+        if not cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = replace_query_param(url, self.pagination_mode_query_param, 'cursor')
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_cursor_paginated_response(self, data):
+        return {
+            'links': {
+                'next': self._cursor_link(self.cursor_next),
+                'previous': self._cursor_link(self.cursor_previous)
+            },
+            'total': self.cursor_total,
+            'total_is_approximate': self.cursor_total_is_approximate,
+            'page_size': self.cursor_page_size,
+            'current': self.cursor_current,
+            'entity': data
+        }
@@ -0,0 +1,149 @@
+""" password hashing off the request thread: a bounded process pool plus latency stats """
+import os
+import time
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, get_hasher, make_password
+
+
+class HashingBusy(Exception):
+    """ every hashing slot stayed taken for LOGIN_HASH_QUEUE_TIMEOUT seconds """
+
+
+def _init_worker():
+    # spawned workers start from a blank interpreter
+    import django
+    django.setup()
+
+
+def verify_password(password, encoded):
+    """
+        (is_correct, new_encoded). new_encoded is set when the password is correct but stored with
+        a hasher or cost other than the preferred one, so the caller can upgrade it in place.
+    """
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        # unusable or unknown hash, still burn the time a real check would take
+        make_password(password)
+        return False, None
+    if not hasher.verify(password, encoded):
+        return False, None
+    preferred = get_hasher('default')
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(encoded):
+        return True, make_password(password)
+    return True, None
+
+
+class HashingStats:
+    """ per-process ring of recent hashing timings (queue wait and total, in seconds) """
+
+    def __init__(self, size=1000):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.total = 0
+        self.rejected = 0
+        self.upgraded = 0
+
+    def add(self, waited, took):
+        with self._lock:
+            self._samples.append((waited, took))
+            self.total += 1
+
+    def record(self, kind):
+        """ count a 'rejected' or 'upgraded' check """
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+
+    @staticmethod
+    def percentile(values, fraction):
+        return round(values[min(len(values) - 1, int(len(values) * fraction))] * 1000, 1) if values else None
+
+    def snapshot(self):
+        with self._lock:
+            samples = list(self._samples)
+            counts = {'count': self.total, 'rejected': self.rejected, 'upgraded': self.upgraded}
+        waits = sorted(sample[0] for sample in samples)
+        took = sorted(sample[1] for sample in samples)
+        return {
+            **counts,
+            'p50_ms': self.percentile(took, 0.5),
+            'p95_ms': self.percentile(took, 0.95),
+            'p99_ms': self.percentile(took, 0.99),
+            'queue_wait_p95_ms': self.percentile(waits, 0.95),
+        }
+
+
+class HashingPool:
+    """
+        Runs password checks in LOGIN_HASH_WORKERS spawned processes so login storms queue for
+        CPU instead of stalling request threads (LOGIN_HASH_WORKERS=0 hashes inline). At most
+        LOGIN_HASH_MAX_PENDING checks are queued or running per web worker; callers that cannot
+        get a slot within LOGIN_HASH_QUEUE_TIMEOUT seconds get HashingBusy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._slots = None
+        self.stats = HashingStats()
+
+    def executor(self):
+        # a pool inherited through fork belongs to the parent, each worker process starts its own
+        if self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor_pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=settings.LOGIN_HASH_WORKERS,
+                        mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker
+                    )
+                    self._slots = threading.BoundedSemaphore(settings.LOGIN_HASH_MAX_PENDING)
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def run(self, func, *args):
+        started = time.monotonic()
+        if not settings.LOGIN_HASH_WORKERS:
+            result = func(*args)
+            self.stats.add(0, time.monotonic() - started)
+            return result
+        executor = self.executor()
+        if not self._slots.acquire(timeout=settings.LOGIN_HASH_QUEUE_TIMEOUT):
+            self.stats.record('rejected')
+            raise HashingBusy('Too many logins in progress, please try again shortly.')
+        try:
+            waited = time.monotonic() - started
+            result = executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+        self.stats.add(waited, time.monotonic() - started)
+        return result
+
+    def verify(self, password, encoded):
+        is_correct, new_encoded = self.run(verify_password, password, encoded)
+        if new_encoded:
+            self.stats.record('upgraded')
+        return is_correct, new_encoded
+
+    def make(self, password):
+        return self.run(make_password, password)
+
+    def make_many(self, passwords):
+        """
+            hash a batch (e.g. an upload) on the same workers, one slot per password and at most
+            LOGIN_HASH_WORKERS at a time, so logins keep getting turns while it runs
+        """
+        if not settings.LOGIN_HASH_WORKERS:
+            return [self.make(password) for password in passwords]
+        with ThreadPoolExecutor(max_workers=settings.LOGIN_HASH_WORKERS) as threads:
+            return list(threads.map(self.make, passwords))
+
+    def snapshot(self):
+        return {'workers': settings.LOGIN_HASH_WORKERS, 'pid': os.getpid(), **self.stats.snapshot()}
+
+
+hashing_pool = HashingPool()
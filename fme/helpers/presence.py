@@ -0,0 +1,139 @@
+""" presence index: who was online in a rolling window, without scanning the users table """
+import atexit
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from fme.helpers.lru import LRUCache
+from fme.helpers.activity import BackgroundFlusher
+from fme.helpers.hyperloglog import HyperLogLog
+from fme.models.presence import PresenceBucket
+
+Resolution = PresenceBucket.Resolution
+BUCKET_SIZE = {
+    Resolution.MINUTE: timedelta(minutes=1),
+    Resolution.HOUR: timedelta(hours=1),
+    Resolution.DAY: timedelta(days=1),
+}
+
+
+def bucket_start(moment, resolution):
+    moment = timezone.localtime(moment).replace(second=0, microsecond=0)
+    if resolution == Resolution.MINUTE:
+        return moment
+    if resolution == Resolution.HOUR:
+        return moment.replace(minute=0)
+    return moment.replace(hour=0, minute=0)
+
+
+def window_resolution(window):
+    """ the coarsest resolution that still answers the window precisely enough """
+    if window <= timedelta(hours=2):
+        return Resolution.MINUTE
+    if window <= timedelta(days=2):
+        return Resolution.HOUR
+    return Resolution.DAY
+
+
+class PresenceIndex(BackgroundFlusher):
+    """
+        Every authenticated request adds the user to the current minute in a per-process
+        set. The flusher thread folds those sets into HyperLogLog sketches for the minute,
+        hour and day buckets and unions them into PresenceBucket, so a window count reads
+        a bounded number of small rows (at most 120 minutes, 48 hours or N days) whatever
+        the number of users. Merged window counts are memoised for PRESENCE_CACHE_TTL.
+    """
+    thread_name = 'presence-flusher'
+
+    def __init__(self):
+        super().__init__()
+        self._pending = {}
+        self._counts = LRUCache(maxsize=64)
+
+    def record(self, user_id, seen_at):
+        minute = bucket_start(seen_at, Resolution.MINUTE)
+        with self._lock:
+            self._pending.setdefault(minute, set()).add(user_id)
+        self._ensure_flusher()
+
+    def flush(self):
+        """ union pending users into the stored buckets, returns the number of buckets written """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        sketches = {}
+        for minute, user_ids in pending.items():
+            keys = [(resolution, bucket_start(minute, resolution)) for resolution in Resolution.values]
+            targets = [sketches.setdefault(key, HyperLogLog()) for key in keys]
+            for user_id in user_ids:
+                value_hash = HyperLogLog.hash(user_id)
+                for sketch in targets:
+                    sketch.add_hash(value_hash)
+        try:
+            PresenceBucket.merge(sketches)
+        except Exception:
+            with self._lock:
+                for minute, user_ids in pending.items():
+                    self._pending.setdefault(minute, set()).update(user_ids)
+            raise
+        PresenceBucket.purge()
+        return len(sketches)
+
+    def sketch(self, resolution, start, end=None):
+        return HyperLogLog.union(HyperLogLog(registers) for registers in PresenceBucket.window(resolution, start, end))
+
+    def _cached_count(self, key, compute):
+        count = self._counts.get(key)
+        if count is None:
+            count = compute()
+            self._counts.set(key, count, ttl=settings.PRESENCE_CACHE_TTL)
+        return count
+
+    def active_count(self, window, now=None):
+        """ distinct users seen in the last `window` (timedelta) """
+        now = now or timezone.now()
+        resolution = window_resolution(window)
+        start = bucket_start(now - window, resolution)
+        if start < now - window:
+            # a partially covered oldest bucket would overcount, start at the next one
+            start += BUCKET_SIZE[resolution]
+        return self._cached_count(
+            (resolution, start), lambda: self.sketch(resolution, start).count()
+        )
+
+    def active_today(self, now=None):
+        start = bucket_start(now or timezone.now(), Resolution.DAY)
+        return self._cached_count(('today', start), lambda: self.sketch(Resolution.DAY, start).count())
+
+    def retention_rate(self, days=30, now=None):
+        """
+            percentage of the users active in the `days` before the last `days` who were
+            active again in the last `days`, from the daily snapshots. The intersection
+            comes from inclusion-exclusion over the sketches, so it carries their error.
+        """
+        today = bucket_start(now or timezone.now(), Resolution.DAY)
+        recent_start = today - timedelta(days=days - 1)
+        cohort_start = recent_start - timedelta(days=days)
+
+        def compute():
+            cohort = self.sketch(Resolution.DAY, cohort_start, recent_start)
+            recent = self.sketch(Resolution.DAY, recent_start)
+            cohort_count = cohort.count()
+            if not cohort_count:
+                return None
+            either = HyperLogLog.union([cohort, recent]).count()
+            retained = max(0, cohort_count + recent.count() - either)
+            return round(min(100.0, retained * 100 / cohort_count), 1)
+
+        return self._cached_count(('retention', days, today), compute)
+
+
+presence_index = PresenceIndex()
+
+
+@atexit.register
+def flush_on_exit():
+    try:
+        presence_index.flush()
+    except Exception as e:
+        print('An error occurred while flushing presence:', e)
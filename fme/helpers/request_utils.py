@@ -1,12 +1,151 @@
-import json, requests
+import os, json, time, random, threading, requests
+from urllib.parse import urlsplit
 from django.conf import settings
-from requests.exceptions import HTTPError, Timeout
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from requests.exceptions import HTTPError, Timeout, ConnectTimeout, RequestException
 from django.core.serializers.json import DjangoJSONEncoder
 
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class CircuitOpen(RequestException):
+    """ the provider failed HTTP_BREAKER_FAILURES times in a row, calls are refused for a while """
+
+
+class CircuitBreaker:
+    """
+        Per provider and process: closed until HTTP_BREAKER_FAILURES consecutive failures (errors,
+        429 or 5xx), then open for HTTP_BREAKER_RESET seconds, after which one trial call is let
+        through (half-open). Its success closes the breaker, its failure opens it again.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < settings.HTTP_BREAKER_RESET or self.trial_running:
+                raise CircuitOpen(f'{self.name} is unavailable, circuit open after {self.failures} failures')
+            self.trial_running = True
+
+    def record(self, success):
+        with self._lock:
+            self.trial_running = False
+            if success:
+                self.failures, self.opened_at = 0, None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= settings.HTTP_BREAKER_FAILURES:
+                self.opened_at = time.monotonic()
+
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if time.monotonic() - self.opened_at >= settings.HTTP_BREAKER_RESET else 'open'
+
+
+class HttpClient:
+    """
+        Keep-alive sessions per provider (and process), so repeated Dojah/Termii calls reuse
+        their TLS connections. Providers are matched by host; unknown hosts get their own
+        session with GENERAL_REQUEST_TIMEOUT. Idempotent calls are retried HTTP_RETRIES times
+        with full-jitter exponential backoff; other methods only when the connection could
+        not be opened, since the request may otherwise have been processed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._breakers = {}
+        self._pid = None
+
+    @staticmethod
+    def providers():
+        """ host -> (provider name, read timeout) """
+        return {
+            urlsplit(settings.DOJAH_NIN_VALIDATION_URL).hostname: ('dojah', settings.DOJAH_REQUEST_TIMEOUT),
+            urlsplit(settings.TERMII_SMS_BASE_URL).hostname: ('termii', settings.TERMII_REQUEST_TIMEOUT),
+        }
+
+    def provider_for(self, url):
+        host = urlsplit(url).hostname
+        return self.providers().get(host, (host, settings.GENERAL_REQUEST_TIMEOUT))
+
+    def session(self, name):
+        # sessions and their sockets must not be shared with forked children
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._sessions, self._breakers, self._pid = {}, {}, os.getpid()
+        session = self._sessions.get(name)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(name)
+                if session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.HTTP_POOL_MAXSIZE)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._sessions[name] = session
+                    self._breakers[name] = CircuitBreaker(name)
+        return session
+
+    def breaker(self, name):
+        self.session(name)
+        return self._breakers[name]
+
+    @staticmethod
+    def not_sent(error):
+        """ the connection was never established, so even a POST is safe to repeat """
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(error, ConnectTimeout) or isinstance(reason, NewConnectionError)
+
+    @staticmethod
+    def backoff(attempt):
+        return random.uniform(0, min(settings.HTTP_RETRY_BACKOFF_MAX, settings.HTTP_RETRY_BACKOFF * 2 ** attempt))
+
+    def request(self, method, url, **kwargs):
+        name, read_timeout = self.provider_for(url)
+        session, breaker = self.session(name), self.breaker(name)
+        kwargs.setdefault('timeout', (settings.HTTP_CONNECT_TIMEOUT, read_timeout))
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                resp = session.request(method, url, **kwargs)
+            except Exception as error:
+                breaker.record(False)
+                retryable = isinstance(error, RequestException) and (idempotent or self.not_sent(error))
+                if not retryable or attempt >= settings.HTTP_RETRIES:
+                    raise
+            else:
+                failed = resp.status_code in RETRY_STATUSES or resp.status_code >= 500
+                breaker.record(not failed)
+                if not failed or not idempotent or attempt >= settings.HTTP_RETRIES:
+                    return resp
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+    def status(self):
+        """ breaker state per provider seen by this process """
+        return {name: {'state': breaker.state(), 'failures': breaker.failures} for name, breaker in self._breakers.items()}
+
+
+http_client = HttpClient()
+
 
 def prepare_request_params(url, data, options):
     """ prepare request parameters (kwargs) """
-    kwargs = {'timeout':settings.GENERAL_REQUEST_TIMEOUT, 'url':url}
+    kwargs = {'url':url} # timeouts are per provider, see HttpClient
     method = options['method'] if options.get('method') else 'GET'
     headers = options['headers'] if options.get('headers') else {}
     default_headers = {} if options.get('files') else {'Content-Type':'application/json'}
@@ -47,7 +186,7 @@ def make_request_for_full_resp_error(url, data=None, options={}):
     resp_has_error = True
     resp = {}
     try:
-        resp = requests.request(method, **kwargs)
+        resp = http_client.request(method, **kwargs)
         resp_has_error = check_response_error_status(resp)
     except Exception as error:
         print('An error occurred while making request:', error) #, file=sys.stderr)
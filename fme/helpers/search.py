@@ -0,0 +1,59 @@
+""" ranked learner and skill area search: pg_trgm / full-text on Postgres, icontains elsewhere """
+from functools import reduce
+from operator import and_, or_
+from django.db import connection
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat, Greatest
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from fme.models.skill_area import SkillArea
+
+# shorter terms have no trigram to look up and would scan the whole table
+MIN_TERM_LENGTH = 3
+LEARNER_FIELDS = ('user__first_name', 'user__last_name', 'user__email', 'user__phone_number')
+
+
+def is_ranked():
+    return connection.vendor == 'postgresql'
+
+
+def search_terms(query):
+    return [term for term in query.split() if len(term) >= MIN_TERM_LENGTH]
+
+
+def search_learners(queryset, query):
+    """
+        learners whose name, email or phone contains every term of `query`, best match first.
+        Each term is an OR of icontains lookups that the UPPER(column) trigram indexes on the
+        user table answer; the rank (trigram word similarity) is only computed for matches.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    queryset = queryset.filter(reduce(and_, [
+        reduce(or_, [Q(**{f'{field}__icontains': term}) for field in LEARNER_FIELDS]) for term in terms
+    ]))
+    if not is_ranked():
+        return queryset.order_by('-created_at')
+    query = ' '.join(terms)
+    return queryset.annotate(search_rank=Greatest(
+        TrigramWordSimilarity(query, Concat('user__first_name', Value(' '), 'user__last_name')),
+        TrigramWordSimilarity(query, 'user__email'),
+        TrigramWordSimilarity(query, 'user__phone_number'),
+    )).order_by('-search_rank', '-created_at')
+
+
+def search_skill_areas(queryset, query):
+    """
+        skill areas matching `query` in name, description or learning objectives. On Postgres
+        this is a websearch query against the weighted search_vector (plus name substrings
+        through the name trigram index), ranked by SearchRank and name similarity.
+    """
+    query = query.strip()
+    if not is_ranked():
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query) | Q(learning_objectives__icontains=query)
+        )
+    search_query = SearchQuery(query, config=SkillArea.SEARCH_CONFIG, search_type='websearch')
+    return queryset.filter(Q(search_vector=search_query) | Q(name__icontains=query)).annotate(
+        search_rank=SearchRank(F('search_vector'), search_query) + TrigramWordSimilarity(query, 'name')
+    ).order_by('-search_rank', 'name')
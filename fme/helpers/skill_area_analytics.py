@@ -0,0 +1,119 @@
+""" skill area analytics for many skill areas at once (one grouped query per metric), cached per skill area """
+import uuid
+from django.conf import settings
+from django.db.models import Count, Q
+from fme.helpers.time_series import date_histogram
+from fme.helpers.view_cache import get_cache
+from fme.models.learner import LearnerProfile
+from fme.models.skill_area import SkillAreaModule
+
+TREND_MONTHS = 6
+
+
+def entry_key(skill_area_id):
+    return f"skill_area_analytics:{skill_area_id}"
+
+
+def generation_key(skill_area_id):
+    return f"skill_area_analytics:gen:{skill_area_id}"
+
+
+def invalidate_skill_areas(skill_area_ids):
+    """ the analytics of these skill areas are recomputed on next use """
+    get_cache().set_many({generation_key(pk): uuid.uuid4().hex for pk in set(skill_area_ids) if pk}, None)
+
+
+def enrollment_trends(skill_area_ids):
+    """ monthly enrollments per skill area, one GROUP BY query """
+    series = date_histogram(
+        LearnerProfile.objects.filter(skill_area_id__in=skill_area_ids), periods=TREND_MONTHS,
+        label_key='month', value_key='enrollments', breakdown='skill_area_id'
+    )
+    return {
+        pk: [{'month': item['month'], 'enrollments': item['breakdown'].get(pk, 0)} for item in series]
+        for pk in skill_area_ids
+    }
+
+
+def completion_stats(skill_area_ids):
+    rows = LearnerProfile.objects.filter(skill_area_id__in=skill_area_ids).values('skill_area_id').annotate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(progress=100)),
+        in_progress=Count('id', filter=Q(progress__gt=0, progress__lt=100)),
+        not_started=Count('id', filter=Q(progress=0)),
+    ).order_by()
+    stats = {pk: {
+        'total_learners': 0, 'completed': 0, 'in_progress': 0, 'not_started': 0, 'completion_rate': 0
+    } for pk in skill_area_ids}
+    for row in rows:
+        stats[row['skill_area_id']] = {
+            'total_learners': row['total'],
+            'completed': row['completed'],
+            'in_progress': row['in_progress'],
+            'not_started': row['not_started'],
+            'completion_rate': round((row['completed'] / row['total']) * 100, 2),
+        }
+    return stats
+
+
+def performance_by_module(skill_area_ids):
+    performance = {skill_area_id: [] for skill_area_id in skill_area_ids}
+    modules = SkillAreaModule.objects.filter(
+        skill_area_id__in=skill_area_ids, status=SkillAreaModule.Status.ACTIVE
+    ).order_by('skill_area_id', 'order').values(
+        'skill_area_id', 'name', 'level', 'completion_rate', 'average_score', 'duration_hours'
+    )
+    for module in modules:
+        performance[module['skill_area_id']].append({
+            'module_name': module['name'],
+            'level': module['level'],
+            'completion_rate': float(module['completion_rate']),
+            'average_score': float(module['average_score']),
+            'duration_hours': module['duration_hours']
+        })
+    return performance
+
+
+def skill_area_analytics(skill_areas):
+    """
+        skill area id -> {enrollment_trend, completion_stats, performance_by_module}. Entries are
+        cached for SKILL_AREA_ANALYTICS_TTL seconds against a per skill area generation that
+        learner and module changes bump; only the skill areas without a current entry are
+        computed, three queries (on the LearnerProfile.skill_area indexes) for all of them.
+    """
+    skill_area_ids = [skill_area.pk for skill_area in skill_areas]
+    if not skill_area_ids:
+        return {}
+    cache = get_cache()
+    generations = cache.get_many([generation_key(pk) for pk in skill_area_ids])
+    for pk in skill_area_ids:
+        if generation_key(pk) not in generations:
+            # add() keeps a generation another process set meanwhile
+            cache.add(generation_key(pk), uuid.uuid4().hex, None)
+            generations[generation_key(pk)] = cache.get(generation_key(pk))
+
+    entries = cache.get_many([entry_key(pk) for pk in skill_area_ids])
+    analytics, missing = {}, []
+    for pk in skill_area_ids:
+        entry = entries.get(entry_key(pk))
+        if entry and entry['generation'] == generations.get(generation_key(pk)):
+            analytics[pk] = entry['data']
+        else:
+            missing.append(pk)
+    if not missing:
+        return analytics
+
+    trends = enrollment_trends(missing)
+    stats = completion_stats(missing)
+    modules = performance_by_module(missing)
+    fresh = {}
+    for pk in missing:
+        data = {
+            'enrollment_trend': trends[pk],
+            'completion_stats': stats[pk],
+            'performance_by_module': modules[pk],
+        }
+        analytics[pk] = data
+        fresh[entry_key(pk)] = {'generation': generations.get(generation_key(pk)), 'data': data}
+    cache.set_many(fresh, settings.SKILL_AREA_ANALYTICS_TTL)
+    return analytics
@@ -0,0 +1,67 @@
+""" Termii SMS sending, inline or through a per-process background queue """
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import transaction
+from fme.helpers.request_utils import make_request_for_resp_status
+
+
+def termii_sms_url():
+    return f'{settings.TERMII_SMS_BASE_URL}/api/sms/send'
+
+
+def otp_message(token):
+    return f"Thanks for taking interest in Digital Training Academy, to proceed use this verification code {token}"
+
+
+def send_sms(url, phone_number, message):
+    """ (response data, error message or None) """
+    err_msg = None
+    payload = {
+        "to":phone_number,
+        "from": settings.TERMII_SMS_SENDER_ID,
+        "sms": message,
+        "type": "plain",
+        "channel":settings.TERMII_SMS_CHANNEL,
+        "api_key": settings.TERMII_SMS_API_KEY
+    }
+    resp_data, resp_status = make_request_for_resp_status(url, payload, {'method':'post'})
+    if resp_status != 200:
+        err_msg = "Unable to send sms token"
+        print('*** Something is wrong with sms request: ****', resp_data)
+    return (resp_data, err_msg)
+
+
+class SmsQueue:
+    """
+        Sends SMS on SMS_SEND_WORKERS background threads so the request that triggered it can
+        return immediately. Messages live in process memory: one lost in a crash or restart is
+        recovered by the user asking for a resend (NinVerificationTokenResendView).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+
+    def executor(self):
+        # threads do not survive fork, each worker process starts its own
+        if self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=settings.SMS_SEND_WORKERS, thread_name_prefix='sms')
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def send(self, phone_number, message):
+        """ queue the SMS once the current transaction commits (right away outside one) """
+        transaction.on_commit(
+            lambda: self.executor().submit(send_sms, termii_sms_url(), phone_number, message)
+        )
+
+    def send_otp(self, phone_number, token):
+        self.send(phone_number, otp_message(token))
+
+
+sms_queue = SmsQueue()
@@ -0,0 +1,87 @@
+""" date histogram helper (one GROUP BY query, zero-filled buckets) """
+from datetime import date, datetime, time, timedelta
+from django.utils import timezone
+from django.db.models import Count
+from django.db.models.functions import TruncDay, TruncWeek, TruncMonth
+
+TRUNCATORS = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+LABEL_FORMATS = {'day': '%Y-%m-%d', 'week': '%Y-%m-%d', 'month': '%Y-%m'}
+
+
+def _floor(value, granularity):
+    """ first day of the bucket containing value """
+    if granularity == 'month':
+        return value.replace(day=1)
+    if granularity == 'week':
+        return value - timedelta(days=value.weekday())
+    return value
+
+
+def _step(value, granularity, count=1):
+    """ move a bucket start by count buckets """
+    if granularity == 'month':
+        month_index = value.year * 12 + value.month - 1 + count
+        return date(month_index // 12, month_index % 12 + 1, 1)
+    return value + timedelta(days=count * (7 if granularity == 'week' else 1))
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return value
+
+
+def bucket_starts(granularity='month', periods=12, start=None, end=None):
+    """ ordered bucket start dates, either `periods` buckets back from end or from start to end """
+    end = _floor(_as_date(end or timezone.now()), granularity)
+    first = _floor(_as_date(start), granularity) if start else _step(end, granularity, -(periods - 1))
+    buckets = []
+    while first <= end:
+        buckets.append(first)
+        first = _step(first, granularity)
+    return buckets
+
+
+def date_histogram(
+    queryset, date_field='created_at', granularity='month', periods=12,
+    start=None, end=None, value=None, breakdown=None, label_key='period', value_key='count'
+):
+    """
+        Group a queryset into day/week/month buckets with a single query.
+        Every bucket is returned (zero-filled); `value` defaults to Count('id') and
+        `breakdown` adds a per-value split (e.g. learning_track) to each bucket.
+        An empty range (periods < 1 or start after end) returns [] without querying.
+    """
+    if granularity not in TRUNCATORS:
+        raise ValueError(f'Unsupported granularity: {granularity}')
+    buckets = bucket_starts(granularity, periods, start, end)
+    if not buckets:
+        return []
+    range_end = _step(buckets[-1], granularity)
+    if queryset.model._meta.get_field(date_field).get_internal_type() == 'DateField':
+        range_start = buckets[0]
+    else:
+        range_start = timezone.make_aware(datetime.combine(buckets[0], time.min))
+        range_end = timezone.make_aware(datetime.combine(range_end, time.min))
+
+    group_by = ['bucket', breakdown] if breakdown else ['bucket']
+    rows = queryset.filter(**{
+        f'{date_field}__gte': range_start, f'{date_field}__lt': range_end
+    }).annotate(
+        bucket=TRUNCATORS[granularity](date_field)
+    ).values(*group_by).annotate(total=value or Count('id')).order_by()
+
+    totals, splits = {}, {}
+    for row in rows:
+        bucket = _as_date(row['bucket'])
+        totals[bucket] = totals.get(bucket, 0) + (row['total'] or 0)
+        if breakdown:
+            splits.setdefault(bucket, {})[row[breakdown]] = row['total'] or 0
+
+    series = []
+    for bucket in buckets:
+        item = {label_key: bucket.strftime(LABEL_FORMATS[granularity]), value_key: totals.get(bucket, 0)}
+        if breakdown:
+            item['breakdown'] = splits.get(bucket, {})
+        series.append(item)
+    return series
@@ -1,15 +1,19 @@
+import os
 import boto3
 from django.conf import settings
 from botocore.client import Config
 
-def upload_file_to_s3(file, file_name):
-    s3_client = boto3.client(
+def get_s3_client():
+    return boto3.client(
         's3',
         aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
         aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
         endpoint_url=settings.AWS_S3_ENDPOINT_URL,
         config=Config(signature_version='s3v4')
     )
+
+def upload_file_to_s3(file, file_name):
+    s3_client = get_s3_client()
     s3_client.upload_fileobj(
         file,
         settings.AWS_STORAGE_BUCKET_NAME,
@@ -20,3 +24,43 @@ def upload_file_to_s3(file, file_name):
         }
     )
     return f"{settings.AWS_S3_ENDPOINT_URL}{settings.AWS_STORAGE_BUCKET_NAME}/{file_name}"
+
+def store_export_file(local_path, file_name, content_type):
+    """
+        Move a finished export into settings.EXPORT_STORAGE.
+        Returns (stored path or key, storage). Exports hold personal data so S3 objects stay private.
+    """
+    if settings.EXPORT_STORAGE == 's3':
+        key = f"{settings.EXPORT_S3_PREFIX}{file_name}"
+        get_s3_client().upload_file(
+            local_path,
+            settings.AWS_STORAGE_BUCKET_NAME,
+            key,
+            ExtraArgs={'ContentType': content_type, 'ACL': 'private'}
+        )
+        os.remove(local_path)
+        return key, 's3'
+    stored_path = os.path.join(settings.EXPORT_ROOT, file_name)
+    os.makedirs(os.path.dirname(stored_path), exist_ok=True)
+    os.replace(local_path, stored_path)
+    return stored_path, 'local'
+
+def export_download_url(key, download_name):
+    """ short lived presigned URL; S3 serves Range requests on it natively """
+    return get_s3_client().generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': settings.AWS_STORAGE_BUCKET_NAME,
+            'Key': key,
+            'ResponseContentDisposition': f'attachment; filename="{download_name}"'
+        },
+        ExpiresIn=settings.EXPORT_DOWNLOAD_URL_TTL
+    )
+
+def delete_export_file(path, storage):
+    if storage == 's3':
+        get_s3_client().delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=path)
+    elif os.path.exists(path):
+        os.remove(path)
+        if not os.listdir(os.path.dirname(path)):
+            os.rmdir(os.path.dirname(path))
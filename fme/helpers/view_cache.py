@@ -0,0 +1,182 @@
+""" declarative response caching for slow changing dashboard views """
+import time
+import uuid
+import hashlib
+import functools
+import threading
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from rest_framework.request import Request
+from rest_framework.response import Response
+from fme.models.user import User
+
+BYPASS_HEADER = 'X-Cache-Bypass'
+
+
+def get_cache():
+    return caches[settings.VIEW_CACHE_ALIAS]
+
+
+def generation_key(model):
+    return f"view_cache:gen:{model._meta.label_lower}"
+
+
+def invalidate_model(model):
+    """
+        every cached response that depends on `model` becomes stale. Called from the
+        post_save/post_delete receivers and after queryset.update() calls, which send no signals.
+    """
+    get_cache().set(generation_key(model), uuid.uuid4().hex, None)
+
+
+def offline_request(params):
+    """ a bare GET request for computing a view outside the request cycle """
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = '/'
+    request.GET = QueryDict(urlencode(params, doseq=True))
+    request.META = {'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'QUERY_STRING': request.GET.urlencode()}
+    return request
+
+
+def normalized_params(query_params):
+    """ sorted, blank-free query string so ?b=1&a=2 and ?a=2&b=1&c= share an entry """
+    items = sorted(
+        (key, sorted(value for value in values if value != ''))
+        for key, values in query_params.lists()
+    )
+    return urlencode([(key, values) for key, values in items if values], doseq=True)
+
+
+def bypass_requested(request):
+    """ admins can ask for fresh numbers with `X-Cache-Bypass: 1` """
+    return bool(request.headers.get(BYPASS_HEADER)) and getattr(request.user, 'role', None) == User.Role.ADMIN
+
+
+class CachedResponse:
+    """
+        Wraps a view's get(). Responses are cached per view and normalized query string
+        (plus user with vary_on_user) together with the generation of every model in
+        depends_on. An entry is fresh for `ttl` seconds while those generations match.
+        After that, or once a signal bumps a generation, it is served for up to `stale_ttl`
+        more seconds while one background thread recomputes it (stale-while-revalidate).
+        Only 200 responses are cached; requests from roles outside `roles` skip the cache
+        so inline role checks in the view still run.
+    """
+
+    def __init__(self, handler, scope, depends_on=(), roles=None, ttl=None, stale_ttl=None, vary_on_user=False):
+        self.handler = handler
+        self.scope = scope
+        self.depends_on = tuple(depends_on)
+        self.roles = roles
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.vary_on_user = vary_on_user
+
+    @property
+    def fresh_for(self):
+        return self.ttl if self.ttl is not None else settings.VIEW_CACHE_TTL
+
+    @property
+    def stale_for(self):
+        return self.stale_ttl if self.stale_ttl is not None else settings.VIEW_CACHE_STALE_TTL
+
+    def cache_key(self, request):
+        parts = [normalized_params(request.query_params)]
+        if self.vary_on_user:
+            parts.append(str(request.user.pk))
+        return f"view_cache:{self.scope}:{hashlib.sha256('|'.join(parts).encode()).hexdigest()}"
+
+    def generations(self, cache):
+        keys = [generation_key(model) for model in self.depends_on]
+        stored = cache.get_many(keys)
+        return [stored.get(key) for key in keys]
+
+    def compute(self, cache, key, generations, view, request, *args, **kwargs):
+        started = time.monotonic()
+        resp = self.handler(view, request, *args, **kwargs)
+        if resp.status_code == 200 and isinstance(resp, Response):
+            cache.set(key, {
+                'data': resp.data, 'generations': generations, 'computed_at': time.time(),
+                'duration': time.monotonic() - started
+            }, self.fresh_for + self.stale_for)
+        return resp
+
+    def warm(self, view_class, params, user, refresh_within=0):
+        """
+            recompute the entry for `params` outside a request unless it is current and stays fresh
+            for more than `refresh_within` seconds. Returns the computation time or None if skipped.
+        """
+        request = Request(offline_request(params))
+        request.user = user
+        cache = get_cache()
+        key = self.cache_key(request)
+        generations = self.generations(cache)
+        entry = cache.get(key)
+        if (
+            entry is not None and entry['generations'] == generations and
+            time.time() - entry['computed_at'] < self.fresh_for - refresh_within
+        ):
+            return None
+        view = view_class()
+        view.setup(request._request)
+        view.request, view.format_kwarg = request, None
+        self.compute(cache, key, generations, view, request)
+        return cache.get(key, {}).get('duration')
+
+    def refresh(self, cache, key, view, request, *args, **kwargs):
+        try:
+            self.compute(cache, key, self.generations(cache), view, request, *args, **kwargs)
+        except Exception as e:
+            print(f'An error occurred while refreshing {self.scope}:', e)
+        finally:
+            cache.delete(f"{key}:refresh")
+            connections.close_all()
+
+    def __call__(self, view, request, *args, **kwargs):
+        if self.roles is not None and getattr(request.user, 'role', None) not in self.roles:
+            return self.handler(view, request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.cache_key(request)
+        if bypass_requested(request):
+            return self.mark(self.compute(cache, key, self.generations(cache), view, request, *args, **kwargs), 'BYPASS')
+
+        entry = cache.get(key)
+        generations = self.generations(cache)
+        if entry is not None:
+            age = time.time() - entry['computed_at']
+            if age < self.fresh_for and entry['generations'] == generations:
+                return self.mark(Response(entry['data']), 'HIT')
+            if age < self.fresh_for + self.stale_for:
+                # only one process recomputes a stale entry
+                if cache.add(f"{key}:refresh", 1, self.fresh_for):
+                    threading.Thread(
+                        target=self.refresh, args=(cache, key, view, request, *args), kwargs=kwargs, daemon=True
+                    ).start()
+                return self.mark(Response(entry['data']), 'STALE')
+        return self.mark(self.compute(cache, key, generations, view, request, *args, **kwargs), 'MISS')
+
+    @staticmethod
+    def mark(resp, state):
+        resp['X-Cache'] = state
+        return resp
+
+
+def cached_response(scope, depends_on=(), roles=None, ttl=None, stale_ttl=None, vary_on_user=False):
+    """
+        @cached_response('learner_analytics', depends_on=[LearnerProfile, User])
+        def get(self, request): ...
+    """
+    def decorator(handler):
+        cached = CachedResponse(handler, scope, depends_on, roles, ttl, stale_ttl, vary_on_user)
+
+        @functools.wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            return cached(view, request, *args, **kwargs)
+        wrapper.cache = cached
+        return wrapper
+    return decorator
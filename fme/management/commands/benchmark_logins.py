@@ -0,0 +1,58 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand, CommandError
+from fme.models.user import User
+from fme.helpers.password_hashing import hashing_pool, HashingStats, HashingBusy
+
+
+class Command(BaseCommand):
+    help = 'Run concurrent logins through the authentication backend and report throughput and latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=200, help='Total login attempts')
+        parser.add_argument('--concurrency', type=int, default=20, help='Simultaneous login attempts')
+        parser.add_argument('--email', help='Existing account to log in as (a throwaway learner is created otherwise)')
+        parser.add_argument('--password', help='Password of --email')
+
+    def login(self, email, password):
+        started = time.monotonic()
+        try:
+            user = authenticate(None, email=email, password=password)
+        except HashingBusy:
+            return time.monotonic() - started, 'busy'
+        return time.monotonic() - started, 'ok' if user else 'failed'
+
+    def handle(self, *args, **options):
+        if bool(options['email']) != bool(options['password']):
+            raise CommandError('--email and --password go together')
+        user = None
+        email, password = options['email'], options['password']
+        if not email:
+            email, password = f'login-benchmark-{uuid.uuid4().hex[:8]}@example.com', uuid.uuid4().hex
+            user = User(username=email, email=email, role=User.Role.LEARNER, status=User.Status.ACTIVE)
+            user.set_password(password)
+            user.save()
+        try:
+            # the first check starts the hashing processes, keep it out of the numbers
+            self.login(email, password)
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                results = list(pool.map(lambda _: self.login(email, password), range(options['logins'])))
+            elapsed = time.monotonic() - started
+        finally:
+            if user is not None:
+                user.delete()
+
+        latencies = sorted(latency for latency, _ in results)
+        outcomes = {outcome: sum(1 for _, result in results if result == outcome) for outcome in ('ok', 'failed', 'busy')}
+        self.stdout.write(
+            f"{len(results)} logins in {elapsed:.2f}s ({len(results) / elapsed:.1f}/s) at concurrency "
+            f"{options['concurrency']}: {outcomes['ok']} ok, {outcomes['failed']} failed, {outcomes['busy']} rejected"
+        )
+        self.stdout.write(
+            f"latency p50 {HashingStats.percentile(latencies, 0.5)}ms, p95 {HashingStats.percentile(latencies, 0.95)}ms, "
+            f"p99 {HashingStats.percentile(latencies, 0.99)}ms"
+        )
+        self.stdout.write(f"hashing {hashing_pool.snapshot()}")
@@ -0,0 +1,43 @@
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from fme.models.user import User
+from fme.models.learner import LearnerProfile
+from fme.helpers.view_cache import invalidate_model
+from fme.helpers.learner_import import import_learners, import_format_error, ImportFileError
+
+
+class Command(BaseCommand):
+    help = 'Import learners from a CSV or XLSX file and report the rows that failed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file with a header row')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, nothing is saved')
+        parser.add_argument('--report', help='Write the failed rows to this CSV file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format_error = import_format_error(path)
+        if format_error:
+            raise CommandError(format_error)
+        try:
+            with open(path, 'rb') as file:
+                report = import_learners(file, path, dry_run=options['dry_run'], stdout=self.stdout)
+        except (OSError, ImportFileError) as e:
+            raise CommandError(e)
+        if report['created']:
+            invalidate_model(User)
+            invalidate_model(LearnerProfile)
+
+        if options['report'] and report['errors']:
+            with open(options['report'], 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['Row', 'Email', 'Errors'])
+                for error in report['errors']:
+                    writer.writerow([
+                        error['row'], error['email'],
+                        '; '.join(f'{column}: {message}' for column, message in error['errors'].items())
+                    ])
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['total_rows']} row(s): {report['created']} created, {report['failed']} failed"
+            + (' (dry run)' if report['dry_run'] else '')
+        ))
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.utils import timezone
+from django.core.management.base import BaseCommand
+from fme.models.activity_log import ActivityLog, month_start
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly activity log partitions and drop the ones past ACTIVITY_LOG_RETENTION_MONTHS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead', type=int, default=2,
+            help='Partitions to create after the current month'
+        )
+
+    def handle(self, *args, **options):
+        created = ActivityLog.ensure_partitions(months_ahead=options['months_ahead'])
+        dropped = ActivityLog.drop_partitions_before(
+            month_start(timezone.localdate(), -settings.ACTIVITY_LOG_RETENTION_MONTHS)
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(created)} partition(s), dropped {len(dropped)} partition(s)'
+        ))
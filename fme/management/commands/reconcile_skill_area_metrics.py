@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from fme.models.skill_area import SkillArea
+
+
+class Command(BaseCommand):
+    help = 'Recompute skill area enrollment, progress and module counters and fix any drift'
+
+    def handle(self, *args, **options):
+        fixed = SkillArea.reconcile_metrics()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled skill area metrics, {fixed} skill area(s) corrected'))
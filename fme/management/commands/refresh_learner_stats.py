@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from fme.models.analytics import LearnerDailyStat
+
+
+class Command(BaseCommand):
+    help = 'Refresh the daily learner statistics rollup from the updated_at watermark'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Ignore the watermark and rebuild the whole rollup'
+        )
+
+    def handle(self, *args, **options):
+        rebuilt_days = LearnerDailyStat.refresh(full=options['full'])
+        if rebuilt_days is None:
+            self.stdout.write(self.style.SUCCESS('Rebuilt learner statistics rollup'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Refreshed learner statistics for {rebuilt_days} day(s)'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from fme.helpers.export_jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued export jobs (the queue lives in Postgres; start as many workers as needed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue is empty instead of waiting for new jobs'
+        )
+        parser.add_argument(
+            '--poll-interval', type=int, default=None,
+            help='Seconds to wait for new jobs between polls (defaults to EXPORT_JOB_POLL_INTERVAL)'
+        )
+
+    def handle(self, *args, **options):
+        run_worker(once=options['once'], poll_interval=options['poll_interval'], stdout=self.stdout)
@@ -0,0 +1,88 @@
+import json
+import time
+import uuid
+import random
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from django.core.management.base import BaseCommand
+
+
+def nin_entity(nin):
+    rng = random.Random(nin)
+    return {
+        'nin': nin,
+        'first_name': rng.choice(['Ada', 'Chidi', 'Bola', 'Emeka', 'Ngozi', 'Tunde']),
+        'last_name': rng.choice(['Okafor', 'Adeyemi', 'Bello', 'Eze', 'Ibrahim']),
+        'middle_name': '',
+        'gender': rng.choice(['Male', 'Female']),
+        'date_of_birth': f'19{rng.randint(70, 99)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+        'phone_number': f'080{rng.randint(10000000, 99999999)}',
+        'photo': '',
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """ Dojah GET /api/v1/kyc/nin?nin= and Termii POST /api/sms/send with configurable latency and errors """
+    protocol_version = 'HTTP/1.1'
+    latency = 0
+    error_rate = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def delay(self):
+        time.sleep(self.latency * random.uniform(0.5, 1.5))
+        return random.random() < self.error_rate
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') != '/api/v1/kyc/nin':
+            return self.reply(404, {'error': 'Not found'})
+        if self.delay():
+            return self.reply(503, {'error': 'Service unavailable'})
+        nin = parse_qs(url.query).get('nin', [''])[0]
+        if not nin.isdigit() or len(nin) != 11:
+            return self.reply(400, {'error': 'Invalid NIN'})
+        self.reply(200, {'entity': nin_entity(nin)})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if urlsplit(self.path).path.rstrip('/') != '/api/sms/send':
+            return self.reply(404, {'error': 'Not found'})
+        if self.delay():
+            return self.reply(503, {'error': 'Service unavailable'})
+        self.reply(200, {'message_id': uuid.uuid4().hex, 'message': 'Successfully Sent', 'balance': 1000, 'user': 'stub'})
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve stand-ins for the Dojah NIN and Termii SMS APIs for offline load tests. Point '
+        'DOJAH_NIN_VALIDATION_URL at http://HOST:PORT/api/v1/kyc/nin and TERMII_SMS_BASE_URL at http://HOST:PORT'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8089)
+        parser.add_argument('--latency-ms', type=int, default=300, help='Mean response delay (uniformly +-50%%)')
+        parser.add_argument('--error-rate', type=float, default=0, help='Share of calls answered with a 503')
+
+    def handle(self, *args, **options):
+        StubHandler.latency = options['latency_ms'] / 1000
+        StubHandler.error_rate = options['error_rate']
+        server = ThreadingHTTPServer((options['host'], options['port']), StubHandler)
+        server.daemon_threads = True
+        self.stdout.write(f"Provider stub on http://{options['host']}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
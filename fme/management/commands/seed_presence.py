@@ -0,0 +1,22 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from django.core.management.base import BaseCommand
+from fme.models.user import User
+from fme.helpers.presence import presence_index
+
+
+class Command(BaseCommand):
+    help = 'Seed the presence index from User.last_active (run once after deploying it)'
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=settings.PRESENCE_DAY_RETENTION)
+        users = User.objects.filter(last_active__gte=since).values_list('id', 'last_active')
+        seeded = 0
+        for user_id, last_active in users.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+            presence_index.record(user_id, last_active)
+            seeded += 1
+            if seeded % 10000 == 0:
+                presence_index.flush()
+        presence_index.flush()
+        self.stdout.write(self.style.SUCCESS(f'Seeded presence for {seeded} user(s)'))
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from fme.helpers.cache_warmer import warm_dashboard_cache, run_warmer
+
+
+class Command(BaseCommand):
+    help = 'Precompute cached admin dashboard responses (once, e.g. from cron, or with --loop as a worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and warm every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=None,
+            help='Seconds between passes; entries expiring sooner are refreshed (defaults to DASHBOARD_WARM_INTERVAL)'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Recompute every entry even if it is still fresh'
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.DASHBOARD_WARM_INTERVAL
+        if options['loop']:
+            run_warmer(interval, stdout=self.stdout)
+            return
+        refresh_within = float('inf') if options['force'] else interval
+        timings = warm_dashboard_cache(refresh_within=refresh_within, stdout=self.stdout)
+        total = sum(duration for _, _, duration in timings)
+        self.stdout.write(self.style.SUCCESS(f'Warmed {len(timings)} response(s) in {total:.2f}s'))
@@ -2,21 +2,26 @@
 from datetime import timedelta
 from django.conf import settings
 from django.utils.timezone import now
+from fme.helpers.activity import activity_buffer
+from fme.helpers.presence import presence_index
 
 class UpdateLastActiveMiddleware:
+    """ records activity in the per-process buffers; fme.helpers.activity and fme.helpers.presence flush them in bulk """
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         response = self.get_response(request)
 
-        if request.user.is_authenticated:
-            user = request.user
+        # DRF token authentication sets request.user on the underlying request
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            presence_index.record(user.pk, now())
             last_active = getattr(user, 'last_active', None)
             threshold = now() - timedelta(minutes=settings.LAST_ACTIVE_THRESHOLD)
 
             if last_active is None or last_active < threshold:
-                user.last_active = now()
-                user.save(update_fields=['last_active'])
+                activity_buffer.record(user.pk, now())
 
         return response
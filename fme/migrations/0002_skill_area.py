@@ -0,0 +1,160 @@
+# Generated by Django 4.2.13 on 2026-10-18 14:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fme', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillArea',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('slug', models.SlugField(blank=True, max_length=200, unique=True)),
+                ('description', models.TextField()),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('ACTIVE', 'Active'), ('ARCHIVED', 'Archived')], default='DRAFT', max_length=20)),
+                ('target_audience', models.CharField(choices=[('BEGINNER', 'Beginner'), ('INTERMEDIATE', 'Intermediate'), ('ADVANCED', 'Advanced')], default='BEGINNER', max_length=20)),
+                ('total_enrolled', models.PositiveIntegerField(default=0)),
+                ('avg_completion_rate', models.DecimalField(decimal_places=2, default=0.0, max_digits=5)),
+                ('total_modules', models.PositiveIntegerField(default=0)),
+                ('image', models.URLField(blank=True, null=True)),
+                ('prerequisites', models.TextField(blank=True, help_text='Prerequisites for this skill area')),
+                ('learning_objectives', models.TextField(blank=True, help_text='What learners will achieve')),
+                ('estimated_duration_weeks', models.PositiveIntegerField(default=12)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_skill_areas', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillAreaModule',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('level', models.CharField(choices=[('BEGINNER', 'Beginner'), ('INTERMEDIATE', 'Intermediate'), ('ADVANCED', 'Advanced')], max_length=20)),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('ACTIVE', 'Active'), ('ARCHIVED', 'Archived')], default='DRAFT', max_length=20)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('duration_hours', models.PositiveIntegerField(default=10)),
+                ('learning_objectives', models.TextField(help_text='What learners will learn in this module')),
+                ('prerequisites', models.TextField(blank=True, help_text='Prerequisites for this module')),
+                ('resources', models.JSONField(default=dict, help_text='Additional resources and links')),
+                ('completion_rate', models.DecimalField(decimal_places=2, default=0.0, max_digits=5)),
+                ('average_score', models.DecimalField(decimal_places=2, default=0.0, max_digits=5)),
+                ('skill_area', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='modules', to='fme.skillarea')),
+            ],
+            options={
+                'ordering': ['skill_area', 'order'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LearnerSkillAreaProgress',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('status', models.CharField(choices=[('NOT_STARTED', 'Not Started'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('PAUSED', 'Paused')], default='NOT_STARTED', max_length=20)),
+                ('progress_percentage', models.DecimalField(decimal_places=2, default=0.0, max_digits=5)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_accessed_at', models.DateTimeField(auto_now=True)),
+                ('total_time_spent_hours', models.DecimalField(decimal_places=2, default=0.0, max_digits=8)),
+                ('current_module', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='fme.skillareamodule')),
+                ('learner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_area_progress', to='fme.learnerprofile')),
+                ('skill_area', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='learner_progress', to='fme.skillarea')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LearnerModuleProgress',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('status', models.CharField(choices=[('NOT_STARTED', 'Not Started'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed')], default='NOT_STARTED', max_length=20)),
+                ('progress_percentage', models.DecimalField(decimal_places=2, default=0.0, max_digits=5)),
+                ('score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('time_spent_hours', models.DecimalField(decimal_places=2, default=0.0, max_digits=6)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('best_score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('learner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='module_progress', to='fme.learnerprofile')),
+                ('module', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='learner_progress', to='fme.skillareamodule')),
+                ('skill_area_progress', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='module_progress', to='fme.learnerskillareaprogress')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='skillareamodule',
+            index=models.Index(fields=['skill_area', 'order'], name='fme_skillar_skill_a_2b354b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillareamodule',
+            index=models.Index(fields=['level'], name='fme_skillar_level_db9897_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillareamodule',
+            index=models.Index(fields=['status'], name='fme_skillar_status_8bca3f_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='skillareamodule',
+            unique_together={('skill_area', 'name')},
+        ),
+        migrations.AddIndex(
+            model_name='skillarea',
+            index=models.Index(fields=['status'], name='fme_skillar_status_75a74a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillarea',
+            index=models.Index(fields=['target_audience'], name='fme_skillar_target__0d3d02_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillarea',
+            index=models.Index(fields=['avg_completion_rate'], name='fme_skillar_avg_com_af85cf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learnerskillareaprogress',
+            index=models.Index(fields=['learner', 'status'], name='fme_learner_learner_28a727_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learnerskillareaprogress',
+            index=models.Index(fields=['skill_area', 'status'], name='fme_learner_skill_a_729c0d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learnerskillareaprogress',
+            index=models.Index(fields=['progress_percentage'], name='fme_learner_progres_9c0ee8_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='learnerskillareaprogress',
+            unique_together={('learner', 'skill_area')},
+        ),
+        migrations.AddIndex(
+            model_name='learnermoduleprogress',
+            index=models.Index(fields=['learner', 'status'], name='fme_learner_learner_7aaf54_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learnermoduleprogress',
+            index=models.Index(fields=['module', 'status'], name='fme_learner_module__310be9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learnermoduleprogress',
+            index=models.Index(fields=['progress_percentage'], name='fme_learner_progres_95f42d_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='learnermoduleprogress',
+            unique_together={('learner', 'module')},
+        ),
+    ]
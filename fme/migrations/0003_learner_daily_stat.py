@@ -0,0 +1,53 @@
+# Generated by Django 4.2.13 on 2026-10-18 14:56
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fme', '0002_skill_area'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('value', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ('-updated_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LearnerDailyStat',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('day', models.DateField()),
+                ('state', models.CharField(choices=[('ABIA', 'Abia'), ('ADAMAWA', 'Adamawa'), ('AKWA IBOM', 'Akwa Ibom'), ('ANAMBRA', 'Anambra'), ('BAUCHI', 'Bauchi'), ('BAYELSA', 'Bayelsa'), ('BENUE', 'Benue'), ('BORNO', 'Borno'), ('CROSS RIVER', 'Cross River'), ('DELTA', 'Delta'), ('EBONYI', 'Ebonyi'), ('EDO', 'Edo'), ('EKITI', 'Ekiti'), ('ENUGU', 'Enugu'), ('FCT', 'Fct'), ('GOMBE', 'Gombe'), ('IMO', 'Imo'), ('JIGAWA', 'Jigawa'), ('KADUNA', 'Kaduna'), ('KANO', 'Kano'), ('KATSINA', 'Katsina'), ('KEBBI', 'Kebbi'), ('KOGI', 'Kogi'), ('KWARA', 'Kwara'), ('LAGOS', 'Lagos'), ('NASARAWA', 'Nasarawa'), ('NIGER', 'Niger'), ('OGUN', 'Ogun'), ('ONDO', 'Ondo'), ('OSUN', 'Osun'), ('OYO', 'Oyo'), ('PLATEAU', 'Plateau'), ('RIVERS', 'Rivers'), ('SOKOTO', 'Sokoto'), ('TARABA', 'Taraba'), ('YOBE', 'Yobe'), ('ZAMFARA', 'Zamfara')], max_length=25)),
+                ('learning_track', models.CharField(max_length=100)),
+                ('gender', models.CharField(choices=[('MALE', 'Male'), ('FEMALE', 'Female')], max_length=20)),
+                ('account_type', models.CharField(choices=[('STUDENT', 'Student'), ('PROFESSIONAL', 'Professional')], max_length=20)),
+                ('work_type', models.CharField(choices=[('ALL', 'All'), ('ONSITE', 'Onsite'), ('REMOTE', 'Remote')], max_length=20)),
+                ('learner_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('progress_sum', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['learning_track', 'day'], name='fme_learner_learnin_b53271_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='learnerdailystat',
+            constraint=models.UniqueConstraint(fields=('day', 'state', 'learning_track', 'gender', 'account_type', 'work_type'), name='unique_learner_daily_stat'),
+        ),
+    ]
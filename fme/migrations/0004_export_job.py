@@ -0,0 +1,45 @@
+# Generated by Django 4.2.13 on 2026-10-18 15:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fme', '0003_learner_daily_stat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('kind', models.CharField(max_length=50)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed'), ('EXPIRED', 'Expired')], db_index=True, default='PENDING', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('rows_written', models.PositiveIntegerField(default=0)),
+                ('total_rows', models.PositiveIntegerField(blank=True, null=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('file_path', models.CharField(blank=True, max_length=500)),
+                ('file_size', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('content_type', models.CharField(default='text/csv', max_length=100)),
+                ('storage', models.CharField(blank=True, choices=[('local', 'Local'), ('s3', 'S3')], max_length=10)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-updated_at',),
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.13 on 2026-10-18 15:07
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fme', '0004_export_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='change_token',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('entity', models.CharField(max_length=50)),
+                ('object_id', models.UUIDField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entity', 'created_at'], name='fme_tombsto_entity_5c882b_idx')],
+            },
+        ),
+    ]
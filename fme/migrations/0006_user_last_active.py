@@ -0,0 +1,18 @@
+# Generated by Django 4.2.13 on 2026-10-18 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fme', '0005_tombstone'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='last_active',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
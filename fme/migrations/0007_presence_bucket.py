@@ -0,0 +1,32 @@
+# Generated by Django 4.2.13 on 2026-10-18 15:14
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fme', '0006_user_last_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PresenceBucket',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('resolution', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour'), ('day', 'Day')], max_length=10)),
+                ('start', models.DateTimeField()),
+                ('sketch', models.BinaryField()),
+            ],
+            options={
+                'ordering': ['-start'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='presencebucket',
+            constraint=models.UniqueConstraint(fields=('resolution', 'start'), name='unique_presence_bucket'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.13 on 2026-10-18 15:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+def create_activity_log(apps, schema_editor):
+    """ a monthly range partitioned table on Postgres, a plain table elsewhere """
+    ActivityLog = apps.get_model('fme', 'ActivityLog')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.create_model(ActivityLog)
+        return
+    user_table = apps.get_model('fme', 'User')._meta.db_table
+    schema_editor.execute(f"""
+        CREATE TABLE "fme_activitylog" (
+            "id" uuid NOT NULL,
+            "timestamp" timestamp with time zone NOT NULL,
+            "user_id" uuid NULL REFERENCES "{user_table}" ("id") DEFERRABLE INITIALLY DEFERRED,
+            "action_type" varchar(50) NOT NULL,
+            "target" varchar(255) NOT NULL,
+            "target_id" varchar(64) NOT NULL,
+            "details" text NOT NULL,
+            "metadata" jsonb NOT NULL,
+            "ip_address" inet NULL,
+            PRIMARY KEY ("id", "timestamp")
+        ) PARTITION BY RANGE ("timestamp")
+    """)
+    schema_editor.execute('CREATE TABLE "fme_activitylog_default" PARTITION OF "fme_activitylog" DEFAULT')
+    for index in ActivityLog._meta.indexes:
+        schema_editor.add_index(ActivityLog, index)
+
+
+def drop_activity_log(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model('fme', 'ActivityLog'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fme', '0007_presence_bucket'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ActivityLog',
+                    fields=[
+                        ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                        ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                        ('action_type', models.CharField(choices=[('LOGIN', 'Login'), ('LOGIN_FAILED', 'Failed login'), ('LOGOUT', 'Logout'), ('STATUS_CHANGE', 'User status changed'), ('BULK_ACTION', 'Bulk operation'), ('INVITE', 'User invited'), ('EXPORT', 'Data exported'), ('EXPORT_DOWNLOAD', 'Export downloaded')], max_length=50)),
+                        ('target', models.CharField(blank=True, max_length=255)),
+                        ('target_id', models.CharField(blank=True, max_length=64)),
+                        ('details', models.TextField(blank=True)),
+                        ('metadata', models.JSONField(blank=True, default=dict)),
+                        ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                        ('user', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'ordering': ['-timestamp', '-id'],
+                        'indexes': [models.Index(fields=['user', 'action_type', 'timestamp'], name='activitylog_user_action_ts'), models.Index(fields=['action_type', 'timestamp'], name='activitylog_action_ts'), models.Index(fields=['timestamp'], name='activitylog_ts')],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(create_activity_log, drop_activity_log),
+    ]
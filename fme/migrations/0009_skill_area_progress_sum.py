@@ -0,0 +1,37 @@
+# Generated by Django 4.2.13 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+def backfill_skill_area_metrics(apps, schema_editor):
+    """ start the incremental counters from the current learners """
+    SkillArea = apps.get_model('fme', 'SkillArea')
+    LearnerProfile = apps.get_model('fme', 'LearnerProfile')
+    learners = {
+        row['learning_track']: row for row in LearnerProfile.objects.values('learning_track').annotate(
+            count=models.Count('id'), progress=models.Sum('progress')
+        ).order_by()
+    }
+    skill_areas = list(SkillArea.objects.all())
+    for skill_area in skill_areas:
+        row = learners.get(skill_area.name, {'count': 0, 'progress': 0})
+        skill_area.total_enrolled = row['count']
+        skill_area.progress_sum = row['progress'] or 0
+        skill_area.avg_completion_rate = round(skill_area.progress_sum / row['count'], 2) if row['count'] else 0
+    SkillArea.objects.bulk_update(skill_areas, ['total_enrolled', 'progress_sum', 'avg_completion_rate'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fme', '0008_activity_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skillarea',
+            name='progress_sum',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_skill_area_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.13 on 2026-10-18 15:31
+
+from django.db import migrations, models, transaction
+import django.db.models.deletion
+
+
+def link_learners_to_skill_areas(apps, schema_editor):
+    """ point existing learners at the skill area named by their learning_track, in pk batches """
+    SkillArea = apps.get_model('fme', 'SkillArea')
+    LearnerProfile = apps.get_model('fme', 'LearnerProfile')
+    skill_areas = dict(SkillArea.objects.values_list('name', 'id'))
+    if not skill_areas:
+        return
+    last_pk = None
+    while True:
+        batch = LearnerProfile.objects.filter(skill_area__isnull=True).order_by('pk')
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        rows = list(batch.values_list('pk', 'learning_track')[:5000])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        by_track = {}
+        for pk, learning_track in rows:
+            if learning_track in skill_areas:
+                by_track.setdefault(learning_track, []).append(pk)
+        # each batch commits on its own so a large table is not locked for the whole backfill
+        with transaction.atomic():
+            for learning_track, pks in by_track.items():
+                LearnerProfile.objects.filter(pk__in=pks).update(skill_area_id=skill_areas[learning_track])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('fme', '0009_skill_area_progress_sum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learnerprofile',
+            name='skill_area',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='learners', to='fme.skillarea'),
+        ),
+        migrations.AddIndex(
+            model_name='learnerprofile',
+            index=models.Index(fields=['skill_area', 'progress'], name='learner_skill_area_progress'),
+        ),
+        migrations.AddIndex(
+            model_name='learnerprofile',
+            index=models.Index(fields=['skill_area', 'created_at'], name='learner_skill_area_created'),
+        ),
+        migrations.RunPython(link_learners_to_skill_areas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 4.2.13 on 2026-10-18 15:35
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+import django.db.models.functions.text
+
+SEARCH_INDEXES = {
+    'User': ('user_first_name_trgm', 'user_last_name_trgm', 'user_email_trgm', 'user_phone_number_trgm'),
+    'LearnerProfile': ('learner_learning_track_trgm',),
+    'SkillArea': ('skill_area_search_vector', 'skill_area_name_trgm'),
+}
+
+
+def create_trigram_extension(apps, schema_editor):
+    # left in place on reverse, other objects may depend on it
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+
+def search_indexes(apps):
+    for model_name, index_names in SEARCH_INDEXES.items():
+        model = apps.get_model('fme', model_name)
+        for index in model._meta.indexes:
+            if index.name in index_names:
+                yield model, index
+
+
+def create_search_indexes(apps, schema_editor):
+    """ GIN indexes exist on Postgres only; built concurrently so large tables stay writable """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model, index in search_indexes(apps):
+        schema_editor.add_index(model, index, concurrently=True)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model, index in search_indexes(apps):
+        schema_editor.remove_index(model, index, concurrently=True)
+
+
+def fill_skill_area_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    apps.get_model('fme', 'SkillArea').objects.update(search_vector=(
+        SearchVector('name', weight='A', config='english') +
+        SearchVector('description', weight='B', config='english') +
+        SearchVector('learning_objectives', weight='C', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('fme', '0010_learner_skill_area'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_extension, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='skillarea',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_skill_area_search_vectors, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='learnerprofile',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('learning_track'), name='gin_trgm_ops'), name='learner_learning_track_trgm'),
+                ),
+                migrations.AddIndex(
+                    model_name='skillarea',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='skill_area_search_vector'),
+                ),
+                migrations.AddIndex(
+                    model_name='skillarea',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='skill_area_name_trgm'),
+                ),
+                migrations.AddIndex(
+                    model_name='user',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('first_name'), name='gin_trgm_ops'), name='user_first_name_trgm'),
+                ),
+                migrations.AddIndex(
+                    model_name='user',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='gin_trgm_ops'), name='user_last_name_trgm'),
+                ),
+                migrations.AddIndex(
+                    model_name='user',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='user_email_trgm'),
+                ),
+                migrations.AddIndex(
+                    model_name='user',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('phone_number'), name='gin_trgm_ops'), name='user_phone_number_trgm'),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
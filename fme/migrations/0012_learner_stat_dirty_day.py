@@ -0,0 +1,27 @@
+# Generated by Django 4.2.13 on 2026-10-18 15:44
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fme', '0011_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LearnerStatDirtyDay',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created_at')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='updated_at')),
+                ('day', models.DateField(unique=True)),
+            ],
+            options={
+                'ordering': ('-updated_at',),
+                'abstract': False,
+            },
+        ),
+    ]
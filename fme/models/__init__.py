@@ -6,3 +6,8 @@ from fme.models.learner import *
 from fme.models.invitation import *
 from fme.models.facilitator import *
 from fme.models.skill_area import *
+from fme.models.analytics import *
+from fme.models.export_job import *
+from fme.models.tombstone import *
+from fme.models.presence import *
+from fme.models.activity_log import *
@@ -0,0 +1,124 @@
+import uuid
+from datetime import date, datetime, time
+from django.db import models, connection, transaction
+from django.utils import timezone
+from fme.models.user import User
+
+
+def month_start(day, offset=0):
+    """ first day of the month `offset` months after `day` """
+    month = day.year * 12 + day.month - 1 + offset
+    return date(month // 12, month % 12 + 1, 1)
+
+
+class ActivityLog(models.Model):
+    """
+        Append-only audit trail, written in batches by fme.helpers.activity_log. On Postgres
+        the table is range partitioned by month on `timestamp` (primary key (id, timestamp)),
+        so reads filtered by date only touch the matching partitions and old months can be
+        dropped whole. Rows outside the created partitions land in the default partition.
+    """
+    DEFAULT_PARTITION = 'default'
+
+    class Action(models.TextChoices):
+        LOGIN = 'LOGIN', 'Login'
+        LOGIN_FAILED = 'LOGIN_FAILED', 'Failed login'
+        LOGOUT = 'LOGOUT', 'Logout'
+        STATUS_CHANGE = 'STATUS_CHANGE', 'User status changed'
+        BULK_ACTION = 'BULK_ACTION', 'Bulk operation'
+        INVITE = 'INVITE', 'User invited'
+        EXPORT = 'EXPORT', 'Data exported'
+        EXPORT_DOWNLOAD = 'EXPORT_DOWNLOAD', 'Export downloaded'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    timestamp = models.DateTimeField(default=timezone.now)
+    # null for system actions and failed logins; kept when the user is deleted
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, db_index=False, related_name='+')
+    action_type = models.CharField(max_length=50, choices=Action.choices)
+    target = models.CharField(max_length=255, blank=True)
+    target_id = models.CharField(max_length=64, blank=True)
+    details = models.TextField(blank=True)
+    metadata = models.JSONField(default=dict, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-timestamp', '-id']
+        indexes = [
+            models.Index(fields=['user', 'action_type', 'timestamp'], name='activitylog_user_action_ts'),
+            models.Index(fields=['action_type', 'timestamp'], name='activitylog_action_ts'),
+            models.Index(fields=['timestamp'], name='activitylog_ts'),
+        ]
+
+    def __str__(self):
+        return f"{self.action_type} by {self.user_id or 'system'} @ {self.timestamp}"
+
+    @classmethod
+    def is_partitioned(cls):
+        return connection.vendor == 'postgresql'
+
+    @classmethod
+    def partition_name(cls, month):
+        return f"{cls._meta.db_table}_{month:%Y_%m}"
+
+    @classmethod
+    def partition_name_default(cls):
+        return f"{cls._meta.db_table}_{cls.DEFAULT_PARTITION}"
+
+    @classmethod
+    def partitions(cls):
+        """ names of the attached partitions """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT child.relname FROM pg_inherits '
+                'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+                'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+                'WHERE parent.relname = %s', [cls._meta.db_table]
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    @classmethod
+    def ensure_partitions(cls, months_ahead=2, today=None):
+        """
+            create the monthly partitions from this month to `months_ahead` months ahead. Rows that
+            already landed in the default partition for a new month are moved into it first.
+        """
+        if not cls.is_partitioned():
+            return []
+        today = today or timezone.localdate()
+        existing = cls.partitions()
+        table = connection.ops.quote_name(cls._meta.db_table)
+        default = connection.ops.quote_name(cls.partition_name_default())
+        created = []
+        for offset in range(months_ahead + 1):
+            start, end = month_start(today, offset), month_start(today, offset + 1)
+            name = cls.partition_name(start)
+            if name in existing:
+                continue
+            partition = connection.ops.quote_name(name)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f'CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+                cursor.execute(
+                    f'WITH moved AS (DELETE FROM {default} WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+                    f'INSERT INTO {partition} SELECT * FROM moved', [start, end]
+                )
+                cursor.execute(
+                    f'ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES FROM (%s) TO (%s)', [start, end]
+                )
+            created.append(name)
+        return created
+
+    @classmethod
+    def drop_partitions_before(cls, month):
+        """ drop the monthly partitions older than `month` (retention), returns their names """
+        if not cls.is_partitioned():
+            cls.objects.filter(timestamp__lt=timezone.make_aware(datetime.combine(month, time.min))).delete()
+            return []
+        oldest_kept = cls.partition_name(month)
+        dropped = []
+        for name in sorted(cls.partitions() - {cls.partition_name_default()}):
+            if name >= oldest_kept:
+                break
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE {connection.ops.quote_name(name)}')
+            dropped.append(name)
+        return dropped
@@ -0,0 +1,162 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q, Sum, Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from fme.helpers import options
+from fme.models.base import BaseModel
+from fme.models.learner import LearnerProfile
+from fme.helpers.view_cache import invalidate_model
+
+
+class AnalyticsWatermark(BaseModel):
+    """ last processed timestamp for incremental analytics jobs """
+    key = models.CharField(max_length=100, unique=True)
+    value = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.key} @ {self.value}"
+
+    @classmethod
+    def get_value(cls, key):
+        return cls.objects.filter(key=key).values_list('value', flat=True).first()
+
+    @classmethod
+    def set_value(cls, key, value):
+        cls.objects.update_or_create(key=key, defaults={'value': value})
+
+
+class LearnerStatDirtyDay(BaseModel):
+    """ registration day whose LearnerDailyStat rows must be rebuilt (a learner of that day was deleted) """
+    day = models.DateField(unique=True)
+
+    def __str__(self):
+        return f"{self.day} (dirty)"
+
+
+class LearnerDailyStat(BaseModel):
+    """
+        Daily learner rollup keyed by registration day and the dashboard dimensions.
+        Dashboards aggregate these rows instead of scanning LearnerProfile.
+    """
+    WATERMARK_KEY = 'learner_daily_stat'
+    DIMENSIONS = ('state', 'learning_track', 'gender', 'account_type', 'work_type')
+
+    day = models.DateField()
+    state = models.CharField(max_length=25, choices=options.STATE)
+    learning_track = models.CharField(max_length=100)
+    gender = models.CharField(max_length=20, choices=LearnerProfile.Gender.choices)
+    account_type = models.CharField(max_length=20, choices=LearnerProfile.AccountType.choices)
+    work_type = models.CharField(max_length=20, choices=LearnerProfile.WorkType.choices)
+
+    learner_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    progress_sum = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'state', 'learning_track', 'gender', 'account_type', 'work_type'],
+                name='unique_learner_daily_stat'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['learning_track', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.state}/{self.learning_track} ({self.learner_count})"
+
+    @classmethod
+    def _build_rows(cls, learners_qs):
+        rows = learners_qs.annotate(day=TruncDate('created_at')).values(
+            'day', *cls.DIMENSIONS
+        ).annotate(
+            learner_count=Count('id'),
+            completed_count=Count('id', filter=Q(progress=100)),
+            progress_sum=Sum('progress'),
+        ).order_by()
+        return [cls(**row) for row in rows]
+
+    @classmethod
+    def refresh(cls, full=False):
+        """
+            Recompute the rollup for every registration day touched since the last run.
+            Returns the number of days rebuilt (None for a full rebuild). The stored watermark lags
+            the start by LEARNER_STATS_SAFETY_LAG so profiles committed late with an earlier
+            updated_at are picked up by the next run; rebuilding a day twice is harmless.
+        """
+        started_at = timezone.now()
+        next_watermark = started_at - timedelta(seconds=settings.LEARNER_STATS_SAFETY_LAG)
+        watermark = None if full else AnalyticsWatermark.get_value(cls.WATERMARK_KEY)
+        days = None
+        with transaction.atomic():
+            if watermark is None:
+                cls.objects.all().delete()
+                LearnerStatDirtyDay.objects.filter(created_at__lte=started_at).delete()
+                learners_qs = LearnerProfile.objects.all()
+            else:
+                dirty_days = list(LearnerStatDirtyDay.objects.filter(created_at__lte=started_at))
+                days = set(
+                    LearnerProfile.objects.filter(updated_at__gt=watermark)
+                    .annotate(day=TruncDate('created_at'))
+                    .values_list('day', flat=True).distinct().order_by()
+                ) | {dirty_day.day for dirty_day in dirty_days}
+                LearnerStatDirtyDay.objects.filter(
+                    pk__in=[dirty_day.pk for dirty_day in dirty_days], created_at__lte=started_at
+                ).delete()
+                if not days:
+                    AnalyticsWatermark.set_value(cls.WATERMARK_KEY, next_watermark)
+                    return 0
+                cls.objects.filter(day__in=days).delete()
+                learners_qs = LearnerProfile.objects.filter(created_at__date__in=days)
+            cls.objects.bulk_create(cls._build_rows(learners_qs), batch_size=1000)
+            AnalyticsWatermark.set_value(cls.WATERMARK_KEY, next_watermark)
+        # dashboards cached on the rollup must not keep serving the old rows
+        invalidate_model(cls)
+        return len(days) if days is not None else None
+
+    @classmethod
+    def mark_deleted(cls, learner):
+        """ deletions leave no updated_at trail, so the next refresh() rebuilds the learner's day """
+        # an existing mark is re-stamped so a refresh() already running does not clear it
+        LearnerStatDirtyDay.objects.bulk_create(
+            [LearnerStatDirtyDay(day=timezone.localdate(learner.created_at))],
+            update_conflicts=True, unique_fields=['day'], update_fields=['created_at']
+        )
+
+    @classmethod
+    def distribution(cls, dimension, queryset=None):
+        """ learner count, completions and average progress grouped by one dimension """
+        queryset = cls.objects.all() if queryset is None else queryset
+        rows = queryset.values(dimension).annotate(
+            count=Sum('learner_count'),
+            completed=Sum('completed_count'),
+            progress_total=Sum('progress_sum'),
+        ).filter(count__gt=0).order_by('-count')
+        return [
+            {
+                dimension: row[dimension],
+                'count': row['count'],
+                'completed': row['completed'],
+                'avg_progress': row['progress_total'] / row['count'],
+            } for row in rows
+        ]
+
+    @classmethod
+    def totals(cls, queryset=None):
+        """ overall learner count, completions and average progress """
+        queryset = cls.objects.all() if queryset is None else queryset
+        totals = queryset.aggregate(
+            count=Sum('learner_count'),
+            completed=Sum('completed_count'),
+            progress_total=Sum('progress_sum'),
+        )
+        count = totals['count'] or 0
+        return {
+            'count': count,
+            'completed': totals['completed'] or 0,
+            'avg_progress': (totals['progress_total'] or 0) / count if count else 0,
+        }
@@ -0,0 +1,130 @@
+from datetime import timedelta
+from django.db import models, transaction, connection
+from django.db.models import Value
+from django.db.models.functions import Least, Greatest
+from django.conf import settings
+from django.utils import timezone
+from fme.models.user import User
+from fme.models.base import BaseModel
+
+
+class ExportJob(BaseModel):
+    """
+        Background export request. Jobs are queued in Postgres and claimed by the
+        run_export_worker command with SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    NOTIFY_CHANNEL = 'fme_export_jobs'
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        RUNNING = 'RUNNING', 'Running'
+        COMPLETED = 'COMPLETED', 'Completed'
+        FAILED = 'FAILED', 'Failed'
+        EXPIRED = 'EXPIRED', 'Expired'
+
+    class Storage(models.TextChoices):
+        LOCAL = 'local', 'Local'
+        S3 = 's3', 'S3'
+
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING, db_index=True)
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+
+    progress = models.PositiveSmallIntegerField(default=0)
+    rows_written = models.PositiveIntegerField(default=0)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    file_name = models.CharField(max_length=255, blank=True)
+    file_path = models.CharField(max_length=500, blank=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, default='text/csv')
+    storage = models.CharField(max_length=10, choices=Storage.choices, blank=True)
+    # watermark for the next delta export of the same kind
+    change_token = models.CharField(max_length=255, blank=True)
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, kind, params, user):
+        job = cls.objects.create(kind=kind, params=params, requested_by=user)
+        if connection.vendor == 'postgresql':
+            # wake idle workers as soon as the job is visible
+            transaction.on_commit(lambda: connection.cursor().execute(f'NOTIFY {cls.NOTIFY_CHANNEL}'))
+        return job
+
+    @classmethod
+    def claim_next(cls):
+        """ lock the oldest pending job and mark it running, or return None """
+        with transaction.atomic():
+            job = cls.objects.select_for_update(skip_locked=True).filter(
+                status=cls.Status.PENDING
+            ).order_by('created_at').first()
+            if job is None:
+                return None
+            job.status = cls.Status.RUNNING
+            job.attempts += 1
+            job.started_at = timezone.now()
+            job.error = ''
+            job.save(update_fields=['status', 'attempts', 'started_at', 'error', 'updated_at'])
+        return job
+
+    @classmethod
+    def requeue_stale(cls):
+        """ jobs whose worker stopped heartbeating are retried, or failed after EXPORT_JOB_MAX_ATTEMPTS """
+        stale_qs = cls.objects.filter(
+            status=cls.Status.RUNNING,
+            updated_at__lt=timezone.now() - timedelta(seconds=settings.EXPORT_JOB_STALE_AFTER)
+        )
+        now = timezone.now()
+        failed = stale_qs.filter(attempts__gte=settings.EXPORT_JOB_MAX_ATTEMPTS).update(
+            status=cls.Status.FAILED, error='Export worker stopped responding', finished_at=now, updated_at=now
+        )
+        requeued = stale_qs.update(status=cls.Status.PENDING, progress=0, rows_written=0, updated_at=now)
+        return requeued, failed
+
+    @classmethod
+    def expired(cls):
+        return cls.objects.filter(status=cls.Status.COMPLETED, expires_at__lt=timezone.now())
+
+    @classmethod
+    def add_rows(cls, job_id, rows):
+        """ heartbeat from shard processes, which only know their own row counts """
+        cls.objects.filter(id=job_id).update(
+            rows_written=models.F('rows_written') + rows,
+            progress=Least(Value(99), (models.F('rows_written') + rows) * 100 / Greatest(models.F('total_rows'), 1)),
+            updated_at=timezone.now()
+        )
+
+    def heartbeat(self, rows_written):
+        self.rows_written = rows_written
+        if self.total_rows:
+            self.progress = min(99, rows_written * 100 // self.total_rows)
+        self.save(update_fields=['rows_written', 'progress', 'updated_at'])
+
+    def mark_completed(self, file_path, file_size, storage):
+        self.status = self.Status.COMPLETED
+        self.progress = 100
+        self.file_path = file_path
+        self.file_size = file_size
+        self.storage = storage
+        self.finished_at = timezone.now()
+        self.expires_at = self.finished_at + timedelta(days=settings.EXPORT_JOB_TTL)
+        self.save()
+
+    def mark_failed(self, error):
+        self.status = self.Status.FAILED
+        self.error = str(error)
+        self.finished_at = timezone.now()
+        self.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+
+    @property
+    def is_downloadable(self):
+        return self.status == self.Status.COMPLETED and bool(self.file_path)
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from fme.helpers import options
 from fme.models.user import User
 from fme.models.base import BaseModel
@@ -21,6 +23,10 @@ class LearnerProfile(BaseModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='learner_profile')
     account_type = models.CharField(max_length=20, choices=AccountType.choices)
     learning_track = models.CharField(max_length=100)
+    # resolved from learning_track on save; the skill area analytics join on it (indexed below)
+    skill_area = models.ForeignKey(
+        'fme.SkillArea', on_delete=models.SET_NULL, null=True, blank=True, related_name='learners', db_index=False
+    )
     skill_cluster = models.CharField(max_length=100)
     work_type = models.CharField(max_length=20, choices=WorkType.choices)
     industrial_prefrence = models.CharField(max_length=100)
@@ -33,10 +39,28 @@ class LearnerProfile(BaseModel):
     # Progress tracking
     # current_pathway = models.ForeignKey('Pathway', on_delete=models.SET_NULL, null=True, blank=True)
     progress = models.PositiveIntegerField(default=0)  # Percentage
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=['skill_area', 'progress'], name='learner_skill_area_progress'),
+            models.Index(fields=['skill_area', 'created_at'], name='learner_skill_area_created'),
+            # learning_track__icontains filters (Postgres only, created by migration 0011)
+            GinIndex(OpClass(Upper('learning_track'), name='gin_trgm_ops'), name='learner_learning_track_trgm'),
+        ]
     
     def __str__(self):
         return f"{self.user.get_full_name()} (Learner)"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        track_changed = self._state.adding or self.learning_track != getattr(self, '_loaded_learning_track', models.DEFERRED)
+        if track_changed and (update_fields is None or 'learning_track' in update_fields):
+            from fme.models.skill_area import SkillArea
+            self.skill_area_id = SkillArea.objects.filter(name=self.learning_track).values_list('id', flat=True).first()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'skill_area'}
+        super().save(*args, **kwargs)
+
     @classmethod
     def create_profile(cls, payload):
         profile = None
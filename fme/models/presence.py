@@ -0,0 +1,73 @@
+from datetime import timedelta
+from django.db import models, transaction
+from django.conf import settings
+from django.utils import timezone
+from fme.models.base import BaseModel
+from fme.helpers.hyperloglog import HyperLogLog
+
+
+class PresenceBucket(BaseModel):
+    """
+        HyperLogLog sketch of the users seen in one minute, hour or day. Day buckets are
+        kept for PRESENCE_DAY_RETENTION days and double as the daily snapshots used for
+        retention; minute and hour buckets only back the rolling windows.
+    """
+
+    class Resolution(models.TextChoices):
+        MINUTE = 'minute', 'Minute'
+        HOUR = 'hour', 'Hour'
+        DAY = 'day', 'Day'
+
+    resolution = models.CharField(max_length=10, choices=Resolution.choices)
+    start = models.DateTimeField()
+    sketch = models.BinaryField()
+
+    class Meta:
+        ordering = ['-start']
+        constraints = [
+            models.UniqueConstraint(fields=['resolution', 'start'], name='unique_presence_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.resolution} @ {self.start}"
+
+    @classmethod
+    def merge(cls, sketches):
+        """
+            union {(resolution, start): HyperLogLog} into the stored buckets. Rows are
+            locked in a fixed order so flushes from several workers cannot deadlock.
+        """
+        keys = sorted(sketches, key=lambda key: (key[0], key[1]))
+        with transaction.atomic():
+            cls.objects.bulk_create([
+                cls(resolution=resolution, start=start, sketch=b'') for resolution, start in keys
+            ], ignore_conflicts=True)
+            query = models.Q()
+            for resolution, start in keys:
+                query |= models.Q(resolution=resolution, start=start)
+            buckets = list(cls.objects.select_for_update().filter(query).order_by('resolution', 'start'))
+            now = timezone.now()
+            for bucket in buckets:
+                sketch = sketches[(bucket.resolution, bucket.start)]
+                if bucket.sketch:
+                    sketch.merge(HyperLogLog(bytes(bucket.sketch), precision=sketch.precision))
+                bucket.sketch = sketch.to_bytes()
+                bucket.updated_at = now
+            cls.objects.bulk_update(buckets, ['sketch', 'updated_at'])
+
+    @classmethod
+    def window(cls, resolution, start, end=None):
+        """ stored sketches for buckets starting in [start, end) """
+        queryset = cls.objects.filter(resolution=resolution, start__gte=start)
+        if end is not None:
+            queryset = queryset.filter(start__lt=end)
+        return [bytes(sketch) for sketch in queryset.values_list('sketch', flat=True) if sketch]
+
+    @classmethod
+    def purge(cls):
+        now = timezone.now()
+        return cls.objects.filter(
+            models.Q(resolution=cls.Resolution.MINUTE, start__lt=now - timedelta(hours=2)) |
+            models.Q(resolution=cls.Resolution.HOUR, start__lt=now - timedelta(days=3)) |
+            models.Q(resolution=cls.Resolution.DAY, start__lt=now - timedelta(days=settings.PRESENCE_DAY_RETENTION))
+        ).delete()[0]
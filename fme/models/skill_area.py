@@ -1,10 +1,18 @@
-from django.db import models
+from decimal import Decimal
+from django.db import models, connection
+from django.db.models.lookups import GreaterThan
+from django.db.models.functions import Cast, Greatest, Round, Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from fme.models.base import BaseModel
 from fme.models.user import User
 from fme.models.learner import LearnerProfile
 
 
 class SkillArea(BaseModel):
+    # text search configuration of search_vector and of the queries run against it
+    SEARCH_CONFIG = 'english'
+    SEARCH_FIELDS = ('name', 'description', 'learning_objectives')
     
     class Status(models.TextChoices):
         DRAFT = 'DRAFT', 'Draft'
@@ -23,11 +31,15 @@ class SkillArea(BaseModel):
     target_audience = models.CharField(max_length=20, choices=TargetAudience.choices, default=TargetAudience.BEGINNER)
     total_enrolled = models.PositiveIntegerField(default=0)
     avg_completion_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
+    # sum of the enrolled learners' progress, kept so the average can be moved incrementally
+    progress_sum = models.PositiveBigIntegerField(default=0)
     total_modules = models.PositiveIntegerField(default=0)
     image = models.URLField(blank=True, null=True)
     prerequisites = models.TextField(blank=True, help_text="Prerequisites for this skill area")
     learning_objectives = models.TextField(blank=True, help_text="What learners will achieve")
     estimated_duration_weeks = models.PositiveIntegerField(default=12)
+    # weighted tsvector of SEARCH_FIELDS, written by the post_save receiver (Postgres only)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     created_by = models.ForeignKey(
         User, 
@@ -42,10 +54,36 @@ class SkillArea(BaseModel):
             models.Index(fields=['status']),
             models.Index(fields=['target_audience']),
             models.Index(fields=['avg_completion_rate']),
+            # Postgres only, created by migration 0011
+            GinIndex(fields=['search_vector'], name='skill_area_search_vector'),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='skill_area_name_trgm'),
         ]
     
     def __str__(self):
         return self.name
+
+    @classmethod
+    def with_module_counts(cls, queryset):
+        """ modules_count/active_modules_count annotations; apply after any filters """
+        return queryset.annotate(
+            modules_count=models.Count('modules'),
+            active_modules_count=models.Count('modules', filter=models.Q(modules__status=SkillAreaModule.Status.ACTIVE)),
+        )
+
+    @classmethod
+    def search_document(cls):
+        """ name outranks description, which outranks learning objectives """
+        return (
+            SearchVector('name', weight='A', config=cls.SEARCH_CONFIG) +
+            SearchVector('description', weight='B', config=cls.SEARCH_CONFIG) +
+            SearchVector('learning_objectives', weight='C', config=cls.SEARCH_CONFIG)
+        )
+
+    @classmethod
+    def update_search_vector(cls, skill_area_ids=None):
+        queryset = cls.objects.all() if skill_area_ids is None else cls.objects.filter(pk__in=skill_area_ids)
+        if connection.vendor == 'postgresql':
+            queryset.update(search_vector=cls.search_document())
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -58,19 +96,68 @@ class SkillArea(BaseModel):
         return self.status == self.Status.ACTIVE
     
     def update_metrics(self):
-        enrolled_count = LearnerProfile.objects.filter(learning_track=self.name).count()
-        learners = LearnerProfile.objects.filter(learning_track=self.name)
-        if learners.exists():
-            avg_progress = learners.aggregate(
-                models.Avg('progress')
-            )['progress__avg'] or 0
-        else:
-            avg_progress = 0
+        learners = self.learners.aggregate(
+            count=models.Count('id'), progress=models.Sum('progress')
+        )
         active_modules = self.modules.filter(status=SkillAreaModule.Status.ACTIVE).count()
-        self.total_enrolled = enrolled_count
-        self.avg_completion_rate = round(avg_progress, 2)
+        self.total_enrolled = learners['count']
+        self.progress_sum = learners['progress'] or 0
+        self.avg_completion_rate = round(self.progress_sum / self.total_enrolled, 2) if self.total_enrolled else 0
         self.total_modules = active_modules
-        self.save(update_fields=['total_enrolled', 'avg_completion_rate', 'total_modules'])
+        self.save(update_fields=['total_enrolled', 'progress_sum', 'avg_completion_rate', 'total_modules'])
+
+    @classmethod
+    def apply_learner_delta(cls, skill_area_id, learners=0, progress=0):
+        """
+            move total_enrolled/progress_sum/avg_completion_rate of a skill area in one
+            atomic UPDATE (every right-hand side reads the pre-update row)
+        """
+        if not skill_area_id or (not learners and not progress):
+            return
+        enrolled = Greatest(models.F('total_enrolled') + learners, 0)
+        progress_sum = Greatest(models.F('progress_sum') + progress, 0)
+        cls.objects.filter(pk=skill_area_id).update(
+            total_enrolled=enrolled,
+            progress_sum=progress_sum,
+            avg_completion_rate=models.Case(
+                models.When(
+                    GreaterThan(enrolled, 0),
+                    then=Round(Cast(progress_sum, models.FloatField()) / enrolled, 2)
+                ),
+                default=models.Value(0),
+                output_field=models.DecimalField(max_digits=5, decimal_places=2),
+            ),
+        )
+
+    @classmethod
+    def reconcile_metrics(cls):
+        """
+            fix drift in every skill area's counters from one grouped query over the learners
+            (plus one for active modules); only changed rows are written. Returns their number.
+        """
+        learners = {
+            row['skill_area']: row for row in LearnerProfile.objects.filter(skill_area__isnull=False).values(
+                'skill_area'
+            ).annotate(count=models.Count('id'), progress=models.Sum('progress')).order_by()
+        }
+        changed = []
+        for skill_area in cls.objects.annotate(active_modules=models.Count(
+            'modules', filter=models.Q(modules__status=SkillAreaModule.Status.ACTIVE)
+        )):
+            row = learners.get(skill_area.pk, {'count': 0, 'progress': 0})
+            enrolled, progress_sum = row['count'], row['progress'] or 0
+            average = Decimal(round(progress_sum / enrolled, 2) if enrolled else 0).quantize(Decimal('0.01'))
+            if (
+                skill_area.total_enrolled, skill_area.progress_sum, skill_area.avg_completion_rate,
+                skill_area.total_modules
+            ) != (enrolled, progress_sum, average, skill_area.active_modules):
+                skill_area.total_enrolled, skill_area.progress_sum = enrolled, progress_sum
+                skill_area.avg_completion_rate, skill_area.total_modules = average, skill_area.active_modules
+                changed.append(skill_area)
+        cls.objects.bulk_update(
+            changed, ['total_enrolled', 'progress_sum', 'avg_completion_rate', 'total_modules'], batch_size=500
+        )
+        return len(changed)
 
 
 class SkillAreaModule(BaseModel):
@@ -0,0 +1,39 @@
+from datetime import timedelta
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+from fme.models.base import BaseModel
+
+
+class Tombstone(BaseModel):
+    """
+        Deleted export row (keyed like the export, by user id) so delta exports can
+        tell downstream consumers what to remove. created_at is the deletion time.
+    """
+    entity = models.CharField(max_length=50)
+    object_id = models.UUIDField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['entity', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} {self.object_id} deleted @ {self.created_at}"
+
+    @classmethod
+    def record(cls, entity, object_id):
+        return cls.objects.create(entity=entity, object_id=object_id)
+
+    @classmethod
+    def since(cls, entity, watermark):
+        return cls.objects.filter(entity=entity, created_at__gt=watermark)
+
+    @classmethod
+    def retention_start(cls):
+        """ oldest watermark that still has a complete tombstone history """
+        return timezone.now() - timedelta(days=settings.EXPORT_TOMBSTONE_RETENTION)
+
+    @classmethod
+    def purge(cls):
+        return cls.objects.filter(created_at__lt=cls.retention_start()).delete()[0]
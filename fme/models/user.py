@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from fme.models.base import BaseModel
 from django.contrib.auth.models import AbstractUser
 
@@ -23,7 +25,8 @@ class User(AbstractUser, BaseModel):
     role = models.CharField(max_length=20, choices=Role.choices)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DISABLED)
     phone_number = models.CharField(max_length=20, blank=True, null=True)
-    last_active = models.DateTimeField(auto_now=True)
+    # written in bulk by fme.helpers.activity, not on every save()
+    last_active = models.DateTimeField(null=True, blank=True)
     
     # Remove unused fields from AbstractUser
     first_name = models.CharField(max_length=150)
@@ -39,10 +42,25 @@ class User(AbstractUser, BaseModel):
             models.Index(fields=['role']),
             models.Index(fields=['status']),
             models.Index(fields=['last_active']),
+            # trigram indexes for learner search (Postgres only, created by migration 0011). They
+            # index UPPER(column) because that is what icontains compares on Postgres
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='user_first_name_trgm'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='user_last_name_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='user_email_trgm'),
+            GinIndex(OpClass(Upper('phone_number'), name='gin_trgm_ops'), name='user_phone_number_trgm'),
         ]
 
     def __str__(self):
         return f"{self.get_full_name()} ({self.role})"
+
+    def save(self, *args, **kwargs):
+        # a full save of an existing user must not write back a stale last_active
+        if not self._state.adding and not args and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'last_active'
+            ]
+        super().save(*args, **kwargs)
     
     @property
     def is_admin(self):
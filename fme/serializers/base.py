@@ -24,3 +24,9 @@ class BaseSerializer(serializers.Serializer):
 
 class PaginationParamSerializer(BaseSerializer):
     page_size = serializers.IntegerField(min_value=1, required=False)
+    pagination = serializers.ChoiceField(
+        choices=['page', 'cursor'], required=False,
+        help_text="Use 'cursor' for keyset pagination (constant cost on deep pages)"
+    )
+    cursor = serializers.CharField(required=False, help_text="Opaque cursor from links.next/links.previous")
+    with_total = serializers.BooleanField(required=False, help_text="Include the exact total in cursor mode")
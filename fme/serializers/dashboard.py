@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from fme.models.user import User
+from fme.models.activity_log import ActivityLog
 from fme.serializers.base import BaseSerializer
+from fme.helpers.search import search_terms, MIN_TERM_LENGTH
 
 class BulkUserActionSerializer(BaseSerializer):
     """Serializer for bulk user operations"""
@@ -160,11 +162,26 @@ class DashboardWidgetSerializer(BaseSerializer):
 class ActivityLogFilterSerializer(BaseSerializer):
     """Serializer for filtering activity logs"""
     user_id = serializers.UUIDField(required=False)
-    action_type = serializers.CharField(max_length=50, required=False)
+    action_type = serializers.ChoiceField(choices=ActivityLog.Action.choices, required=False)
     date_from = serializers.DateTimeField(required=False)
     date_to = serializers.DateTimeField(required=False)
-    page = serializers.IntegerField(min_value=1, default=1)
     page_size = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    cursor = serializers.CharField(
+        required=False, help_text="Opaque cursor from links.next/links.previous (the log is keyset paginated)"
+    )
+
+class ActivityLogSerializer(serializers.ModelSerializer):
+    """Activity log entry"""
+    user = serializers.SerializerMethodField()
+    action = serializers.CharField(source='get_action_type_display')
+
+    class Meta:
+        model = ActivityLog
+        fields = ['id', 'user', 'user_id', 'action_type', 'action', 'target', 'target_id',
+                  'details', 'metadata', 'ip_address', 'timestamp']
+
+    def get_user(self, obj):
+        return obj.user.email if obj.user_id else 'system'
 
 class LearnerSearchSerializer(BaseSerializer):
     """Advanced learner search serializer"""
@@ -189,14 +206,29 @@ class LearnerSearchSerializer(BaseSerializer):
         required=False
     )
     sort_by = serializers.ChoiceField(
-        choices=['name', 'progress', 'registration_date', 'last_active'],
-        default='registration_date'
+        choices=['relevance', 'name', 'progress', 'registration_date', 'last_active'],
+        default='relevance',
+        help_text="relevance applies when a query is given, registration_date otherwise"
     )
     sort_order = serializers.ChoiceField(
         choices=['asc', 'desc'],
         default='desc'
     )
 
+    def validate_query(self, value):
+        if not search_terms(value):
+            raise serializers.ValidationError(f"Search terms need at least {MIN_TERM_LENGTH} characters")
+        return value
+
+    def validate_progress_range(self, value):
+        try:
+            low, high = (int(bound) for bound in value.split('-'))
+        except ValueError:
+            raise serializers.ValidationError("Use the format 'min-max', e.g. '50-80'")
+        if not 0 <= low <= high <= 100:
+            raise serializers.ValidationError("Progress range must be within 0-100 with min <= max")
+        return low, high
+
 class MentorPerformanceSerializer(BaseSerializer):
     """Serializer for mentor performance metrics"""
     mentor_id = serializers.UUIDField()
@@ -0,0 +1,62 @@
+from django.urls import reverse
+from rest_framework import serializers
+from fme.models.export_job import ExportJob
+from fme.serializers.base import BaseSerializer
+from fme.helpers.export_jobs import EXPORT_KINDS
+from fme.helpers.export import EXPORT_FORMATS, export_format_error
+from fme.helpers.delta import resolve_watermark, InvalidWatermark
+
+class CreateExportJobSerializer(BaseSerializer):
+    kind = serializers.ChoiceField(choices=sorted(EXPORT_KINDS))
+    format = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default='csv')
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    since = serializers.CharField(required=False, help_text="ISO date/datetime, export only rows changed after it")
+    change_token = serializers.CharField(required=False, help_text="change_token of a previous export")
+    workers = serializers.IntegerField(
+        min_value=1, max_value=64, required=False,
+        help_text="Processes used to write the learners table (defaults to EXPORT_SHARD_WORKERS)"
+    )
+    shard_by = serializers.ChoiceField(choices=['pk', 'state'], required=False)
+
+    def validate(self, attrs):
+        # to_internal_value has already moved since/change_token under params
+        try:
+            resolve_watermark(attrs['params'])
+        except InvalidWatermark as e:
+            raise serializers.ValidationError(str(e))
+        return attrs
+
+    def validate_format(self, value):
+        error = export_format_error(value)
+        if error:
+            raise serializers.ValidationError(error)
+        return value
+
+    def to_internal_value(self, data):
+        validated_data = super().to_internal_value(data)
+        # job params are stored as JSON
+        return {
+            'kind': validated_data.pop('kind'),
+            'params': {
+                key: value.isoformat() if hasattr(value, 'isoformat') else value
+                for key, value in validated_data.items()
+            }
+        }
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'kind', 'params', 'status', 'progress', 'rows_written', 'total_rows',
+            'attempts', 'error', 'file_name', 'file_size', 'created_at', 'started_at',
+            'finished_at', 'expires_at', 'change_token', 'download_url'
+        ]
+
+    def get_download_url(self, obj):
+        request = self.context.get('request')
+        if not obj.is_downloadable or request is None:
+            return None
+        return request.build_absolute_uri(reverse('export_job_download', args=[obj.id]))
@@ -71,3 +71,7 @@ class LearnerProfileSerializer(serializers.ModelSerializer):
             'work_type', 'industrial_prefrence', 'portfolio_link',
             'state', 'gender', 'resume', 'progress', #'current_pathway',
         ]
+
+class LearnerImportSerializer(BaseSerializer):
+    file = serializers.FileField(help_text="CSV or XLSX file, one learner per row with a header row")
+    dry_run = serializers.BooleanField(default=False, help_text="Validate only, nothing is saved")
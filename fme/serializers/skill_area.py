@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from fme.models.skill_area import (
     SkillArea, SkillAreaModule, LearnerSkillAreaProgress, 
-    LearnerModuleProgress, SkillAreaAssessment
+    LearnerModuleProgress
 )
 from fme.models.user import User
 from fme.serializers.base import BaseSerializer
+from fme.helpers.skill_area_analytics import skill_area_analytics
 from fme.serializers.authentication import UserSerializer
 
 
@@ -68,11 +69,14 @@ class SkillAreaCreateUpdateSerializer(serializers.ModelSerializer):
 
 
 class SkillAreaListSerializer(serializers.ModelSerializer):
-    """Serializer for skill area list view"""
+    """
+    Serializer for skill area list view. Module counts are read from the annotations added by
+    SkillAreaViewSet.get_queryset() and only queried per row when missing (nested use).
+    """
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     target_audience_display = serializers.CharField(source='get_target_audience_display', read_only=True)
     created_by = UserSerializer(read_only=True)
-    modules_count = serializers.IntegerField(source='modules.count', read_only=True)
+    modules_count = serializers.SerializerMethodField()
     active_modules_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -85,12 +89,33 @@ class SkillAreaListSerializer(serializers.ModelSerializer):
             'created_by', 'created_at', 'updated_at'
         ]
     
+    def get_modules_count(self, obj):
+        count = getattr(obj, 'modules_count', None)
+        return count if count is not None else obj.modules.count()
+
     def get_active_modules_count(self, obj):
-        return obj.modules.filter(status=SkillAreaModule.Status.ACTIVE).count()
+        count = getattr(obj, 'active_modules_count', None)
+        return count if count is not None else obj.modules.filter(status=SkillAreaModule.Status.ACTIVE).count()
+
+
+class SkillAreaDetailListSerializer(serializers.ListSerializer):
+    """Loads the analytics of every skill area in one batch before serializing them"""
+
+    def to_representation(self, data):
+        instances = data.all() if hasattr(data, 'all') else data
+        if self.context.get('include_analytics', True):
+            self.context.setdefault('skill_area_analytics', {}).update(skill_area_analytics(instances))
+        return super().to_representation(instances)
 
 
 class SkillAreaDetailSerializer(serializers.ModelSerializer):
-    """Detailed serializer for individual skill area view"""
+    """
+    Detailed serializer for individual skill area view. Analytics come from the batched,
+    cached provider in fme.helpers.skill_area_analytics; pass include_analytics=False in the
+    context to leave them out (write responses).
+    """
+    ANALYTICS_FIELDS = ('enrollment_trend', 'completion_stats', 'performance_by_module')
+
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     target_audience_display = serializers.CharField(source='get_target_audience_display', read_only=True)
     modules = SkillAreaModuleSerializer(many=True, read_only=True)
@@ -103,6 +128,7 @@ class SkillAreaDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = SkillArea
+        list_serializer_class = SkillAreaDetailListSerializer
         fields = [
             'id', 'name', 'slug', 'description', 'status', 'status_display',
             'target_audience', 'target_audience_display', 'prerequisites',
@@ -111,77 +137,31 @@ class SkillAreaDetailSerializer(serializers.ModelSerializer):
             'modules', 'created_by', 'enrollment_trend', 'completion_stats',
             'performance_by_module', 'created_at', 'updated_at'
         ]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get('include_analytics', True):
+            for name in self.ANALYTICS_FIELDS:
+                fields.pop(name)
+        return fields
+
+    def analytics(self, obj):
+        loaded = self.context.setdefault('skill_area_analytics', {})
+        if obj.pk not in loaded:
+            loaded.update(skill_area_analytics([obj]))
+        return loaded[obj.pk]
     
     def get_enrollment_trend(self, obj):
         """Get enrollment trend data for the last 6 months"""
-        from django.utils import timezone
-        from datetime import timedelta
-        from django.db.models import Count
-        from fme.models.learner import LearnerProfile
-        
-        now = timezone.now()
-        trend_data = []
-        
-        for i in range(6):
-            month_start = now - timedelta(days=30 * (i + 1))
-            month_end = now - timedelta(days=30 * i)
-            
-            count = LearnerProfile.objects.filter(
-                learning_track=obj.name,
-                created_at__gte=month_start,
-                created_at__lt=month_end
-            ).count()
-            
-            trend_data.append({
-                'month': month_start.strftime('%Y-%m'),
-                'enrollments': count
-            })
-        
-        return trend_data[::-1]  # Reverse for chronological order
+        return self.analytics(obj)['enrollment_trend']
     
     def get_completion_stats(self, obj):
         """Get completion statistics"""
-        from fme.models.learner import LearnerProfile
-        
-        learners = LearnerProfile.objects.filter(learning_track=obj.name)
-        total = learners.count()
-        
-        if total == 0:
-            return {
-                'total_learners': 0,
-                'completed': 0,
-                'in_progress': 0,
-                'not_started': 0,
-                'completion_rate': 0
-            }
-        
-        completed = learners.filter(progress=100).count()
-        in_progress = learners.filter(progress__gt=0, progress__lt=100).count()
-        not_started = learners.filter(progress=0).count()
-        
-        return {
-            'total_learners': total,
-            'completed': completed,
-            'in_progress': in_progress,
-            'not_started': not_started,
-            'completion_rate': round((completed / total) * 100, 2)
-        }
+        return self.analytics(obj)['completion_stats']
     
     def get_performance_by_module(self, obj):
         """Get performance data by module"""
-        modules_performance = []
-        
-        for module in obj.modules.filter(status=SkillAreaModule.Status.ACTIVE):
-            # This would require more complex queries with actual progress tracking
-            modules_performance.append({
-                'module_name': module.name,
-                'level': module.level,
-                'completion_rate': float(module.completion_rate),
-                'average_score': float(module.average_score),
-                'duration_hours': module.duration_hours
-            })
-        
-        return modules_performance
+        return self.analytics(obj)['performance_by_module']
 
 
 class LearnerSkillAreaProgressSerializer(serializers.ModelSerializer):
@@ -217,36 +197,40 @@ class LearnerModuleProgressSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'learner']
 
 
-class SkillAreaAssessmentSerializer(serializers.ModelSerializer):
-    """Serializer for skill area assessments"""
-    skill_area = serializers.StringRelatedField(read_only=True)
-    module = serializers.StringRelatedField(read_only=True)
-    assessment_type_display = serializers.CharField(source='get_assessment_type_display', read_only=True)
-    
-    class Meta:
-        model = SkillAreaAssessment
-        fields = [
-            'id', 'skill_area', 'module', 'title', 'description',
-            'assessment_type', 'assessment_type_display', 'max_score',
-            'passing_score', 'time_limit_minutes', 'max_attempts',
-            'is_active', 'available_from', 'available_until',
-            'instructions', 'questions'
-        ]
-        read_only_fields = ['id']
+# SkillAreaAssessment is commented out of fme.models.skill_area
+# class SkillAreaAssessmentSerializer(serializers.ModelSerializer):
+#     """Serializer for skill area assessments"""
+#     skill_area = serializers.StringRelatedField(read_only=True)
+#     module = serializers.StringRelatedField(read_only=True)
+#     assessment_type_display = serializers.CharField(source='get_assessment_type_display', read_only=True)
+
+#     class Meta:
+#         model = SkillAreaAssessment
+#         fields = [
+#             'id', 'skill_area', 'module', 'title', 'description',
+#             'assessment_type', 'assessment_type_display', 'max_score',
+#             'passing_score', 'time_limit_minutes', 'max_attempts',
+#             'is_active', 'available_from', 'available_until',
+#             'instructions', 'questions'
+#         ]
+#         read_only_fields = ['id']
 
 
 class SkillAreaFilterSerializer(BaseSerializer):
     """Serializer for filtering skill areas"""
     status = serializers.ChoiceField(choices=SkillArea.Status.choices, required=False)
     target_audience = serializers.ChoiceField(choices=SkillArea.TargetAudience.choices, required=False)
-    search = serializers.CharField(max_length=200, required=False)
+    search = serializers.CharField(
+        max_length=200, required=False,
+        help_text="Full-text search over name, description and learning objectives, ranked by relevance"
+    )
     created_by = serializers.UUIDField(required=False)
     min_completion_rate = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
     max_completion_rate = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
     ordering = serializers.ChoiceField(
         choices=['name', '-name', 'created_at', '-created_at', 'avg_completion_rate', '-avg_completion_rate'],
-        default='-created_at',
-        required=False
+        required=False,
+        help_text="Defaults to relevance when searching and to -created_at otherwise"
     )
 
 
@@ -0,0 +1,91 @@
+from django.dispatch import receiver
+from fme.models.user import User
+from fme.models.learner import LearnerProfile
+from fme.models.mentor import MentorProfile
+from fme.models.tombstone import Tombstone
+from fme.models.analytics import LearnerDailyStat
+from fme.models.skill_area import SkillArea, SkillAreaModule
+from fme.helpers.view_cache import invalidate_model
+from fme.helpers.skill_area_analytics import invalidate_skill_areas
+from fme.authentication import token_user_cache
+from django.db.models import DEFERRED
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete
+
+
+@receiver(post_delete, sender=LearnerProfile)
+def mark_deleted_learner_day(sender, instance, **kwargs):
+    LearnerDailyStat.mark_deleted(instance)
+
+
+@receiver(post_delete, sender=LearnerProfile)
+def tombstone_deleted_learner(sender, instance, **kwargs):
+    Tombstone.record('learners', instance.user_id)
+
+
+@receiver(post_delete, sender=MentorProfile)
+def tombstone_deleted_mentor(sender, instance, **kwargs):
+    Tombstone.record('mentors', instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=LearnerProfile)
+@receiver([post_save, post_delete], sender=SkillArea)
+def invalidate_cached_views(sender, **kwargs):
+    invalidate_model(sender)
+
+
+@receiver([post_save, pre_delete], sender=User)
+def invalidate_cached_token_user(sender, instance, **kwargs):
+    """ status or password changes must not wait out the token cache TTL (pre_delete: tokens are still there) """
+    token_user_cache.invalidate_users([instance.pk])
+
+
+@receiver(post_init, sender=LearnerProfile)
+def remember_learning_track(sender, instance, **kwargs):
+    # __dict__ so deferred fields stay deferred
+    instance._loaded_learning_track = instance.__dict__.get('learning_track', DEFERRED)
+    instance._loaded_skill_area_id = instance.__dict__.get('skill_area_id', DEFERRED)
+    instance._loaded_progress = instance.__dict__.get('progress', DEFERRED)
+
+
+@receiver(post_save, sender=LearnerProfile)
+def count_saved_learner(sender, instance, created, **kwargs):
+    """ move the counters and analytics of the learner's old and new skill area """
+    old_skill_area_id, old_progress = instance._loaded_skill_area_id, instance._loaded_progress
+    if created:
+        SkillArea.apply_learner_delta(instance.skill_area_id, 1, instance.progress)
+    elif DEFERRED in (old_skill_area_id, old_progress):
+        pass  # loaded with deferred fields, reconcile_skill_area_metrics catches up
+    elif old_skill_area_id != instance.skill_area_id:
+        SkillArea.apply_learner_delta(old_skill_area_id, -1, -old_progress)
+        SkillArea.apply_learner_delta(instance.skill_area_id, 1, instance.progress)
+    elif old_progress != instance.progress:
+        SkillArea.apply_learner_delta(instance.skill_area_id, 0, instance.progress - old_progress)
+    invalidate_skill_areas([pk for pk in (instance.skill_area_id, old_skill_area_id) if pk is not DEFERRED])
+    remember_learning_track(sender, instance)
+
+
+@receiver(post_delete, sender=LearnerProfile)
+def discount_deleted_learner_from_skill_area(sender, instance, **kwargs):
+    SkillArea.apply_learner_delta(instance.skill_area_id, -1, -instance.progress)
+    invalidate_skill_areas([instance.skill_area_id])
+
+
+@receiver(post_save, sender=SkillArea)
+def refresh_skill_area_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) & set(SkillArea.SEARCH_FIELDS):
+        SkillArea.update_search_vector([instance.pk])
+
+
+@receiver(post_save, sender=SkillArea)
+def link_learners_to_new_skill_area(sender, instance, created, **kwargs):
+    """ learners who already chose this track by name join the new skill area """
+    if created and LearnerProfile.objects.filter(skill_area__isnull=True, learning_track=instance.name).update(
+        skill_area=instance
+    ):
+        instance.update_metrics()
+
+
+@receiver([post_save, post_delete], sender=SkillAreaModule)
+def invalidate_module_performance(sender, instance, **kwargs):
+    invalidate_skill_areas([instance.skill_area_id])
@@ -1,3 +1,268 @@
-from django.test import TestCase
+import io
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import include, path
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+from rest_framework.routers import DefaultRouter
+from rest_framework.test import APIClient
+from fme.authentication import CachedTokenAuthentication
+from fme.models.user import User
+from fme.models.learner import LearnerProfile
+from fme.models.analytics import LearnerDailyStat
+from fme.models.skill_area import SkillArea, SkillAreaModule
+from fme.helpers.delta import changed_since
+from fme.helpers.learner_import import import_learners
+from fme.helpers.metrics import DashboardMetrics
+from fme.helpers.time_series import date_histogram
+from fme.helpers.presence import presence_index
+from fme.helpers.view_cache import get_cache, generation_key
+from fme.serializers.export_job import CreateExportJobSerializer
+from fme.serializers.skill_area import SkillAreaListSerializer
+from fme.views.dashboard.skill_area import SkillAreaViewSet
 
-# Create your tests here.
+
+# the skill area views are not in fme.urls yet, route the viewset for the tests that call it
+skill_area_router = DefaultRouter()
+skill_area_router.register('skill_areas', SkillAreaViewSet, basename='skill_area')
+urlpatterns = [path('', include(skill_area_router.urls))]
+
+
+def create_learner(email, progress=0, **profile):
+    user = User.objects.create(email=email, username=email, role=User.Role.LEARNER, status=User.Status.ACTIVE)
+    return LearnerProfile.objects.create(
+        user=user, progress=progress, **{
+            'account_type': LearnerProfile.AccountType.STUDENT, 'learning_track': 'Data Science',
+            'skill_cluster': 'Data', 'work_type': LearnerProfile.WorkType.REMOTE,
+            'industrial_prefrence': 'Tech', 'state': 'LAGOS', 'gender': LearnerProfile.Gender.FEMALE,
+            **profile
+        }
+    )
+
+
+class LearnerDailyStatTests(TestCase):
+
+    def test_deleting_a_learner_created_after_refresh(self):
+        create_learner('a@example.com', progress=0)
+        LearnerDailyStat.refresh(full=True)
+        late = create_learner('b@example.com', progress=100)
+        late.user.delete()
+
+        LearnerDailyStat.refresh()
+        self.assertEqual(LearnerDailyStat.totals(), {'count': 1, 'completed': 0, 'avg_progress': 0})
+
+    def test_deleted_learner_day_is_rebuilt(self):
+        create_learner('a@example.com', progress=100)
+        removed = create_learner('b@example.com', progress=50)
+        LearnerDailyStat.refresh(full=True)
+        removed.user.delete()
+
+        self.assertEqual(LearnerDailyStat.refresh(), 1)
+        self.assertEqual(LearnerDailyStat.totals(), {'count': 1, 'completed': 1, 'avg_progress': 100})
+
+
+    def test_learner_committed_late_is_picked_up(self):
+        LearnerDailyStat.refresh(full=True)
+        # updated before the last refresh started, but committed after it read
+        late = create_learner('late@example.com', progress=100)
+        LearnerProfile.objects.filter(pk=late.pk).update(updated_at=timezone.now() - timedelta(seconds=5))
+
+        LearnerDailyStat.refresh()
+        self.assertEqual(LearnerDailyStat.totals()['count'], 1)
+
+    def test_refresh_invalidates_cached_views(self):
+        generation = get_cache().get(generation_key(LearnerDailyStat))
+        LearnerDailyStat.refresh(full=True)
+        self.assertNotEqual(get_cache().get(generation_key(LearnerDailyStat)), generation)
+
+
+class DateHistogramTests(TestCase):
+
+    def test_empty_range(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(date_histogram(LearnerProfile.objects.all(), periods=0), [])
+            self.assertEqual(date_histogram(
+                LearnerProfile.objects.all(), start=timezone.now(), end=timezone.now() - timedelta(days=90)
+            ), [])
+
+
+class CreateExportJobSerializerTests(TestCase):
+
+    def test_invalid_change_token_is_rejected(self):
+        serializer = CreateExportJobSerializer(data={'kind': 'full_data', 'change_token': 'garbage!!'})
+        self.assertFalse(serializer.is_valid())
+
+    def test_since_is_kept_in_params(self):
+        serializer = CreateExportJobSerializer(data={'kind': 'full_data', 'since': '2030-01-01'})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['params']['since'], '2030-01-01')
+
+
+class ChangedSinceTests(TestCase):
+
+    def test_profile_or_user_change(self):
+        profiles = [create_learner(f'learner{index}@example.com') for index in range(3)]
+        old = timezone.now() - timedelta(days=3)
+        User.objects.update(updated_at=old)
+        LearnerProfile.objects.update(updated_at=old)
+        User.objects.filter(pk=profiles[0].user_id).update(updated_at=timezone.now())
+        LearnerProfile.objects.filter(pk=profiles[2].pk).update(updated_at=timezone.now())
+
+        changed = changed_since(LearnerProfile.objects.select_related('user').order_by('created_at'), timezone.now() - timedelta(days=1))
+        self.assertEqual([profile.pk for profile in changed], [profiles[0].pk, profiles[2].pk])
+
+
+class ImportLearnersTests(TestCase):
+    HEADER = (
+        'first_name,last_name,email,phone_number,account_type,learning_track,skill_cluster,'
+        'work_type,industrial_prefrence,state,gender,password\n'
+    )
+
+    def test_only_valid_rows_are_hashed(self):
+        rows = (
+            'Ada,L,ada@example.com,08012345678,STUDENT,Data,Data,REMOTE,Tech,LAGOS,FEMALE,first-secret\n'
+            'Bad,L,bad@example.com,08012345678,STUDENT,Data,Data,REMOTE,Tech,NOWHERE,FEMALE,second-secret\n'
+        )
+        hashed = []
+
+        def make_many(passwords):
+            hashed.extend(passwords)
+            return [make_password(password) for password in passwords]
+
+        report = import_learners(io.BytesIO((self.HEADER + rows).encode()), 'learners.csv', make_many=make_many)
+        self.assertEqual((report['created'], report['failed']), (1, 1))
+        self.assertEqual(hashed, ['first-secret'])
+        self.assertTrue(User.objects.get(email='ada@example.com').check_password('first-secret'))
+
+
+class CursorPaginationTests(TestCase):
+
+    def setUp(self):
+        admin = User.objects.create(email='admin@example.com', username='admin@example.com', role=User.Role.ADMIN)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        now = timezone.now()
+        for index, last_active in enumerate([now, None, now - timedelta(days=1), None]):
+            learner = create_learner(f'learner{index}@example.com')
+            User.objects.filter(pk=learner.user_id).update(last_active=last_active)
+
+    def walk(self, url, link):
+        emails = []
+        while url:
+            data = self.client.get(url).json()['data']
+            emails.append([row['user']['email'] for row in data['entity']])
+            url = data['links'][link]
+        return emails
+
+    def test_nullable_sort_key(self):
+        pages = self.walk(
+            '/api/dashboard/search_learners?sort_by=last_active&pagination=cursor&page_size=1', 'next'
+        )
+        emails = [page[0] for page in pages]
+        self.assertEqual(emails[:2], ['learner0@example.com', 'learner2@example.com'])
+        self.assertEqual(sorted(emails[2:]), ['learner1@example.com', 'learner3@example.com'])
+
+        last_page = self.client.get(
+            '/api/dashboard/search_learners?sort_by=last_active&pagination=cursor&page_size=1'
+        ).json()['data']
+        for _ in range(3):
+            last_page = self.client.get(last_page['links']['next']).json()['data']
+        backwards = [page[0] for page in self.walk(last_page['links']['previous'], 'previous')]
+        self.assertEqual(backwards, list(reversed(emails[:3])))
+
+
+class DashboardMetricsQueryTests(TestCase):
+    # one aggregate per model, plus three presence bucket reads (30 days, 15 minutes, today)
+    USER_COUNT_QUERIES = 4
+
+    def setUp(self):
+        # presence counts are memoised per process, start every test cold
+        presence_index._counts.clear()
+        self.admin = User.objects.create(email='admin@example.com', username='admin@example.com', role=User.Role.ADMIN)
+        for index, state in enumerate(['LAGOS', 'ABIA', 'LAGOS', 'KANO']):
+            create_learner(f'learner{index}@example.com', progress=index * 30, state=state)
+
+    def test_counts_query_count(self):
+        metrics = DashboardMetrics(period='month', state='LAGOS')
+        with self.assertNumQueries(self.USER_COUNT_QUERIES):
+            metrics.user_counts()
+        with self.assertNumQueries(1):
+            metrics.learner_counts()
+        with self.assertNumQueries(0):
+            metrics.user_counts()
+            metrics.learner_counts()
+
+    def test_platform_overview_query_count(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        # the bypass header makes the view compute instead of answering from the view cache
+        with self.assertNumQueries(self.USER_COUNT_QUERIES + 1):
+            resp = client.get('/api/dashboard/platform_overview?period=week', HTTP_X_CACHE_BYPASS='1')
+        self.assertEqual(resp.status_code, 200)
+
+        for index in range(5):
+            create_learner(f'more{index}@example.com', state='ABIA')
+        presence_index._counts.clear()
+        with self.assertNumQueries(self.USER_COUNT_QUERIES + 1):
+            client.get('/api/dashboard/platform_overview?period=week&state=ABIA', HTTP_X_CACHE_BYPASS='1')
+
+
+@override_settings(ROOT_URLCONF='fme.tests')
+class SkillAreaListQueryTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create(email='admin@example.com', username='admin@example.com', role=User.Role.ADMIN)
+        for index in range(6):
+            skill_area = SkillArea.objects.create(name=f'Track {index}', description='d', created_by=self.admin)
+            for order in range(index % 3):
+                SkillAreaModule.objects.create(
+                    skill_area=skill_area, name=f'Module {order}', description='d', order=order,
+                    level=SkillAreaModule.Level.BEGINNER, learning_objectives='o',
+                    status=SkillAreaModule.Status.ACTIVE if order else SkillAreaModule.Status.DRAFT,
+                )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def list_page(self, page_size):
+        resp = self.client.get('/skill_areas/', {'page_size': page_size, 'ordering': 'name'})
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()['data']['entity']
+
+    def test_same_queries_regardless_of_page_size(self):
+        # the page count and the page itself, module counts and created_by come with the page
+        with self.assertNumQueries(2):
+            self.list_page(2)
+        with self.assertNumQueries(2):
+            self.list_page(6)
+
+    def test_counts(self):
+        rows = self.list_page(3)
+        self.assertEqual(
+            [(row['name'], row['modules_count'], row['active_modules_count']) for row in rows],
+            [('Track 0', 0, 0), ('Track 1', 1, 0), ('Track 2', 2, 1)]
+        )
+        self.assertEqual(rows[0]['created_by']['email'], 'admin@example.com')
+
+    def test_counts_without_annotations(self):
+        # nested use: the serializer falls back to counting the modules itself
+        skill_area = SkillArea.objects.get(name='Track 2')
+        data = SkillAreaListSerializer(skill_area).data
+        self.assertEqual((data['modules_count'], data['active_modules_count']), (2, 1))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+
+    def test_saved_status_change_drops_the_cached_user(self):
+        user = User.objects.create(email='a@example.com', username='a@example.com', role=User.Role.ADMIN, status=User.Status.ACTIVE)
+        token = Token.objects.create(user=user)
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+        with self.assertNumQueries(0):
+            authentication.authenticate_credentials(token.key)
+
+        user.status = User.Status.DISABLED
+        user.save()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            authentication.authenticate_credentials(token.key)
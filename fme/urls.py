@@ -1,6 +1,6 @@
 from django.urls import path, include
 from fme.views.learner import onbaording
-from fme.views.dashboard import administrator, learner, authentication
+from fme.views.dashboard import administrator, learner, authentication, export_job
 
 # dashboard_url = [
 #     # authentication
@@ -41,14 +41,19 @@ dashboard_url = [
     
     # Learner Management
     path('list_learner', learner.ListLearnerView.as_view(), name='list_learner'),
+    path('search_learners', learner.LearnerSearchView.as_view(), name='search_learners'),
     path('learner_analytics', learner.LearnerAnalyticsView.as_view(), name='learner_analytics'),
     path('export_learners', learner.ExportLearnersView.as_view(), name='export_learners'),
+    path('import_learners', learner.ImportLearnersView.as_view(), name='import_learners'),
     path('learner_bulk_operation', administrator.LearnerBulkOperationView.as_view(), name='learner_bulk_operation'),
     path('learner_detail/<uuid:learner_id>', learner.LearnerDetailView.as_view(), name='learner_detail'),
     
     # Reports & Export
     path('generate_report', administrator.GenerateReportView.as_view(), name='generate_report'),
     path('data_export', administrator.DataExportView.as_view(), name='data_export'),
+    path('export_jobs', export_job.ExportJobView.as_view(), name='export_jobs'),
+    path('export_job/<uuid:job_id>', export_job.ExportJobDetailView.as_view(), name='export_job_detail'),
+    path('export_job/<uuid:job_id>/download', export_job.ExportJobDownloadView.as_view(), name='export_job_download'),
     
     # System Administration
     path('activity_log', administrator.ActivityLogView.as_view(), name='activity_log'),
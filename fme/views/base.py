@@ -3,7 +3,8 @@ from rest_framework import views
 # from fme.permissions import RestrictedLoginPermission
 from rest_framework.permissions import IsAuthenticated #, IsAdminUser,
 from rest_framework.permissions import AllowAny
-from fme.helpers.request_utils import make_request_for_resp_status, make_request_for_usable_resp
+from fme.helpers.request_utils import make_request_for_usable_resp
+from fme.helpers.sms import send_sms, otp_message
 
 class BaseView(views.APIView):
     permission_class= (AllowAny)
@@ -22,22 +23,7 @@ class BaseView(views.APIView):
         return (resp, err_msg)
 
     def make_sms_request(self, url, phone_number, token):
-        err_msg = None
-        msg = f"Thanks for taking interest in Digital Training Academy, to proceed use this verification code {token}"
-        payload = {
-            "to":phone_number,
-            "from": settings.TERMII_SMS_SENDER_ID,
-            "sms": msg,
-            "type": "plain",
-            "channel":settings.TERMII_SMS_CHANNEL,
-            "api_key": settings.TERMII_SMS_API_KEY
-        }
-        options = {'method':'post'}
-        resp_data, resp_status = make_request_for_resp_status(url, payload, options)
-        if resp_status != 200:
-            err_msg = "Unable to send sms token"
-            print('*** Something is wrong with sms request: ****', resp_data)
-        return (resp_data, err_msg)
+        return send_sms(url, phone_number, otp_message(token))
 
 class BaseAuthenticationView(views.APIView):
     permission_classes = (IsAuthenticated,)
@@ -1,23 +1,41 @@
 from response import response
 from fme.models.user import User
-from fme.helpers import swagger_data
+from fme.helpers import swagger_data, options
 from drf_yasg.utils import swagger_auto_schema
 from fme.views.base import BaseAuthorizationView
+from fme.authentication import token_user_cache
+from fme.helpers.metrics import DashboardMetrics
+from fme.helpers.presence import presence_index
+from fme.helpers.password_hashing import hashing_pool
+from fme.helpers.request_utils import http_client
+from fme.helpers.view_cache import cached_response, invalidate_model
+from fme.helpers.skill_area_analytics import invalidate_skill_areas
+from fme.helpers.activity_log import log_activity
+from fme.helpers.pagination import PaginationHandlerMixin
+from fme.helpers.export import (
+    Column, Section, stream_csv, stream_export, export_format_error, choice_label, date_label, percent_label,
+    full_name, EXPORT_FORMATS
+)
+from fme.helpers.export_jobs import learners_report, full_platform_data
+from fme.helpers.delta import resolve_watermark, changed_since, next_change_token, InvalidWatermark
+from fme.serializers.export_job import CreateExportJobSerializer, ExportJobSerializer
 from fme.serializers.authentication import UserStatusSerializer
+from fme.serializers.dashboard import ActivityLogFilterSerializer, ActivityLogSerializer
 
 from fme.models.learner import LearnerProfile
 from fme.models.mentor import MentorProfile
-from fme.models.facilitator import FacilitatorProfile
+from fme.models.skill_area import SkillArea
 from fme.models.invitation import Invitation
-from fme.helpers import swagger_data
-from django.db.models import Count, Q, Avg, F
+from fme.models.analytics import LearnerDailyStat
+from fme.models.export_job import ExportJob
+from fme.models.tombstone import Tombstone
+from fme.models.activity_log import ActivityLog
+from django.db.models import Count, Sum
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework import serializers
-from django.http import HttpResponse
 from django.core.mail import send_mail
 from django.conf import settings
-import csv
 # import json
 
 # class ChangeUserStatusView(BaseAuthorizationView):
@@ -90,6 +108,10 @@ class InviteUserView(BaseAuthorizationView):
             
             # Send invitation email
             invitation.send_invitation_email()
+            log_activity(
+                ActivityLog.Action.INVITE, request, target=email, target_id=invitation.id,
+                details=f'Invited {email} as {role}', role=role
+            )
             
             return response({
                 'status': 200,
@@ -120,10 +142,21 @@ class GenerateReportView(BaseAuthorizationView):
         format_type = request.data.get('format', 'csv')
         date_from = request.data.get('date_from')
         date_to = request.data.get('date_to')
+        # delta report: only rows changed after `since` or a previous change_token
+        delta = {'since': request.data.get('since'), 'change_token': request.data.get('change_token')}
+        is_async = str(request.data.get('async', '')).lower() in ('1', 'true', 'yes')
+        log_activity(
+            ActivityLog.Action.EXPORT, request, target=f'{report_type} report',
+            details=f'Generated {report_type} report ({format_type})',
+            format=format_type, date_from=date_from, date_to=date_to, delta=bool(any(delta.values())), background=is_async
+        )
+        
+        if is_async:
+            return self._queue_report(request, report_type, format_type, date_from, date_to, delta)
         
         try:
             if report_type == 'learners':
-                return self._generate_learners_report(format_type, date_from, date_to)
+                return self._generate_learners_report(format_type, date_from, date_to, delta)
             elif report_type == 'analytics':
                 return self._generate_analytics_report(format_type, date_from, date_to)
             elif report_type == 'mentors':
@@ -134,43 +167,50 @@ class GenerateReportView(BaseAuthorizationView):
         except Exception as e:
             return response({'status': 400, 'message': f'Report generation failed: {str(e)}'})
     
-    def _generate_learners_report(self, format_type, date_from, date_to):
+    def _queue_report(self, request, report_type, format_type, date_from, date_to, delta):
+        """Run the report in the export worker instead of this request"""
+        if report_type != 'learners':
+            return response({'status': 400, 'message': 'Only the learners report can run in the background'})
+        format_error = export_format_error(format_type)
+        if format_error:
+            return response({'status': 400, 'message': format_error})
+        try:
+            resolve_watermark(delta)
+        except InvalidWatermark as e:
+            return response({'status': 400, 'message': str(e)})
+        job = ExportJob.enqueue(
+            'learners_report',
+            {'date_from': date_from, 'date_to': date_to, 'format': format_type, **delta},
+            request.user
+        )
+        return response({'status': 202, 'data': ExportJobSerializer(job, context={'request': request}).data})
+    
+    def _generate_learners_report(self, format_type, date_from, date_to, delta):
         """Generate learners report"""
-        queryset = LearnerProfile.objects.select_related('user').all()
+        change_token = next_change_token()
+        if format_type in EXPORT_FORMATS:
+            format_error = export_format_error(format_type)
+            if format_error:
+                return response({'status': 400, 'message': format_error})
+            response_obj = stream_export(
+                *learners_report({'date_from': date_from, 'date_to': date_to, **delta}), format_type
+            )
+            response_obj['X-Change-Token'] = change_token
+            return response_obj
+        
+        watermark = resolve_watermark(delta)
+        queryset = changed_since(LearnerProfile.objects.select_related('user').all(), watermark)
         
         if date_from:
             queryset = queryset.filter(created_at__gte=date_from)
         if date_to:
             queryset = queryset.filter(created_at__lte=date_to)
         
-        if format_type == 'csv':
-            response_obj = HttpResponse(content_type='text/csv')
-            response_obj['Content-Disposition'] = 'attachment; filename="learners_report.csv"'
-            
-            writer = csv.writer(response_obj)
-            writer.writerow([
-                'Name', 'Email', 'State', 'Learning Track', 'Progress',
-                'Registration Date', 'Last Active', 'Status'
-            ])
-            
-            for learner in queryset:
-                writer.writerow([
-                    f"{learner.user.first_name} {learner.user.last_name}",
-                    learner.user.email,
-                    learner.get_state_display(),
-                    learner.learning_track,
-                    f"{learner.progress}%",
-                    learner.created_at.strftime('%Y-%m-%d'),
-                    learner.user.last_active.strftime('%Y-%m-%d') if learner.user.last_active else 'Never',
-                    learner.user.get_status_display()
-                ])
-            
-            return response_obj
-        
         # For non-CSV formats, return JSON data
         data = []
         for learner in queryset:
             data.append({
+                'id': str(learner.user_id),
                 'name': f"{learner.user.first_name} {learner.user.last_name}",
                 'email': learner.user.email,
                 'state': learner.get_state_display(),
@@ -181,7 +221,13 @@ class GenerateReportView(BaseAuthorizationView):
                 'status': learner.user.get_status_display()
             })
         
-        return response({'status': 200, 'data': {'report': data, 'total_records': len(data)}})
+        report = {'report': data, 'total_records': len(data), 'change_token': change_token}
+        if watermark:
+            report['deleted'] = [
+                str(object_id) for object_id in
+                Tombstone.since('learners', watermark).values_list('object_id', flat=True)
+            ]
+        return response({'status': 200, 'data': report})
     
     def _generate_analytics_report(self, format_type, date_from, date_to):
         """Generate analytics report"""
@@ -193,30 +239,20 @@ class GenerateReportView(BaseAuthorizationView):
         if not date_to:
             date_to = now
         
+        stats_qs = LearnerDailyStat.objects.filter(day__range=[date_from, date_to])
+        totals = LearnerDailyStat.totals(stats_qs)
         analytics = {
             'period': f"{date_from} to {date_to}",
-            'total_learners': LearnerProfile.objects.filter(
-                created_at__range=[date_from, date_to]
-            ).count(),
-            'completion_rate': LearnerProfile.objects.filter(
-                created_at__range=[date_from, date_to]
-            ).aggregate(
-                avg_progress=Avg('progress')
-            )['avg_progress'] or 0,
-            'state_distribution': list(
-                LearnerProfile.objects.filter(
-                    created_at__range=[date_from, date_to]
-                ).values('state').annotate(
-                    count=Count('id')
-                ).order_by('-count')[:10]
-            ),
-            'track_distribution': list(
-                LearnerProfile.objects.filter(
-                    created_at__range=[date_from, date_to]
-                ).values('learning_track').annotate(
-                    count=Count('id')
-                ).order_by('-count')
-            )
+            'total_learners': totals['count'],
+            'completion_rate': totals['avg_progress'],
+            'state_distribution': [
+                {'state': row['state'], 'count': row['count']}
+                for row in LearnerDailyStat.distribution('state', stats_qs)[:10]
+            ],
+            'track_distribution': [
+                {'learning_track': row['learning_track'], 'count': row['count']}
+                for row in LearnerDailyStat.distribution('learning_track', stats_qs)
+            ]
         }
         
         return response({'status': 200, 'data': analytics})
@@ -259,13 +295,28 @@ class LearnerBulkOperationView(BaseAuthorizationView):
         
         if not learner_ids or not operation:
             return response({'status': 400, 'message': 'learner_ids and operation are required'})
+        log_activity(
+            ActivityLog.Action.EXPORT if operation == 'export' else ActivityLog.Action.BULK_ACTION, request,
+            target=f'{len(learner_ids)} learners', details=f'Learner bulk operation: {operation}',
+            operation=operation, learner_ids=[str(learner_id) for learner_id in learner_ids]
+        )
         
         try:
             if operation == 'update_progress':
                 progress = operation_data.get('progress', 0)
-                updated = LearnerProfile.objects.filter(
-                    user__id__in=learner_ids
-                ).update(progress=progress)
+                learners = LearnerProfile.objects.filter(user__id__in=learner_ids)
+                # update() sends no signals, move the skill area counters here
+                skill_areas = list(learners.filter(skill_area__isnull=False).values('skill_area_id').annotate(
+                    count=Count('id'), progress_sum=Sum('progress')
+                ).order_by())
+                # queryset.update() skips auto_now, bump updated_at for the stats watermark
+                updated = learners.update(progress=progress, updated_at=timezone.now())
+                for row in skill_areas:
+                    SkillArea.apply_learner_delta(
+                        row['skill_area_id'], 0, row['count'] * int(progress) - (row['progress_sum'] or 0)
+                    )
+                invalidate_model(LearnerProfile)
+                invalidate_skill_areas(row['skill_area_id'] for row in skill_areas)
                 
                 return response({
                     'status': 200,
@@ -313,32 +364,18 @@ class LearnerBulkOperationView(BaseAuthorizationView):
             
             elif operation == 'export':
                 # Generate CSV export for selected learners
-                learners = LearnerProfile.objects.filter(
-                    user__id__in=learner_ids
-                ).select_related('user')
-                
-                response_obj = HttpResponse(content_type='text/csv')
-                response_obj['Content-Disposition'] = 'attachment; filename="selected_learners.csv"'
-                
-                writer = csv.writer(response_obj)
-                writer.writerow([
-                    'Name', 'Email', 'Phone', 'State', 'Learning Track',
-                    'Progress', 'Registration Date', 'Last Active'
-                ])
-                
-                for learner in learners:
-                    writer.writerow([
-                        f"{learner.user.first_name} {learner.user.last_name}",
-                        learner.user.email,
-                        learner.user.phone_number,
-                        learner.get_state_display(),
-                        learner.learning_track,
-                        f"{learner.progress}%",
-                        learner.created_at.strftime('%Y-%m-%d'),
-                        learner.user.last_active.strftime('%Y-%m-%d %H:%M') if learner.user.last_active else 'Never'
-                    ])
+                learners = LearnerProfile.objects.filter(user__id__in=learner_ids)
                 
-                return response_obj
+                return stream_csv('selected_learners.csv', [Section(learners, [
+                    Column('Name', 'user__first_name', 'user__last_name', format=full_name()),
+                    Column('Email', 'user__email'),
+                    Column('Phone', 'user__phone_number'),
+                    Column('State', 'state', format=choice_label(options.STATE)),
+                    Column('Learning Track', 'learning_track'),
+                    Column('Progress', 'progress', format=percent_label()),
+                    Column('Registration Date', 'created_at', format=date_label('%Y-%m-%d')),
+                    Column('Last Active', 'user__last_active', format=date_label('%Y-%m-%d %H:%M', 'Never')),
+                ])])
             
             else:
                 return response({'status': 400, 'message': 'Invalid operation'})
@@ -347,59 +384,40 @@ class LearnerBulkOperationView(BaseAuthorizationView):
             return response({'status': 400, 'message': f'Bulk operation failed: {str(e)}'})
 
 
-class ActivityLogView(BaseAuthorizationView):
+class ActivityLogView(BaseAuthorizationView, PaginationHandlerMixin):
     """
-    View system activity logs
+    View system activity logs (newest first, keyset paginated)
     """
+    cursor_mode = True
+    cursor_ordering = ('-timestamp', '-id')
     
     @swagger_auto_schema(
+        query_serializer=ActivityLogFilterSerializer,
         responses=swagger_data.doc_response('empty', 'ActivityLog')
     )
     def get(self, request):
         if request.user.role != User.Role.ADMIN:
             return response({'status': 403, 'message': 'Unauthorized access'})
         
-        # This is a placeholder for activity logging
-        # You would typically have an ActivityLog model
-        now = timezone.now()
+        filters = ActivityLogFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        params = filters.validated_data
+        self.page_size = params['page_size']
         
-        # Mock activity data
-        activities = [
-            {
-                'id': 1,
-                'user': 'admin@example.com',
-                'action': 'User status changed',
-                'target': 'john.doe@example.com',
-                'timestamp': (now - timedelta(minutes=5)).isoformat(),
-                'details': 'Changed status from DISABLED to ACTIVE'
-            },
-            {
-                'id': 2,
-                'user': 'admin@example.com',
-                'action': 'Bulk user operation',
-                'target': '15 users',
-                'timestamp': (now - timedelta(minutes=15)).isoformat(),
-                'details': 'Activated 15 users'
-            },
-            {
-                'id': 3,
-                'user': 'system',
-                'action': 'Report generated',
-                'target': 'learners_report.csv',
-                'timestamp': (now - timedelta(hours=1)).isoformat(),
-                'details': 'Generated learners report with 1,250 records'
-            }
-        ]
+        # filters follow the (user, action_type, timestamp) index; the date range prunes partitions
+        log_qs = ActivityLog.objects.select_related('user')
+        if params.get('user_id'):
+            log_qs = log_qs.filter(user_id=params['user_id'])
+        if params.get('action_type'):
+            log_qs = log_qs.filter(action_type=params['action_type'])
+        if params.get('date_from'):
+            log_qs = log_qs.filter(timestamp__gte=params['date_from'])
+        if params.get('date_to'):
+            log_qs = log_qs.filter(timestamp__lte=params['date_to'])
         
-        return response({
-            'status': 200,
-            'data': {
-                'activities': activities,
-                'total': len(activities),
-                'page': 1,
-                'page_size': 20
-            }
-        })
+        activities = self.paginate_queryset(log_qs, request, view=self)
+        data = ActivityLogSerializer(activities, many=True).data
+        return response({'status': 200, 'data': self.get_paginated_response(data)})
 
 
 class NotificationView(BaseAuthorizationView):
@@ -510,27 +528,22 @@ class AdvancedAnalyticsView(BaseAuthorizationView):
     @swagger_auto_schema(
         responses=swagger_data.doc_response('empty', 'Analytics')
     )
+    @cached_response('advanced_analytics', depends_on=[User, LearnerProfile], roles=[User.Role.ADMIN])
     def get(self, request):
         if request.user.role != User.Role.ADMIN:
             return response({'status': 403, 'message': 'Unauthorized access'})
         
         now = timezone.now()
         last_30_days = now - timedelta(days=30)
-        last_7_days = now - timedelta(days=7)
         
         # Advanced analytics calculations
         analytics = {
             'engagement_metrics': {
-                'daily_active_users': User.objects.filter(
-                    last_active__gte=now - timedelta(days=1)
-                ).count(),
-                'weekly_active_users': User.objects.filter(
-                    last_active__gte=last_7_days
-                ).count(),
-                'monthly_active_users': User.objects.filter(
-                    last_active__gte=last_30_days
-                ).count(),
-                'user_retention_rate': 78.5  # Placeholder calculation
+                'daily_active_users': presence_index.active_count(timedelta(days=1), now),
+                'weekly_active_users': presence_index.active_count(timedelta(days=7), now),
+                'monthly_active_users': presence_index.active_count(timedelta(days=30), now),
+                # users active in the previous 30 days who came back in the last 30
+                'user_retention_rate': presence_index.retention_rate(30, now)
             },
             'learning_metrics': {
                 'average_completion_time': 45.2,  # days
@@ -583,101 +596,67 @@ class DataExportView(BaseAuthorizationView):
         
         export_type = request.GET.get('type', 'full')
         format_type = request.GET.get('format', 'csv')
+        # delta export: only rows changed after `since` or a previous change_token
+        delta = {'since': request.GET.get('since'), 'change_token': request.GET.get('change_token')}
+        try:
+            resolve_watermark(delta)
+        except InvalidWatermark as e:
+            return response({'status': 400, 'message': str(e)})
+        is_async = request.GET.get('async', '').lower() in ('1', 'true', 'yes')
+        log_activity(
+            ActivityLog.Action.EXPORT, request, target=f'{export_type} data',
+            details=f'Exported {export_type} platform data ({format_type})',
+            format=format_type, delta=bool(any(delta.values())), background=is_async
+        )
+        
+        if export_type == 'full' and is_async:
+            serializer = CreateExportJobSerializer(data={
+                'kind': 'full_data', 'format': format_type,
+                **{key: value for key, value in request.GET.items() if key in ('workers', 'shard_by', *delta)}
+            })
+            serializer.is_valid(raise_exception=True)
+            job = ExportJob.enqueue(user=request.user, **serializer.validated_data)
+            return response({'status': 202, 'data': ExportJobSerializer(job, context={'request': request}).data})
         
         if export_type == 'full':
-            return self._export_full_data(format_type)
+            return self._export_full_data(format_type, delta)
         elif export_type == 'analytics':
             return self._export_analytics_data(format_type)
         else:
             return response({'status': 400, 'message': 'Invalid export type'})
     
-    def _export_full_data(self, format_type):
+    def _export_full_data(self, format_type, delta):
         """Export comprehensive platform data"""
-        if format_type != 'csv':
-            return response({'status': 400, 'message': 'Only CSV format supported for full export'})
-        
-        response_obj = HttpResponse(content_type='text/csv')
-        response_obj['Content-Disposition'] = 'attachment; filename="full_platform_data.csv"'
-        
-        writer = csv.writer(response_obj)
-        
-        # Write learners data
-        writer.writerow(['=== LEARNERS DATA ==='])
-        writer.writerow([
-            'ID', 'Name', 'Email', 'Phone', 'State', 'Gender',
-            'Learning Track', 'Progress', 'Registration Date', 'Last Active'
-        ])
-        
-        learners = LearnerProfile.objects.select_related('user').all()
-        for learner in learners:
-            writer.writerow([
-                str(learner.user.id),
-                f"{learner.user.first_name} {learner.user.last_name}",
-                learner.user.email,
-                learner.user.phone_number or '',
-                learner.get_state_display(),
-                learner.get_gender_display(),
-                learner.learning_track,
-                learner.progress,
-                learner.created_at.strftime('%Y-%m-%d'),
-                learner.user.last_active.strftime('%Y-%m-%d %H:%M') if learner.user.last_active else 'Never'
-            ])
-        
-        writer.writerow([])  # Empty row
-        writer.writerow(['=== MENTORS DATA ==='])
-        writer.writerow([
-            'ID', 'Name', 'Email', 'Specialization', 'Current Mentees',
-            'Total Mentees', 'Rating', 'Join Date'
-        ])
-        
-        mentors = MentorProfile.objects.select_related('user').all()
-        for mentor in mentors:
-            writer.writerow([
-                str(mentor.user.id),
-                f"{mentor.user.first_name} {mentor.user.last_name}",
-                mentor.user.email,
-                mentor.specialization,
-                mentor.current_mentees_count,
-                mentor.overall_mentees_count,
-                float(mentor.rating),
-                mentor.created_at.strftime('%Y-%m-%d')
-            ])
+        format_error = export_format_error(format_type)
+        if format_error:
+            return response({'status': 400, 'message': format_error})
         
+        change_token = next_change_token()
+        response_obj = stream_export(*full_platform_data(delta), format_type)
+        response_obj['X-Change-Token'] = change_token
         return response_obj
     
     def _export_analytics_data(self, format_type):
         """Export analytics data"""
         # Implementation for analytics export
+        metrics = DashboardMetrics()
+        user_counts = metrics.user_counts()
+        learner_counts = metrics.learner_counts()
         analytics_data = {
-            'export_date': timezone.now().isoformat(),
-            'total_users': User.objects.count(),
-            'total_learners': LearnerProfile.objects.count(),
+            'export_date': metrics.now.isoformat(),
+            'total_users': user_counts['total'],
+            'total_learners': learner_counts['total'],
             'total_mentors': MentorProfile.objects.count(),
             'completion_stats': {
-                'completed': LearnerProfile.objects.filter(progress=100).count(),
-                'in_progress': LearnerProfile.objects.filter(progress__gt=0, progress__lt=100).count(),
-                'not_started': LearnerProfile.objects.filter(progress=0).count()
+                'completed': learner_counts['certified'],
+                'in_progress': learner_counts['in_progress'],
+                'not_started': learner_counts['not_started']
             }
         }
         
         return response({'status': 200, 'data': analytics_data})
     
 
-from response import response
-from fme.models.user import User
-from fme.models.learner import LearnerProfile
-from fme.models.mentor import MentorProfile
-from fme.models.facilitator import FacilitatorProfile
-from fme.helpers import swagger_data
-from drf_yasg.utils import swagger_auto_schema
-from fme.views.base import BaseAuthorizationView
-from fme.serializers.authentication import UserStatusSerializer
-from django.db.models import Count, Q, Avg
-from django.utils import timezone
-from datetime import timedelta
-from rest_framework import serializers
-
-
 class DashboardMetricsSerializer(serializers.Serializer):
     """Serializer for dashboard metrics query parameters"""
     period = serializers.ChoiceField(
@@ -698,6 +677,7 @@ class PlatformOverviewView(BaseAuthorizationView):
         query_serializer=DashboardMetricsSerializer,
         responses=swagger_data.doc_response('empty', 'Dashboard')
     )
+    @cached_response('platform_overview', depends_on=[User, LearnerProfile], roles=[User.Role.ADMIN])
     def get(self, request):
         if request.user.role != User.Role.ADMIN:
             return response({'status': 403, 'message': 'Unauthorized access'})
@@ -706,63 +686,37 @@ class PlatformOverviewView(BaseAuthorizationView):
         period = request.GET.get('period', 'month')
         state_filter = request.GET.get('state')
         
-        # Calculate date ranges
-        now = timezone.now()
-        if period == 'week':
-            start_date = now - timedelta(days=7)
-        elif period == 'month':
-            start_date = now - timedelta(days=30)
-        elif period == 'quarter':
-            start_date = now - timedelta(days=90)
-        else:  # year
-            start_date = now - timedelta(days=365)
-        
-        # Base querysets
-        users_qs = User.objects.all()
-        learners_qs = LearnerProfile.objects.select_related('user')
-        
-        if state_filter:
-            learners_qs = learners_qs.filter(state=state_filter)
+        # One conditional aggregate per model instead of a COUNT(*) per metric
+        metrics = DashboardMetrics(period=period, state=state_filter)
+        user_counts = metrics.user_counts()
+        learner_counts = metrics.learner_counts()
         
         # Total learners
-        total_learners = learners_qs.count()
-        learners_growth = learners_qs.filter(
-            created_at__gte=start_date
-        ).count()
-        learners_growth_percentage = (learners_growth / max(total_learners, 1)) * 100
+        total_learners = learner_counts['total']
+        learners_growth = learner_counts['new_in_period']
+        learners_growth_percentage = metrics.percentage(learners_growth, total_learners)
         
         # Active users (logged in within last 30 days)
-        active_users_count = users_qs.filter(
-            last_active__gte=now - timedelta(days=30)
-        ).count()
+        active_users_count = user_counts['active_30d']
         
         # New registrations
-        new_registrations = users_qs.filter(
-            created_at__gte=start_date,
-            role=User.Role.LEARNER
-        ).count()
+        new_registrations = user_counts['new_learners']
         
         # Completion rate (assuming you have a completion tracking)
         # For now, using progress > 80 as completed
-        completed_learners = learners_qs.filter(progress__gte=80).count()
-        completion_rate = (completed_learners / max(total_learners, 1)) * 100
+        completion_rate = metrics.percentage(learner_counts['completed'], total_learners)
         
         # System health metrics
-        total_users = users_qs.count()
-        active_percentage = (active_users_count / max(total_users, 1)) * 100
+        active_percentage = metrics.percentage(active_users_count, user_counts['total'])
         
         # Support tickets (placeholder - you'll need to implement actual support ticket model)
         pending_tickets = 17  # Placeholder
         
         # Certificates issued (placeholder)
-        certificates_issued = learners_qs.filter(progress=100).count()
+        certificates_issued = learner_counts['certified']
         
         # Dropout rate calculation
-        inactive_learners = learners_qs.filter(
-            user__last_active__lt=now - timedelta(days=60),
-            progress__lt=20
-        ).count()
-        dropout_rate = (inactive_learners / max(total_learners, 1)) * 100
+        dropout_rate = metrics.percentage(learner_counts['dropout'], total_learners)
         
         data = {
             'platform_overview': {
@@ -774,17 +728,12 @@ class PlatformOverviewView(BaseAuthorizationView):
                 'active_users': {
                     'count': active_users_count,
                     'percentage': round(active_percentage, 1),
-                    'currently_online': users_qs.filter(
-                        last_active__gte=now - timedelta(minutes=15)
-                    ).count()
+                    'currently_online': user_counts['online_15m']
                 },
                 'new_registrations': {
                     'count': new_registrations,
                     'this_period': period,
-                    'pending_approval': users_qs.filter(
-                        status=User.Status.DISABLED,
-                        created_at__gte=start_date
-                    ).count()
+                    'pending_approval': user_counts['pending_approval']
                 },
                 'completion_rate': {
                     'percentage': round(completion_rate, 1),
@@ -814,19 +763,16 @@ class ScholarshipDistributionView(BaseAuthorizationView):
     @swagger_auto_schema(
         responses=swagger_data.doc_response('empty', 'Scholarship')
     )
+    @cached_response('scholarship_distribution', depends_on=[LearnerProfile, LearnerDailyStat], roles=[User.Role.ADMIN])
     def get(self, request):
         if request.user.role != User.Role.ADMIN:
             return response({'status': 403, 'message': 'Unauthorized access'})
         
-        # Get learner distribution by state
-        state_distribution = LearnerProfile.objects.values('state').annotate(
-            student_count=Count('id'),
-            avg_performance=Avg('progress'),
-            certification_count=Count('id', filter=Q(progress=100))
-        ).order_by('-student_count')
+        # Get learner distribution by state from the daily rollup
+        state_distribution = LearnerDailyStat.distribution('state')
         
         # Calculate totals
-        total_students = LearnerProfile.objects.count()
+        total_students = sum(item['count'] for item in state_distribution)
         
         # Format data for frontend
         distribution_data = []
@@ -838,10 +784,10 @@ class ScholarshipDistributionView(BaseAuthorizationView):
             distribution_data.append({
                 'state': item['state'],
                 'state_name': state_name,
-                'student_count': item['student_count'],
-                'percentage': round((item['student_count'] / max(total_students, 1)) * 100, 1),
-                'avg_performance': round(item['avg_performance'] or 0, 1),
-                'certification_count': item['certification_count'],
+                'student_count': item['count'],
+                'percentage': round((item['count'] / max(total_students, 1)) * 100, 1),
+                'avg_performance': round(item['avg_progress'], 1),
+                'certification_count': item['completed'],
                 'dropout_rate': 4.2  # Placeholder - calculate based on your dropout logic
             })
         
@@ -873,36 +819,31 @@ class UserManagementView(BaseAuthorizationView):
     @swagger_auto_schema(
         responses=swagger_data.doc_response('empty', 'Users')
     )
+    @cached_response('user_management', depends_on=[User], roles=[User.Role.ADMIN])
     def get(self, request):
         if request.user.role != User.Role.ADMIN:
             return response({'status': 403, 'message': 'Unauthorized access'})
         
-        # Get user statistics
-        now = timezone.now()
+        # Get user statistics in a single aggregate query
+        counts = DashboardMetrics().user_counts()
         
         user_stats = {
-            'total_users': User.objects.count(),
+            'total_users': counts['total'],
             'by_role': {
-                'learners': User.objects.filter(role=User.Role.LEARNER).count(),
-                'mentors': User.objects.filter(role=User.Role.MENTOR).count(),
-                'facilitators': User.objects.filter(role=User.Role.FACILITATOR).count(),
-                'admins': User.objects.filter(role=User.Role.ADMIN).count()
+                'learners': counts['learners'],
+                'mentors': counts['mentors'],
+                'facilitators': counts['facilitators'],
+                'admins': counts['admins']
             },
             'by_status': {
-                'active': User.objects.filter(status=User.Status.ACTIVE).count(),
-                'inactive': User.objects.filter(status=User.Status.INACTIVE).count(),
-                'disabled': User.objects.filter(status=User.Status.DISABLED).count()
+                'active': counts['active'],
+                'inactive': counts['inactive'],
+                'disabled': counts['disabled']
             },
             'recent_activities': {
-                'new_registrations_today': User.objects.filter(
-                    created_at__date=now.date()
-                ).count(),
-                'active_today': User.objects.filter(
-                    last_active__date=now.date()
-                ).count(),
-                'pending_approvals': User.objects.filter(
-                    status=User.Status.DISABLED
-                ).count()
+                'new_registrations_today': counts['new_today'],
+                'active_today': counts['active_today'],
+                'pending_approvals': counts['disabled']
             }
         }
         
@@ -943,6 +884,13 @@ class BulkUserActionView(BaseAuthorizationView):
                 )
             else:
                 return response({'status': 400, 'message': 'Invalid action'})
+            token_user_cache.invalidate_users(user_ids)
+            invalidate_model(User)
+            log_activity(
+                ActivityLog.Action.BULK_ACTION, request, target=f'{updated} users',
+                details=f'Bulk {action} of {updated} users', reason=request.data.get('reason', ''),
+                operation=action, user_ids=[str(user_id) for user_id in user_ids]
+            )
             
             return response({
                 'status': 200,
@@ -980,13 +928,13 @@ class ChangeUserStatusView(BaseAuthorizationView):
                 # Update user status
                 user.status = serializer.validated_data['status']
                 user.save(update_fields=['status'])
+                token_user_cache.invalidate_users([user.id])
                 
-                # Log the status change (you can implement audit logging)
-                # AuditLog.objects.create(
-                #     admin_user=request.user,
-                #     target_user=user,
-                #     action=f'Status changed from {old_status} to {user.status}'
-                # )
+                log_activity(
+                    ActivityLog.Action.STATUS_CHANGE, request, target=user.email, target_id=user.id,
+                    details=f'Status changed from {old_status} to {user.status}',
+                    old_status=old_status, new_status=user.status
+                )
                 
                 return response({
                     'status': 200, 
@@ -1017,9 +965,9 @@ class SystemHealthView(BaseAuthorizationView):
         
         health_metrics = {
             'database_status': 'healthy',  # You can implement actual DB health check
-            'active_sessions': User.objects.filter(
-                last_active__gte=now - timedelta(minutes=30)
-            ).count(),
+            'active_sessions': presence_index.active_count(timedelta(minutes=30), now),
+            'password_hashing': hashing_pool.snapshot(),
+            'third_party': http_client.status(),
             'error_rate': 0.5,  # Placeholder - implement from your logging system
             'response_time_avg': 120,  # milliseconds - from your monitoring
             'uptime': '99.9%',  # From your infrastructure monitoring
@@ -2,6 +2,10 @@ from response import response
 from fme.models.user import User
 from rest_framework import views
 from fme.helpers import swagger_data
+from fme.authentication import token_user_cache
+from fme.helpers.password_hashing import HashingBusy
+from fme.helpers.activity_log import log_activity
+from fme.models.activity_log import ActivityLog
 from drf_yasg.utils import swagger_auto_schema
 from fme.views.base import BaseAuthorizationView
 from rest_framework.authtoken.models import Token
@@ -20,7 +24,10 @@ class LoginView(views.APIView):
         resp, message = ({}, None)
         serializer = AuthenticateSerialize(data=request.data)
         if serializer.is_valid(raise_exception=True):
-            user = authenticate(**serializer.data)
+            try:
+                user = authenticate(request, **serializer.data)
+            except HashingBusy as e:
+                return response({'status':503, 'message':str(e)})
             if user:
                 is_active = user.status != User.Status.DISABLED
                 message = message if is_active else 'This account has been disabled.'
@@ -29,8 +36,14 @@ class LoginView(views.APIView):
                     serialized = UserSerializer(user)
                     token, _ = Token.objects.get_or_create(user=user)
                     resp = {'status':200, 'data':{'token':token.key, **serialized.data}}
+                    log_activity(ActivityLog.Action.LOGIN, request, user=user, target=user.email, target_id=user.id)
             else: message = 'Invalid email/password combination.'
-            if message: resp = {'status':401, 'message':message}
+            if message:
+                resp = {'status':401, 'message':message}
+                log_activity(
+                    ActivityLog.Action.LOGIN_FAILED, request, user=user,
+                    target=serializer.data.get('email', ''), details=message
+                )
         return response(resp)
 
 class LogoutView(BaseAuthorizationView):
@@ -39,8 +52,11 @@ class LogoutView(BaseAuthorizationView):
         responses=swagger_data.doc_response('empty', 'User')
     )
     def post(self, request):
+        if request.auth is not None:
+            token_user_cache.invalidate_key(request.auth.key)
         try:
             request.user.auth_token.delete()
         except (AttributeError, ObjectDoesNotExist):pass
+        log_activity(ActivityLog.Action.LOGOUT, request, target=request.user.email, target_id=request.user.id)
         logout(request)
         return response({'status':200, 'message':'User successfully logout'})
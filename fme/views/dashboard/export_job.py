@@ -0,0 +1,91 @@
+from response import response
+from django.conf import settings
+from django.http import HttpResponseRedirect
+from fme.helpers import swagger_data
+from fme.models.user import User
+from fme.models.export_job import ExportJob
+from drf_yasg.utils import swagger_auto_schema
+from fme.views.base import BaseAuthorizationView
+from fme.helpers.export import ranged_file_response
+from fme.helpers.activity_log import log_activity
+from fme.models.activity_log import ActivityLog
+from fme.helpers.upload import export_download_url
+from fme.helpers.pagination import PaginationHandlerMixin
+from fme.serializers.base import PaginationParamSerializer
+from fme.serializers.export_job import CreateExportJobSerializer, ExportJobSerializer
+
+
+class ExportJobView(BaseAuthorizationView, PaginationHandlerMixin):
+    """
+        Queue a background export (POST) or list your export jobs (GET)
+    """
+    @swagger_auto_schema(
+        request_body=CreateExportJobSerializer,
+        responses=swagger_data.doc_response('empty', 'ExportJob')
+    )
+    def post(self, request):
+        if request.user.role != User.Role.ADMIN:
+            return response({'status': 403, 'message': 'Unauthorized access'})
+        serializer = CreateExportJobSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = ExportJob.enqueue(user=request.user, **serializer.validated_data)
+        log_activity(
+            ActivityLog.Action.EXPORT, request, target=job.kind, target_id=job.id,
+            details=f'Queued {job.kind} export ({job.params.get("format", "csv")})', background=True
+        )
+        return response({'status': 202, 'data': ExportJobSerializer(job, context={'request': request}).data})
+
+    @swagger_auto_schema(
+        query_serializer=PaginationParamSerializer,
+        responses=swagger_data.doc_response('empty', 'ExportJob')
+    )
+    def get(self, request):
+        if request.user.role != User.Role.ADMIN:
+            return response({'status': 403, 'message': 'Unauthorized access'})
+        parsed_params = PaginationParamSerializer(data=request.query_params)
+        parsed_params.is_valid(raise_exception=True)
+        self.page_size = parsed_params.data.get('page_size', settings.DEFAULT_PAGINATION_SIZE)
+        job_qs = ExportJob.objects.filter(requested_by=request.user).order_by('-created_at')
+        paginate_qs = self.paginate_queryset(job_qs, request, view=self)
+        data = ExportJobSerializer(paginate_qs, many=True, context={'request': request}).data
+        return response({'status': 200, 'data': self.get_paginated_response(data)})
+
+
+class ExportJobDetailView(BaseAuthorizationView):
+    """
+        Poll the status and progress of an export job
+    """
+    @swagger_auto_schema(
+        responses=swagger_data.doc_response('empty', 'ExportJob')
+    )
+    def get(self, request, job_id):
+        job = ExportJob.objects.filter(id=job_id, requested_by=request.user).first()
+        if not job:
+            return response({'status': 404, 'message': 'Export job not found'})
+        return response({'status': 200, 'data': ExportJobSerializer(job, context={'request': request}).data})
+
+
+class ExportJobDownloadView(BaseAuthorizationView):
+    """
+        Download a finished export. Range requests are honoured so interrupted downloads can resume.
+    """
+    def get(self, request, job_id):
+        job = ExportJob.objects.filter(id=job_id, requested_by=request.user).first()
+        if not job:
+            return response({'status': 404, 'message': 'Export job not found'})
+        if not job.is_downloadable:
+            return response({'status': 409, 'message': f'Export is not ready ({job.get_status_display()})'})
+        if not request.META.get('HTTP_RANGE'):
+            # resumed downloads are logged once, on the first request
+            log_activity(ActivityLog.Action.EXPORT_DOWNLOAD, request, target=job.file_name, target_id=job.id)
+
+        if job.storage == ExportJob.Storage.S3:
+            return HttpResponseRedirect(export_download_url(job.file_path, job.file_name))
+        return ranged_file_response(
+            job.file_path,
+            job.file_name,
+            job.content_type,
+            range_header=request.META.get('HTTP_RANGE'),
+            if_range=request.META.get('HTTP_IF_RANGE'),
+            etag=f'"{job.id}-{job.file_size}"'
+        )
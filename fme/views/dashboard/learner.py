@@ -1,19 +1,30 @@
 from response import response
 from django.conf import settings
-from fme.helpers import swagger_data
+from fme.helpers import swagger_data, options
+from fme.models.user import User
 from fme.models.learner import LearnerProfile
+from fme.models.analytics import LearnerDailyStat
 from drf_yasg.utils import swagger_auto_schema
 from fme.views.base import BaseAuthenticationView
+from fme.helpers.metrics import DashboardMetrics
+from fme.helpers.view_cache import cached_response, invalidate_model
+from fme.helpers.activity_log import log_activity
+from fme.models.activity_log import ActivityLog
+from fme.helpers.time_series import date_histogram
+from fme.helpers.export import Column, Section, stream_export, export_format_error, choice_label, date_label
+from fme.helpers.delta import resolve_watermark, changed_since, next_change_token, tombstone_section, InvalidWatermark
 from fme.helpers.pagination import PaginationHandlerMixin
 from fme.serializers.base import PaginationParamSerializer
-from fme.serializers.learner import LearnerProfileSerializer
-from django.db.models import Count, Avg, Q
+from fme.serializers.learner import LearnerProfileSerializer, LearnerImportSerializer
+from fme.serializers.dashboard import LearnerSearchSerializer
+from fme.helpers.search import search_learners
+from fme.helpers.learner_import import import_learners, import_format_error, ImportFileError
+from fme.helpers.password_hashing import hashing_pool, HashingBusy
+from django.db.models import Sum
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework import serializers
-from django.http import HttpResponse
-import csv
-from io import StringIO
+from rest_framework.parsers import MultiPartParser, FormParser
 
 class ListLearnerView(BaseAuthenticationView, PaginationHandlerMixin):
     """
@@ -47,6 +58,7 @@ class LearnerFilterSerializer(serializers.Serializer):
         required=False
     )
     learning_track = serializers.CharField(max_length=100, required=False)
+    skill_area = serializers.UUIDField(required=False, help_text="Exact skill area (indexed), prefer over learning_track")
     work_type = serializers.ChoiceField(
         choices=LearnerProfile.WorkType.choices,
         required=False
@@ -65,6 +77,7 @@ class ListLearnerView(BaseAuthenticationView, PaginationHandlerMixin):
     """
     Enhanced endpoint to get paginated list of learner profiles with filtering
     """
+    count_strategy = 'estimated'
     
     @swagger_auto_schema(
         query_serializer=PaginationParamSerializer,
@@ -92,6 +105,8 @@ class ListLearnerView(BaseAuthenticationView, PaginationHandlerMixin):
         
         if filters.get('learning_track'):
             learner_qs = learner_qs.filter(learning_track__icontains=filters['learning_track'])
+        if filters.get('skill_area'):
+            learner_qs = learner_qs.filter(skill_area_id=filters['skill_area'])
         
         if filters.get('work_type'):
             learner_qs = learner_qs.filter(work_type=filters['work_type'])
@@ -125,6 +140,69 @@ class ListLearnerView(BaseAuthenticationView, PaginationHandlerMixin):
         return response({"status": 400, "message": "Record not found"})
 
 
+class LearnerSearchView(BaseAuthenticationView, PaginationHandlerMixin):
+    """
+    Ranked learner search by name, email or phone number (see fme.helpers.search)
+    """
+    count_strategy = 'estimated'
+    REGISTRATION_PERIODS = {'last_week': 7, 'last_month': 30, 'last_quarter': 90, 'last_year': 365}
+    SORT_FIELDS = {
+        'name': ('user__first_name', 'user__last_name'),
+        'progress': ('progress',),
+        'registration_date': ('created_at',),
+        'last_active': ('user__last_active',),
+    }
+
+    @swagger_auto_schema(
+        query_serializer=LearnerSearchSerializer,
+        responses=swagger_data.doc_response('list_learner_data', 'LearnerProfile')
+    )
+    def get(self, request):
+        parsed_params = PaginationParamSerializer(data=request.query_params)
+        parsed_params.is_valid(raise_exception=True)
+        parsed_params = parsed_params.data
+
+        search_serializer = LearnerSearchSerializer(data=request.query_params)
+        search_serializer.is_valid(raise_exception=True)
+        filters = search_serializer.validated_data
+
+        learner_qs = LearnerProfile.objects.select_related('user').all()
+
+        if filters.get('state'):
+            learner_qs = learner_qs.filter(state=filters['state'])
+
+        if filters.get('learning_track'):
+            learner_qs = learner_qs.filter(learning_track__icontains=filters['learning_track'])
+
+        if filters.get('status'):
+            learner_qs = learner_qs.filter(user__status=filters['status'])
+
+        if filters.get('progress_range'):
+            learner_qs = learner_qs.filter(progress__range=filters['progress_range'])
+
+        if filters.get('registration_period'):
+            days = self.REGISTRATION_PERIODS[filters['registration_period']]
+            learner_qs = learner_qs.filter(created_at__gte=timezone.now() - timedelta(days=days))
+
+        if filters.get('query'):
+            learner_qs = search_learners(learner_qs, filters['query'])
+
+        # relevance keeps the ranking search_learners applied
+        if filters['sort_by'] != 'relevance' or not filters.get('query'):
+            sign = '-' if filters['sort_order'] == 'desc' else ''
+            fields = self.SORT_FIELDS.get(filters['sort_by'], self.SORT_FIELDS['registration_date'])
+            learner_qs = learner_qs.order_by(*[f'{sign}{field}' for field in fields])
+
+        self.page_size = parsed_params.get('page_size', settings.DEFAULT_PAGINATION_SIZE)
+        paginate_qs = self.paginate_queryset(learner_qs, request, view=self)
+        learner_serializer = LearnerProfileSerializer(paginate_qs, many=True).data
+
+        return response({
+            "status": 200,
+            "data": self.get_paginated_response(learner_serializer)
+        })
+
+
 class LearnerAnalyticsView(BaseAuthenticationView):
     """
     Comprehensive learner analytics for dashboard
@@ -133,68 +211,52 @@ class LearnerAnalyticsView(BaseAuthenticationView):
     @swagger_auto_schema(
         responses=swagger_data.doc_response('empty', 'LearnerAnalytics')
     )
+    @cached_response('learner_analytics', depends_on=[LearnerProfile, User, LearnerDailyStat])
     def get(self, request):
         now = timezone.now()
         
-        # Basic counts
-        total_learners = LearnerProfile.objects.count()
-        active_learners = LearnerProfile.objects.filter(
-            user__last_active__gte=now - timedelta(days=30)
-        ).count()
+        # Basic counts and progress buckets in a single aggregate query
+        learner_counts = DashboardMetrics(now=now).learner_counts()
+        total_learners = learner_counts['total']
+        active_learners = learner_counts['active_30d']
         
         # Progress analytics
         progress_distribution = {
-            'beginner': LearnerProfile.objects.filter(progress__lt=25).count(),
-            'intermediate': LearnerProfile.objects.filter(
-                progress__gte=25, progress__lt=75
-            ).count(),
-            'advanced': LearnerProfile.objects.filter(progress__gte=75).count(),
-            'completed': LearnerProfile.objects.filter(progress=100).count(),
+            'beginner': learner_counts['beginner'],
+            'intermediate': learner_counts['intermediate'],
+            'advanced': learner_counts['advanced'],
+            'completed': learner_counts['certified'],
         }
         
-        # Demographics
-        gender_distribution = LearnerProfile.objects.values('gender').annotate(
-            count=Count('id')
-        )
+        # Demographics (read from the daily rollup instead of the learner table)
+        def rollup_distribution(dimension, *extra):
+            return [
+                {key: row[key] for key in (dimension, 'count', *extra)}
+                for row in LearnerDailyStat.distribution(dimension)
+            ]
+        
+        gender_distribution = rollup_distribution('gender')
         
-        state_distribution = LearnerProfile.objects.values('state').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]  # Top 10 states
+        state_distribution = rollup_distribution('state')[:10]  # Top 10 states
         
         # Learning tracks
-        track_distribution = LearnerProfile.objects.values('learning_track').annotate(
-            count=Count('id'),
-            avg_progress=Avg('progress')
-        ).order_by('-count')
+        track_distribution = rollup_distribution('learning_track', 'avg_progress')
         
         # Work type preferences
-        work_type_distribution = LearnerProfile.objects.values('work_type').annotate(
-            count=Count('id')
-        )
+        work_type_distribution = rollup_distribution('work_type')
         
         # Account type distribution
-        account_type_distribution = LearnerProfile.objects.values('account_type').annotate(
-            count=Count('id')
-        )
+        account_type_distribution = rollup_distribution('account_type')
         
-        # Monthly registration trend (last 12 months)
-        monthly_registrations = []
-        for i in range(12):
-            month_start = now - timedelta(days=30 * (i + 1))
-            month_end = now - timedelta(days=30 * i)
-            count = LearnerProfile.objects.filter(
-                created_at__gte=month_start,
-                created_at__lt=month_end
-            ).count()
-            monthly_registrations.append({
-                'month': month_start.strftime('%Y-%m'),
-                'count': count
-            })
+        # Monthly registration trend (last 12 months) in one grouped query
+        monthly_registrations = date_histogram(
+            LearnerDailyStat.objects.all(), date_field='day', periods=12, end=now,
+            value=Sum('learner_count'), label_key='month',
+            breakdown='learning_track' if request.query_params.get('by_track') else None
+        )
         
         # Performance metrics
-        avg_progress = LearnerProfile.objects.aggregate(
-            avg=Avg('progress')
-        )['avg'] or 0
+        avg_progress = learner_counts['avg_progress'] or 0
         
         completion_rate = (progress_distribution['completed'] / max(total_learners, 1)) * 100
         
@@ -214,7 +276,7 @@ class LearnerAnalyticsView(BaseAuthenticationView):
             },
             'learning_tracks': list(track_distribution),
             'trends': {
-                'monthly_registrations': monthly_registrations[::-1]  # Reverse for chronological order
+                'monthly_registrations': monthly_registrations
             }
         }
         
@@ -223,7 +285,7 @@ class LearnerAnalyticsView(BaseAuthenticationView):
 
 class ExportLearnersView(BaseAuthenticationView):
     """
-    Export learners data to CSV
+    Export learners data (format=csv, csv.gz, jsonl.gz or parquet)
     """
     
     def get(self, request):
@@ -231,9 +293,23 @@ class ExportLearnersView(BaseAuthenticationView):
         filter_serializer = LearnerFilterSerializer(data=request.query_params)
         filter_serializer.is_valid(raise_exception=True)
         filters = filter_serializer.validated_data
+        format_type = request.query_params.get('format', 'csv')
+        format_error = export_format_error(format_type)
+        if format_error:
+            return response({'status': 400, 'message': format_error})
+        # delta export: only rows changed after `since` or a previous change_token
+        change_token = next_change_token()
+        try:
+            watermark = resolve_watermark(request.query_params)
+        except InvalidWatermark as e:
+            return response({'status': 400, 'message': str(e)})
+        log_activity(
+            ActivityLog.Action.EXPORT, request, target='learners', details=f'Exported learners ({format_type})',
+            format=format_type, filters={key: str(value) for key, value in filters.items()}, delta=watermark is not None
+        )
         
         # Build queryset with filters (same logic as ListLearnerView)
-        learner_qs = LearnerProfile.objects.select_related('user').all()
+        learner_qs = changed_since(LearnerProfile.objects.all(), watermark)
         
         # Apply the same filters as in ListLearnerView
         if filters.get('state'):
@@ -242,6 +318,8 @@ class ExportLearnersView(BaseAuthenticationView):
             learner_qs = learner_qs.filter(account_type=filters['account_type'])
         if filters.get('learning_track'):
             learner_qs = learner_qs.filter(learning_track__icontains=filters['learning_track'])
+        if filters.get('skill_area'):
+            learner_qs = learner_qs.filter(skill_area_id=filters['skill_area'])
         if filters.get('work_type'):
             learner_qs = learner_qs.filter(work_type=filters['work_type'])
         if filters.get('gender'):
@@ -255,44 +333,69 @@ class ExportLearnersView(BaseAuthenticationView):
         if filters.get('date_to'):
             learner_qs = learner_qs.filter(created_at__date__lte=filters['date_to'])
         
-        # Create CSV response
-        response_obj = HttpResponse(content_type='text/csv')
-        response_obj['Content-Disposition'] = 'attachment; filename="learners_export.csv"'
-        
-        writer = csv.writer(response_obj)
-        
-        # Write header
-        writer.writerow([
-            'ID', 'First Name', 'Last Name', 'Email', 'Phone', 'State',
-            'Gender', 'Account Type', 'Learning Track', 'Skill Cluster',
-            'Work Type', 'Industrial Preference', 'Progress (%)', 
-            'Registration Date', 'Last Active', 'Status'
-        ])
-        
-        # Write data rows
-        for learner in learner_qs:
-            writer.writerow([
-                str(learner.user.id),
-                learner.user.first_name,
-                learner.user.last_name,
-                learner.user.email,
-                learner.user.phone_number,
-                learner.get_state_display(),
-                learner.get_gender_display(),
-                learner.get_account_type_display(),
-                learner.learning_track,
-                learner.skill_cluster,
-                learner.get_work_type_display(),
-                learner.industrial_prefrence,
-                learner.progress,
-                learner.created_at.strftime('%Y-%m-%d'),
-                learner.user.last_active.strftime('%Y-%m-%d %H:%M') if learner.user.last_active else '',
-                learner.user.get_status_display()
-            ])
-        
+        # Stream the CSV straight from a server-side cursor
+        columns = [
+            Column('ID', 'user__id', format=str),
+            Column('First Name', 'user__first_name'),
+            Column('Last Name', 'user__last_name'),
+            Column('Email', 'user__email'),
+            Column('Phone', 'user__phone_number'),
+            Column('State', 'state', format=choice_label(options.STATE)),
+            Column('Gender', 'gender', format=choice_label(LearnerProfile.Gender.choices)),
+            Column('Account Type', 'account_type', format=choice_label(LearnerProfile.AccountType.choices)),
+            Column('Learning Track', 'learning_track'),
+            Column('Skill Cluster', 'skill_cluster'),
+            Column('Work Type', 'work_type', format=choice_label(LearnerProfile.WorkType.choices)),
+            Column('Industrial Preference', 'industrial_prefrence'),
+            Column('Progress (%)', 'progress'),
+            Column('Registration Date', 'created_at', format=date_label('%Y-%m-%d')),
+            Column('Last Active', 'user__last_active', format=date_label('%Y-%m-%d %H:%M')),
+            Column('Status', 'user__status', format=choice_label(User.Status.choices)),
+        ]
+        sections = [Section(learner_qs, columns, name='learners')]
+        if watermark:
+            sections.append(tombstone_section('learners', watermark))
+        response_obj = stream_export('learners_export', sections, format_type)
+        response_obj['X-Change-Token'] = change_token
         return response_obj
 
 
+class ImportLearnersView(BaseAuthenticationView):
+    """
+    Import learners from a CSV or XLSX file (admin only). Valid rows are created,
+    invalid ones are returned in `errors` with their spreadsheet row number.
+    """
+    parser_classes = (MultiPartParser, FormParser)
+
+    @swagger_auto_schema(request_body=LearnerImportSerializer)
+    def post(self, request):
+        if request.user.role != User.Role.ADMIN:
+            return response({'status': 403, 'message': 'Unauthorized access'})
+        serializer = LearnerImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data['file']
+        dry_run = serializer.validated_data['dry_run']
+        format_error = import_format_error(upload.name)
+        if format_error:
+            return response({'status': 400, 'message': format_error})
+        try:
+            # no forking inside the web worker, hash on the bounded spawned pool the logins use
+            report = import_learners(upload, upload.name, dry_run=dry_run, make_many=hashing_pool.make_many)
+        except ImportFileError as e:
+            return response({'status': 400, 'message': str(e)})
+        except HashingBusy as e:
+            return response({'status': 503, 'message': str(e)})
+        if report['created']:
+            invalidate_model(User)
+            invalidate_model(LearnerProfile)
+        log_activity(
+            ActivityLog.Action.BULK_ACTION, request, target=f"{report['created']} learners",
+            details=f'Imported learners from {upload.name}', operation='import', file_name=upload.name,
+            dry_run=dry_run, total_rows=report['total_rows'], failed=report['failed']
+        )
+        return response({'status': 200, 'data': report})
+
+
 class LearnerDetailView(BaseAuthenticationView):
     """
     Get detailed information about a specific learner
@@ -1,7 +1,6 @@
 from response import response
 from django.conf import settings
-from django.db.models import Q, Count, Avg, F,Sum
-from django.utils import timezone
+from django.db.models import Avg, Sum
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.viewsets import ModelViewSet
@@ -10,28 +9,35 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from fme.helpers import swagger_data
 from fme.helpers.pagination import PaginationHandlerMixin
+from fme.helpers.time_series import date_histogram
+from fme.helpers.search import search_skill_areas
+from fme.helpers.view_cache import cached_response, invalidate_model
+from fme.helpers.activity_log import log_activity
+from fme.models.activity_log import ActivityLog
+from fme.helpers.export import Column, Section, stream_csv, choice_label, date_label, full_name
 from fme.views.base import BaseAuthorizationView
 from fme.models.skill_area import (
     SkillArea, SkillAreaModule, LearnerSkillAreaProgress,
-    LearnerModuleProgress, SkillAreaAssessment
+    LearnerModuleProgress
 )
 from fme.models.user import User
+from fme.models.analytics import LearnerDailyStat
 from fme.serializers.skill_area import (
     SkillAreaListSerializer, SkillAreaDetailSerializer,
     SkillAreaCreateUpdateSerializer, SkillAreaModuleSerializer,
     LearnerSkillAreaProgressSerializer, LearnerModuleProgressSerializer,
-    SkillAreaAssessmentSerializer, SkillAreaFilterSerializer,
+    SkillAreaFilterSerializer,
     SkillAreaStatsSerializer, BulkSkillAreaActionSerializer
 )
 from fme.serializers.base import PaginationParamSerializer
 
 
-class SkillAreaViewSet(ModelViewSet, BaseAuthorizationView, PaginationHandlerMixin):
+class SkillAreaViewSet(PaginationHandlerMixin, ModelViewSet, BaseAuthorizationView):
     """
     ViewSet for managing skill areas
     Supports CRUD operations, filtering, and analytics
     """
-    queryset = SkillArea.objects.all().prefetch_related('modules', 'created_by')
+    queryset = SkillArea.objects.all().select_related('created_by').prefetch_related('modules')
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -41,6 +47,11 @@ class SkillAreaViewSet(ModelViewSet, BaseAuthorizationView, PaginationHandlerMix
         else:
             return SkillAreaCreateUpdateSerializer
     
+    @staticmethod
+    def write_context(request):
+        """ create/update responses leave analytics out with ?include_analytics=false """
+        return {'include_analytics': request.query_params.get('include_analytics', 'true').lower() not in ('false', '0')}
+    
     def get_queryset(self):
         queryset = super().get_queryset()
         
@@ -57,11 +68,7 @@ class SkillAreaViewSet(ModelViewSet, BaseAuthorizationView, PaginationHandlerMix
             queryset = queryset.filter(target_audience=target_audience)
         
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(description__icontains=search) |
-                Q(learning_objectives__icontains=search)
-            )
+            queryset = search_skill_areas(queryset, search)
         
         if created_by:
             queryset = queryset.filter(created_by_id=created_by)
@@ -75,9 +82,15 @@ class SkillAreaViewSet(ModelViewSet, BaseAuthorizationView, PaginationHandlerMix
         if max_rate:
             queryset = queryset.filter(avg_completion_rate__lte=max_rate)
         
-        # Ordering
-        ordering = self.request.query_params.get('ordering', '-created_at')
-        queryset = queryset.order_by(ordering)
+        if self.action == 'list':
+            # counts in the page query instead of two count queries per skill area (after the
+            # filters, so a join added by one cannot multiply the counts)
+            queryset = SkillArea.with_module_counts(queryset.prefetch_related(None))
+        
+        # Ordering (a search is ranked by relevance unless an ordering is given)
+        ordering = self.request.query_params.get('ordering')
+        if ordering or not search:
+            queryset = queryset.order_by(ordering or '-created_at')
         
         return queryset
     
@@ -125,7 +138,7 @@ class SkillAreaViewSet(ModelViewSet, BaseAuthorizationView, PaginationHandlerMix
             skill_area = serializer.save()
             return response({
                 'status': 201,
-                'data': SkillAreaDetailSerializer(skill_area).data,
+                'data': SkillAreaDetailSerializer(skill_area, context=self.write_context(request)).data,
                 'message': 'Skill area created successfully'
             })
         return response({'status': 400, 'message': 'Validation error', 'errors': serializer.errors})
@@ -146,7 +159,7 @@ class SkillAreaViewSet(ModelViewSet, BaseAuthorizationView, PaginationHandlerMix
                 skill_area = serializer.save()
                 return response({
                     'status': 200,
-                    'data': SkillAreaDetailSerializer(skill_area).data,
+                    'data': SkillAreaDetailSerializer(skill_area, context=self.write_context(request)).data,
                     'message': 'Skill area updated successfully'
                 })
             return response({'status': 400, 'message': 'Validation error', 'errors': serializer.errors})
@@ -213,39 +226,23 @@ class SkillAreaViewSet(ModelViewSet, BaseAuthorizationView, PaginationHandlerMix
         try:
             skill_area = self.get_object()
             
-            # Get learner enrollment by month
-            from fme.models.learner import LearnerProfile
-            from datetime import timedelta
-            
-            now = timezone.now()
-            monthly_data = []
+            track_stats = LearnerDailyStat.objects.filter(learning_track=skill_area.name)
             
-            for i in range(12):
-                month_start = now - timedelta(days=30 * (i + 1))
-                month_end = now - timedelta(days=30 * i)
-                
-                enrollments = LearnerProfile.objects.filter(
-                    learning_track=skill_area.name,
-                    created_at__gte=month_start,
-                    created_at__lt=month_end
-                ).count()
-                
-                monthly_data.append({
-                    'month': month_start.strftime('%Y-%m'),
-                    'enrollments': enrollments
-                })
+            # Get learner enrollment by month in one grouped query
+            monthly_data = date_histogram(
+                track_stats, date_field='day', periods=12, value=Sum('learner_count'),
+                label_key='month', value_key='enrollments'
+            )
             
-            # Performance by state
-            state_performance = LearnerProfile.objects.filter(
-                learning_track=skill_area.name
-            ).values('state').annotate(
-                learner_count=Count('id'),
-                avg_progress=Avg('progress')
-            ).order_by('-learner_count')[:10]
+            # Performance and demographics from the daily rollup
+            state_performance = [
+                {'state': row['state'], 'learner_count': row['count'], 'avg_progress': row['avg_progress']}
+                for row in LearnerDailyStat.distribution('state', track_stats)[:10]
+            ]
             
             analytics_data = {
-                'enrollment_trend': monthly_data[::-1],
-                'state_performance': list(state_performance),
+                'enrollment_trend': monthly_data,
+                'state_performance': state_performance,
                 'module_completion_rates': [
                     {
                         'module_name': module.name,
@@ -253,14 +250,14 @@ class SkillAreaViewSet(ModelViewSet, BaseAuthorizationView, PaginationHandlerMix
                     } for module in skill_area.modules.all()
                 ],
                 'learner_demographics': {
-                    'by_account_type': list(
-                        LearnerProfile.objects.filter(learning_track=skill_area.name)
-                        .values('account_type').annotate(count=Count('id'))
-                    ),
-                    'by_work_type': list(
-                        LearnerProfile.objects.filter(learning_track=skill_area.name)
-                        .values('work_type').annotate(count=Count('id'))
-                    )
+                    'by_account_type': [
+                        {'account_type': row['account_type'], 'count': row['count']}
+                        for row in LearnerDailyStat.distribution('account_type', track_stats)
+                    ],
+                    'by_work_type': [
+                        {'work_type': row['work_type'], 'count': row['count']}
+                        for row in LearnerDailyStat.distribution('work_type', track_stats)
+                    ]
                 }
             }
             
@@ -278,6 +275,7 @@ class SkillAreaStatsView(BaseAuthorizationView):
     @swagger_auto_schema(
         responses=swagger_data.doc_response('empty', 'SkillAreaStats')
     )
+    @cached_response('skill_area_stats', depends_on=[SkillArea])
     def get(self, request):
         """Get overall skill area statistics"""
         
@@ -470,6 +468,8 @@ class BulkSkillAreaActionView(BaseAuthorizationView):
                     skill_areas.delete()
                 else:
                     return response({'status': 400, 'message': 'Invalid action'})
+                # queryset.update() sends no post_save
+                invalidate_model(SkillArea)
                 
                 return response({
                     'status': 200,
@@ -537,35 +537,15 @@ class SkillAreaExportView(BaseAuthorizationView):
     
     def get(self, request):
         """Export skill areas data to CSV"""
-        import csv
-        from django.http import HttpResponse
-        
-        response_obj = HttpResponse(content_type='text/csv')
-        response_obj['Content-Disposition'] = 'attachment; filename="skill_areas_export.csv"'
-        
-        writer = csv.writer(response_obj)
-        
-        # Write header
-        writer.writerow([
-            'Name', 'Status', 'Target Audience', 'Total Enrolled',
-            'Completion Rate (%)', 'Total Modules', 'Duration (weeks)',
-            'Created Date', 'Created By'
-        ])
-        
-        # Write data
-        skill_areas = SkillArea.objects.select_related('created_by').all()
-        
-        for area in skill_areas:
-            writer.writerow([
-                area.name,
-                area.get_status_display(),
-                area.get_target_audience_display(),
-                area.total_enrolled,
-                float(area.avg_completion_rate),
-                area.total_modules,
-                area.estimated_duration_weeks,
-                area.created_at.strftime('%Y-%m-%d'),
-                area.created_by.get_full_name() if area.created_by else 'System'
-            ])
-        
-        return response_obj
\ No newline at end of file
+        log_activity(ActivityLog.Action.EXPORT, request, target='skill areas', details='Exported skill areas (csv)')
+        return stream_csv('skill_areas_export.csv', [Section(SkillArea.objects.all(), [
+            Column('Name', 'name'),
+            Column('Status', 'status', format=choice_label(SkillArea.Status.choices)),
+            Column('Target Audience', 'target_audience', format=choice_label(SkillArea.TargetAudience.choices)),
+            Column('Total Enrolled', 'total_enrolled'),
+            Column('Completion Rate (%)', 'avg_completion_rate', format=float),
+            Column('Total Modules', 'total_modules'),
+            Column('Duration (weeks)', 'estimated_duration_weeks'),
+            Column('Created Date', 'created_at', format=date_label('%Y-%m-%d')),
+            Column('Created By', 'created_by__first_name', 'created_by__last_name', format=full_name('System')),
+        ])])
@@ -4,6 +4,7 @@ from response import response
 from django.conf import settings
 from fme.views.base  import BaseView
 from fme.helpers import swagger_data
+from fme.helpers.sms import sms_queue
 from fme.models.learner import LearnerProfile
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.authtoken.models import Token
@@ -19,14 +20,12 @@ class VerifyNinView(BaseView):
         This endpoint start nin verification
     """
     dojah_nin_url = settings.DOJAH_NIN_VALIDATION_URL
-    termii_sms_url = f'{settings.TERMII_SMS_BASE_URL}/api/sms/send'
 
     @swagger_auto_schema(
         request_body=NinVerificationSerializer,
         responses=swagger_data.doc_response('nin_verification_first_step', 'Nin')
     )
     def post(self, request):
-        print('hello world')
         err_msg = None
         resp = {'status': 400, 'message':'Nin verification failed'}
         serializer = NinVerificationSerializer(data=request.data)
@@ -45,11 +44,12 @@ class VerifyNinView(BaseView):
                 phone_number = NinVerificationProcess.format_phone_number(nin_entity['phone_number'])
                 # Generate a random five-digit number (1000 to 9999)
                 token = f"{secrets.randbelow(9000) + 1000:05d}"
-                _, err_msg = self.make_sms_request(self.termii_sms_url, phone_number, token)
                 nin_v_process = NinVerificationProcess.objects.create(
                     nin_detail=nin_entity,
                     nin=nin, phone_number=phone_number, verification_token=token
                 )
+                # the OTP goes out in the background, the response only waits for the NIN lookup
+                sms_queue.send_otp(phone_number, token)
                 data['verification_id'] = nin_v_process.id
         if err_msg: resp = {'status':400, 'message':err_msg}
         resp = {'status':200, 'data':data} if data.get('verification_id') else resp
@@ -58,7 +58,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
-    # 'fme.middlewares.update_last_active.UpdateLastActiveMiddleware',
+    'fme.middlewares.update_last_active.UpdateLastActiveMiddleware',
 ]
 
 ROOT_URLCONF = 'fmecoursera.urls'
@@ -107,6 +107,24 @@ DATABASES = {
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
+AUTHENTICATION_BACKENDS = ['fme.authentication.PooledHashingBackend']
+
+# new hashes use PASSWORD_PREFERRED_HASHER, the others are kept to verify (and upgrade) existing ones
+PASSWORD_PREFERRED_HASHER = env.str('PASSWORD_PREFERRED_HASHER', 'fme.hashers.TunedScryptPasswordHasher')
+PASSWORD_HASHERS = [PASSWORD_PREFERRED_HASHER] + [hasher for hasher in [
+    'fme.hashers.TunedScryptPasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+] if hasher != PASSWORD_PREFERRED_HASHER]
+PASSWORD_SCRYPT_WORK_FACTOR = env.int('PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 14) # n, a power of 2
+PASSWORD_SCRYPT_BLOCK_SIZE = env.int('PASSWORD_SCRYPT_BLOCK_SIZE', 8) # r
+PASSWORD_SCRYPT_PARALLELISM = env.int('PASSWORD_SCRYPT_PARALLELISM', 1) # p
+LOGIN_HASH_WORKERS = env.int('LOGIN_HASH_WORKERS', 2) # hashing processes per web worker, 0 hashes inline
+LOGIN_HASH_MAX_PENDING = env.int('LOGIN_HASH_MAX_PENDING', 32) # queued + running password checks per web worker
+LOGIN_HASH_QUEUE_TIMEOUT = env.int('LOGIN_HASH_QUEUE_TIMEOUT', 5) # in seconds before a login gets a 503
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -155,21 +173,65 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.JSONParser',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'fme.authentication.CachedTokenAuthentication',
         # 'rest_framework.authentication.SessionAuthentication',  # Optional, for session-based auth
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # `format` is an export parameter (csv, csv.gz, jsonl.gz, parquet), not a renderer override
+    'URL_FORMAT_OVERRIDE': None,
 }
 
 AUTH_USER_MODEL = 'fme.User'
 
 
 INVITATION_TTL = env.int('INVITATION_TTL', 7)
+TOKEN_AUTH_LRU_SIZE = env.int('TOKEN_AUTH_LRU_SIZE', 2048) # tokens kept per process
+TOKEN_AUTH_LOCAL_TTL = env.int('TOKEN_AUTH_LOCAL_TTL', 10) # in seconds, bounds how long other workers see stale status
+TOKEN_AUTH_CACHE_ALIAS = env.str('TOKEN_AUTH_CACHE_ALIAS', '') # shared cache alias (e.g. redis), empty to disable
+TOKEN_AUTH_CACHE_TTL = env.int('TOKEN_AUTH_CACHE_TTL', 300) # in seconds
 LAST_ACTIVE_THRESHOLD = env.int('LAST_ACTIVE_THRESHOLD', 5) # in minutes
+LAST_ACTIVE_FLUSH_INTERVAL = env.int('LAST_ACTIVE_FLUSH_INTERVAL', 30) # in seconds
+LAST_ACTIVE_BUFFER_MAX = env.int('LAST_ACTIVE_BUFFER_MAX', 5000) # pending users that trigger an early flush
+PRESENCE_CACHE_TTL = env.int('PRESENCE_CACHE_TTL', 30) # in seconds, memoised online/active counts per process
+PRESENCE_DAY_RETENTION = env.int('PRESENCE_DAY_RETENTION', 400) # in days, daily presence snapshots kept for retention
+VIEW_CACHE_ALIAS = env.str('VIEW_CACHE_ALIAS', 'default') # use a shared cache (e.g. redis) so invalidation reaches every worker
+VIEW_CACHE_TTL = env.int('VIEW_CACHE_TTL', 300) # in seconds a cached dashboard response is fresh
+VIEW_CACHE_STALE_TTL = env.int('VIEW_CACHE_STALE_TTL', 900) # in seconds a stale response is served while it is recomputed
+LEARNER_STATS_SAFETY_LAG = env.int('LEARNER_STATS_SAFETY_LAG', 60) # in seconds, overlap between learner rollup refreshes
+SKILL_AREA_ANALYTICS_TTL = env.int('SKILL_AREA_ANALYTICS_TTL', 3600) # in seconds, learner changes invalidate earlier
+DASHBOARD_WARM_INTERVAL = env.int('DASHBOARD_WARM_INTERVAL', 240) # in seconds between warm_dashboard_cache passes, keep below VIEW_CACHE_TTL
+ACTIVITY_LOG_FLUSH_INTERVAL = env.int('ACTIVITY_LOG_FLUSH_INTERVAL', 5) # in seconds
+ACTIVITY_LOG_BUFFER_MAX = env.int('ACTIVITY_LOG_BUFFER_MAX', 1000) # pending rows that trigger an early flush
+ACTIVITY_LOG_RETENTION_MONTHS = env.int('ACTIVITY_LOG_RETENTION_MONTHS', 24) # older monthly partitions are dropped
 DEFAULT_PAGINATION_SIZE = env.int('DEFAULT_PAGINATION_SIZE', 10)
+PAGINATION_COUNT_STRATEGY = env.str('PAGINATION_COUNT_STRATEGY', 'exact') # exact | estimated | cached
+PAGINATION_ESTIMATE_THRESHOLD = env.int('PAGINATION_ESTIMATE_THRESHOLD', 10000) # rows, below this count exactly
+PAGINATION_COUNT_CACHE_TTL = env.int('PAGINATION_COUNT_CACHE_TTL', 60) # in seconds
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', 2000) # rows fetched per server-side cursor round trip
+EXPORT_BUFFER_SIZE = env.int('EXPORT_BUFFER_SIZE', 64 * 1024) # bytes per streamed chunk
+EXPORT_STORAGE = env.str('EXPORT_STORAGE', 'local') # local | s3
+EXPORT_ROOT = env.str('EXPORT_ROOT', os.path.join(BASE_DIR, 'exports'))
+EXPORT_S3_PREFIX = env.str('EXPORT_S3_PREFIX', 'exports/')
+EXPORT_JOB_POLL_INTERVAL = env.int('EXPORT_JOB_POLL_INTERVAL', 5) # in seconds
+EXPORT_JOB_STALE_AFTER = env.int('EXPORT_JOB_STALE_AFTER', 300) # in seconds without a heartbeat
+EXPORT_JOB_MAX_ATTEMPTS = env.int('EXPORT_JOB_MAX_ATTEMPTS', 3)
+EXPORT_JOB_TTL = env.int('EXPORT_JOB_TTL', 7) # in days
+EXPORT_DOWNLOAD_URL_TTL = env.int('EXPORT_DOWNLOAD_URL_TTL', 3600) # in seconds
+EXPORT_SHARD_WORKERS = env.int('EXPORT_SHARD_WORKERS', 1) # processes per export job, 1 disables sharding
+EXPORT_DELTA_SAFETY_LAG = env.int('EXPORT_DELTA_SAFETY_LAG', 60) # in seconds, overlap between delta exports
+EXPORT_TOMBSTONE_RETENTION = env.int('EXPORT_TOMBSTONE_RETENTION', 90) # in days, older change tokens need a full export
+IMPORT_CHUNK_SIZE = env.int('IMPORT_CHUNK_SIZE', 2000) # rows per insert transaction in learner imports
+IMPORT_HASH_WORKERS = env.int('IMPORT_HASH_WORKERS', 4) # processes hashing imported passwords, 1 hashes inline
 GENERAL_REQUEST_TIMEOUT = env.int('GENERAL_REQUEST_TIMEOUT', 45)
+HTTP_CONNECT_TIMEOUT = env.int('HTTP_CONNECT_TIMEOUT', 5) # in seconds, for every third-party call
+HTTP_POOL_MAXSIZE = env.int('HTTP_POOL_MAXSIZE', 10) # kept-alive connections per provider and process
+HTTP_RETRIES = env.int('HTTP_RETRIES', 2) # extra attempts for idempotent calls
+HTTP_RETRY_BACKOFF = env.float('HTTP_RETRY_BACKOFF', 0.5) # in seconds, doubled per attempt, full jitter
+HTTP_RETRY_BACKOFF_MAX = env.float('HTTP_RETRY_BACKOFF_MAX', 5) # in seconds
+HTTP_BREAKER_FAILURES = env.int('HTTP_BREAKER_FAILURES', 5) # consecutive failures that open a provider's circuit
+HTTP_BREAKER_RESET = env.int('HTTP_BREAKER_RESET', 30) # in seconds before a trial call is let through
 
 FME_EMAIL = env.str('FME_EMAIL', 'info@fme.com.ng')
 FME_DOC_LICENCE_TYPE = env.str('FME_DOC_LICENCE_TYPE', 'BSD License')
@@ -179,10 +241,13 @@ TERMII_SMS_API_KEY = env.str('TERMII_SMS_API_KEY')
 TERMII_SMS_SENDER_ID = env.str('TERMII_SMS_SENDER_ID')
 TERMII_SMS_CHANNEL = env.str('TERMII_SMS_CHANNEL', 'generic')
 TERMII_SMS_BASE_URL = env.str('TERMII_SMS_BASE_URL',  'https://v3.api.termii.com')
+TERMII_REQUEST_TIMEOUT = env.int('TERMII_REQUEST_TIMEOUT', 10) # in seconds
+SMS_SEND_WORKERS = env.int('SMS_SEND_WORKERS', 4) # background SMS threads per process
 
 DOJAH_NIN_APP_ID = env.str('DOJAH_NIN_APP_ID')
 DOJAH_NIN_SECRET_KEY = env.str('DOJAH_NIN_SECRET_KEY')
 DOJAH_NIN_VALIDATION_URL = env.str('DOJAH_NIN_VALIDATION_URL', 'https://api.dojah.io/api/v1/kyc/nin')
+DOJAH_REQUEST_TIMEOUT = env.int('DOJAH_REQUEST_TIMEOUT', 15) # in seconds
 
 
 AWS_ACCESS_KEY_ID = env.str('AWS_ACCESS_KEY_ID')